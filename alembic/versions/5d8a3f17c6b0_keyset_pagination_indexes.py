@@ -0,0 +1,44 @@
+"""Keyset pagination indexes
+
+Revision ID: 5d8a3f17c6b0
+Revises: e93b07c5d1a4
+Create Date: 2025-04-26 13:27:51.104388
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8a3f17c6b0'
+down_revision: Union[str, None] = 'e93b07c5d1a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_schedules_start_time_code',
+        'schedules',
+        ['start_time', 'code'],
+    )
+    op.create_index(
+        'ix_schedules_room_start_code',
+        'schedules',
+        ['room_code', 'start_time', 'code'],
+    )
+    op.create_index(
+        'ix_presentation_presenters_user',
+        'presentation_presenters',
+        ['user_code', 'presentation_code'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_presentation_presenters_user', table_name='presentation_presenters')
+    op.drop_index('ix_schedules_room_start_code', table_name='schedules')
+    op.drop_index('ix_schedules_start_time_code', table_name='schedules')
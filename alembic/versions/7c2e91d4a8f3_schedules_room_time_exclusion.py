@@ -0,0 +1,36 @@
+"""Schedules room/time exclusion constraint
+
+Revision ID: 7c2e91d4a8f3
+Revises: 3b51bc0b0485
+Create Date: 2025-04-20 11:02:14.318420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e91d4a8f3'
+down_revision: Union[str, None] = '3b51bc0b0485'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist provides the "=" operator class for uuid inside a GiST index
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_exclude_constraint(
+        'schedules_room_time_excl',
+        'schedules',
+        ('room_code', '='),
+        (sa.text('tstzrange(start_time, end_time)'), '&&'),
+        using='gist',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('schedules_room_time_excl', 'schedules')
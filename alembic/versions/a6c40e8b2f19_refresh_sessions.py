@@ -0,0 +1,51 @@
+"""Refresh sessions
+
+Revision ID: a6c40e8b2f19
+Revises: 5d8a3f17c6b0
+Create Date: 2025-05-02 09:41:13.527610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c40e8b2f19'
+down_revision: Union[str, None] = '5d8a3f17c6b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'refresh_sessions',
+        sa.Column('jti', sa.UUID(), nullable=False),
+        sa.Column('user_code', sa.UUID(), nullable=False),
+        sa.Column(
+            'created_at',
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('expires_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('revoked_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_code'], ['user.code'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('jti'),
+    )
+    op.create_index('ix_refresh_sessions_user', 'refresh_sessions', ['user_code'])
+    op.create_index(
+        'ix_refresh_sessions_revoked_at',
+        'refresh_sessions',
+        ['revoked_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_sessions_revoked_at', table_name='refresh_sessions')
+    op.drop_index('ix_refresh_sessions_user', table_name='refresh_sessions')
+    op.drop_table('refresh_sessions')
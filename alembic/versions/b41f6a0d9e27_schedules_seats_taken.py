@@ -0,0 +1,43 @@
+"""Schedules seats_taken counter
+
+Revision ID: b41f6a0d9e27
+Revises: 7c2e91d4a8f3
+Create Date: 2025-04-22 16:40:03.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41f6a0d9e27'
+down_revision: Union[str, None] = '7c2e91d4a8f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'schedules',
+        sa.Column('seats_taken', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE schedules
+        SET seats_taken = counts.taken
+        FROM (
+            SELECT schedule_code, count(*) AS taken
+            FROM registrations
+            GROUP BY schedule_code
+        ) AS counts
+        WHERE counts.schedule_code = schedules.code
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('schedules', 'seats_taken')
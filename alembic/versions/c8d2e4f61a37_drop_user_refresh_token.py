@@ -0,0 +1,33 @@
+"""Drop user refresh token
+
+Revision ID: c8d2e4f61a37
+Revises: f17b9c2d4e58
+Create Date: 2025-05-06 11:27:45.803914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2e4f61a37'
+down_revision: Union[str, None] = 'f17b9c2d4e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # refresh tokens live in refresh_sessions; the column only exists where
+    # the table was created from the models
+    op.execute('ALTER TABLE "user" DROP COLUMN IF EXISTS refresh_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        'user',
+        sa.Column('refresh_token', sa.String(length=300), nullable=True),
+    )
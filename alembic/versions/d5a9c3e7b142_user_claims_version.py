@@ -0,0 +1,52 @@
+"""User claims version
+
+Revision ID: d5a9c3e7b142
+Revises: c8d2e4f61a37
+Create Date: 2025-05-07 10:14:52.366081
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9c3e7b142'
+down_revision: Union[str, None] = 'c8d2e4f61a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'user',
+        sa.Column(
+            'claims_version',
+            sa.Integer(),
+            server_default='0',
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        'user',
+        sa.Column(
+            'claims_changed_at',
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        op.f('ix_user_claims_changed_at'),
+        'user',
+        ['claims_changed_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_claims_changed_at'), table_name='user')
+    op.drop_column('user', 'claims_changed_at')
+    op.drop_column('user', 'claims_version')
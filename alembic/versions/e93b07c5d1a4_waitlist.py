@@ -0,0 +1,50 @@
+"""Waitlist
+
+Revision ID: e93b07c5d1a4
+Revises: b41f6a0d9e27
+Create Date: 2025-04-24 10:12:47.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93b07c5d1a4'
+down_revision: Union[str, None] = 'b41f6a0d9e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'waitlist',
+        sa.Column('code', sa.UUID(), nullable=False),
+        sa.Column('schedule_code', sa.UUID(), nullable=False),
+        sa.Column('user_code', sa.UUID(), nullable=False),
+        sa.Column(
+            'created_at',
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(['schedule_code'], ['schedules.code'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_code'], ['user.code'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('schedule_code', 'user_code'),
+        sa.UniqueConstraint('code'),
+    )
+    op.create_index(
+        'ix_waitlist_schedule_created',
+        'waitlist',
+        ['schedule_code', 'created_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_waitlist_schedule_created', table_name='waitlist')
+    op.drop_table('waitlist')
@@ -0,0 +1,44 @@
+"""Hot query indexes
+
+Revision ID: f17b9c2d4e58
+Revises: a6c40e8b2f19
+Create Date: 2025-05-05 16:08:22.419736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f17b9c2d4e58'
+down_revision: Union[str, None] = 'a6c40e8b2f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the primary key leads with room_code, presentation lookups and the
+    # cascade from presentation need their own index
+    op.create_index(
+        'ix_schedules_presentation',
+        'schedules',
+        ['presentation_code'],
+    )
+    # the primary key leads with schedule_code
+    op.create_index(
+        'ix_registrations_user',
+        'registrations',
+        ['user_code'],
+    )
+    # password hashes are only ever read through the user row
+    op.drop_index('ix_user_password_hash', table_name='user', if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_user_password_hash', 'user', ['password_hash'])
+    op.drop_index('ix_registrations_user', table_name='registrations')
+    op.drop_index('ix_schedules_presentation', table_name='schedules')
@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from app.crud import create_agenda
+from app.db import AsyncSessionMaker
+from app.services import schedule_index
+
+
+async def solve_agenda_command(args: argparse.Namespace):
+    async with AsyncSessionMaker() as session:
+        await schedule_index.load(session)
+
+        result = await create_agenda(
+            db=session,
+            start=args.start,
+            end=args.end,
+            duration=timedelta(minutes=args.duration),
+            gap=timedelta(minutes=args.gap),
+            dry_run=args.dry_run,
+        )
+
+    for item in result["scheduled"]:
+        print(
+            f"{item['start_time'].isoformat()} - {item['end_time'].isoformat()}  "
+            f"room={item['room_code']}  presentation={item['presentation_code']}"
+        )
+    print(
+        f"scheduled: {len(result['scheduled'])}, "
+        f"unplaced: {len(result['unplaced'])}"
+        + (" (dry run)" if args.dry_run else "")
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    agenda = commands.add_parser(
+        "solve-agenda",
+        help="assign unscheduled presentations to rooms and time slots",
+    )
+    agenda.add_argument("--start", type=datetime.fromisoformat, required=True)
+    agenda.add_argument("--end", type=datetime.fromisoformat, required=True)
+    agenda.add_argument("--duration", type=int, default=60, help="minutes")
+    agenda.add_argument("--gap", type=int, default=0, help="minutes")
+    agenda.add_argument("--dry-run", action="store_true")
+    agenda.set_defaults(handler=solve_agenda_command)
+
+    args = parser.parse_args(argv)
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
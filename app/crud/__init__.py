@@ -4,6 +4,8 @@ from .auth import (
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
+    session_revoked,
+    revoke_session,
 )
 from .events import (
     create_presentation,
@@ -13,11 +15,30 @@ from .events import (
     create_room,
     get_room,
     get_rooms,
+    get_availability,
     create_schedule,
+    create_schedules_bulk,
+    create_agenda,
     get_schedule,
     get_schedules,
     update_schedule,
+    delete_schedule,
     create_registration,
+    delete_registration,
+    create_waitlist_entry,
+    get_waitlist_entry,
+    get_waitlisted_schedules,
+    promote_waitlisted,
+)
+from .read_models import (
+    read_presentation,
+    read_presentations,
+    read_room,
+    read_rooms,
+    read_schedule,
+    read_schedules,
+    stream_rooms,
+    stream_schedules,
 )
 
 
@@ -29,6 +50,8 @@ __all__ = [
     "create_access_token",
     "create_refresh_token",
     "verify_refresh_token",
+    "session_revoked",
+    "revoke_session",
     "update_user",
     "create_presentation",
     "get_presentation",
@@ -37,9 +60,26 @@ __all__ = [
     "create_room",
     "get_room",
     "get_rooms",
+    "stream_rooms",
+    "get_availability",
     "create_schedule",
+    "create_schedules_bulk",
+    "create_agenda",
     "get_schedule",
     "get_schedules",
+    "stream_schedules",
     "update_schedule",
+    "delete_schedule",
     "create_registration",
+    "delete_registration",
+    "create_waitlist_entry",
+    "get_waitlist_entry",
+    "get_waitlisted_schedules",
+    "promote_waitlisted",
+    "read_presentation",
+    "read_presentations",
+    "read_room",
+    "read_rooms",
+    "read_schedule",
+    "read_schedules",
 ]
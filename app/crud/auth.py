@@ -1,80 +1,99 @@
-import bcrypt
 import jwt
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Tuple
-import asyncio
 from dotenv import load_dotenv
 import os
 
+from fastapi import HTTPException
+from starlette import status
+
+from app.db.models import UserRole
+from app.services.password_hasher import PasswordHasherBusy, password_hasher
+from app.services.principals import Principal, PrincipalPresentation, principal_cache
+from app.services.refresh_sessions import refresh_sessions
+from app.services.tokens import token_service
+
 load_dotenv()
 
 
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS"))
+ACCESS_TOKEN_CLAIMS = os.getenv("ACCESS_TOKEN_CLAIMS", "true").lower() == "true"
 
 
-async def hash_password(password: str) -> str:
-    hashed = await asyncio.to_thread(
-        bcrypt.hashpw,
-        password.encode(),
-        bcrypt.gensalt(),
+def _busy(error: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts, retry later",
+        headers={"Retry-After": str(error.retry_after)},
     )
 
-    return hashed.decode()
+
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy as e:
+        raise _busy(e)
 
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    is_valid = await asyncio.to_thread(
-        bcrypt.checkpw,
-        plain_password.encode(),
-        hashed_password.encode(),
-    )
-
-    return is_valid
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy as e:
+        raise _busy(e)
 
 
-# TODO: create access token with more data
-async def create_access_token(user_code: str) -> str:
-    expiration_time = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+async def create_access_token(
+    user_code: str,
+    role: str = None,
+    presentations: list = None,
+    claims_version: int = 0,
+    session_id: str = None,
+) -> str:
+    now = datetime.now(timezone.utc)
+    expiration_time = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
     payload = {
         "sub": user_code,
         "exp": expiration_time,
+        "iat": now.timestamp(),
     }
 
-    token = await asyncio.to_thread(
-        jwt.encode,
-        payload,
-        SECRET_KEY,
-        ALGORITHM,
-    )
-
-    return token
+    if session_id:
+        payload["sid"] = str(session_id)
 
+    if ACCESS_TOKEN_CLAIMS and role:
+        principal = Principal(
+            code=uuid.UUID(str(user_code)),
+            role=UserRole(role),
+            presentations=tuple(
+                PrincipalPresentation(code) for code in presentations or ()
+            ),
+        )
+        payload.update(principal.to_claims(claims_version))
 
-# TODO: create refresh token with more data
-async def create_refresh_token(user_code: str) -> str:
-    expiration_time = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    return token_service.encode(payload)
 
-    payload = {"sub": user_code, "exp": expiration_time}
 
-    refresh_token = await asyncio.to_thread(
-        jwt.encode,
-        payload,
-        SECRET_KEY,
-        ALGORITHM,
+async def create_refresh_token(user_code: str) -> Tuple[str, str]:
+    """Open a refresh session and return its token and session id."""
+    expiration_time = datetime.now(timezone.utc) + timedelta(
+        days=REFRESH_TOKEN_EXPIRE_DAYS
     )
+    session_id = await refresh_sessions.open(
+        user_code=uuid.UUID(str(user_code)),
+        expires_at=expiration_time,
+    )
+
+    payload = {"sub": user_code, "exp": expiration_time, "jti": str(session_id)}
 
-    return refresh_token
+    return token_service.encode(payload), str(session_id)
 
 
 async def verify_access_token(token: str) -> Tuple[bool, str]:
     try:
-        decoded_token = await asyncio.to_thread(
-            jwt.decode, token, SECRET_KEY, algorithms=["HS256"]
-        )
+        decoded_token = token_service.decode(token)
         return True, decoded_token["sub"]
     except jwt.ExpiredSignatureError:
         return False, "Token has expired"
@@ -82,17 +101,42 @@ async def verify_access_token(token: str) -> Tuple[bool, str]:
         return False, "Invalid token"
 
 
-async def verify_refresh_token(token: str) -> Tuple[bool, str]:
+async def verify_refresh_token(token: str) -> Tuple[bool, dict | str]:
     try:
-        decoded_token = await asyncio.to_thread(
-            jwt.decode,
-            token,
-            SECRET_KEY,
-            [ALGORITHM],
-        )
-
-        return True, decoded_token["sub"]
+        decoded_token = token_service.decode(token)
+        session_id = uuid.UUID(decoded_token["jti"])
     except jwt.ExpiredSignatureError:
         return False, "Refresh token has expired"
-    except jwt.InvalidTokenError:
+    except (jwt.InvalidTokenError, KeyError, ValueError, TypeError):
         return False, "Invalid refresh token"
+
+    if await refresh_sessions.is_revoked(session_id):
+        return False, "Refresh token has been revoked"
+
+    return True, decoded_token
+
+
+async def session_revoked(payload: dict) -> bool:
+    """Whether the refresh session an access token was issued for is gone."""
+    session_id = payload.get("sid")
+    if not session_id:
+        return False
+
+    try:
+        session_id = uuid.UUID(session_id)
+    except (ValueError, TypeError):
+        return True
+
+    return await refresh_sessions.is_revoked(session_id)
+
+
+async def revoke_session(token: str, user_code: uuid.UUID):
+    """Close the session behind an access token, or all sessions without one."""
+    session_id = token_service.decode(token).get("sid")
+
+    if session_id:
+        await refresh_sessions.revoke(uuid.UUID(session_id))
+        principal_cache.discard(token)
+    else:
+        await refresh_sessions.revoke_user(user_code)
+        principal_cache.invalidate(user_code)
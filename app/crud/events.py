@@ -1,21 +1,50 @@
 import uuid
-from datetime import datetime
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import (
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from starlette import status
 
-from app.crud import get_user_by_code
 from app.db.models import (
     Presentation,
     PresentationPresenter,
     Room,
     Schedule,
+    User,
+    UserRole,
+)
+from app.db.models.events import Registration, Waitlist
+from app.services import (
+    Busy,
+    Session,
+    Slot,
+    build_slots,
+    claims_versions,
+    free_intervals,
+    principal_cache,
+    schedule_index,
+    solve_agenda,
+    sweep_conflicts,
 )
-from app.db.models.events import Registration
+from .read_models import presentation_response, schedule_row
+from .users import bump_claims_versions
+
+# SQLSTATE raised by the schedules_room_time_excl constraint
+EXCLUSION_VIOLATION = "23P01"
 
 
 async def get_presentation(
@@ -43,22 +72,25 @@ async def create_presentation(
     presentation: dict,
 ):
     try:
-        presenters = presentation.get("presenters", [])
-        db_presentation = Presentation(
-            title=presentation.get("title"),
-            description=presentation.get("description"),
+        stmt = (
+            insert(Presentation)
+            .values(
+                title=presentation.get("title"),
+                description=presentation.get("description"),
+            )
+            .returning(Presentation.code, Presentation.title, Presentation.description)
         )
-        db.add(db_presentation)
+        row = (await db.execute(stmt)).one()
 
-        await create_presentation_presenter(
+        users = await create_presentation_presenter(
             db=db,
-            presenters=presenters,
-            presentation=db_presentation,
+            presenters=presentation.get("presenters", []),
+            presentation_code=row.code,
         )
     except IntegrityError:
         return False
 
-    return db_presentation
+    return presentation_response(row.code, row.title, row.description, users)
 
 
 async def update_presentation(
@@ -67,59 +99,84 @@ async def update_presentation(
     presentation_update: dict,
 ):
     try:
-        presenters = presentation_update.get("presenters", [])
-
-        if presenters:
-            presentation_update.pop("presenters")
+        presenters = presentation_update.pop("presenters", [])
 
         for i, v in presentation_update.items():
             setattr(presentation, i, v)
 
-        await create_presentation_presenter(
+        users = await create_presentation_presenter(
             db=db,
             presenters=presenters,
-            presentation=presentation,
-            replace=True,
+            presentation_code=presentation.code,
+            existing={p.user_code for p in presentation.users},
         )
-
     except IntegrityError:
         return False
 
-    return presentation
+    return presentation_response(
+        presentation.code,
+        presentation.title,
+        presentation.description,
+        users,
+        presentation.schedule.code if presentation.schedule else None,
+    )
 
 
 async def create_presentation_presenter(
     db: AsyncSession,
     presenters: list,
-    presentation: Presentation,
-    replace: bool = False,
-):
-    try:
-        if replace:
-            stmt = select(PresentationPresenter).where(
-                PresentationPresenter.presentation_code == presentation.code
+    presentation_code: uuid.UUID,
+    existing: set = None,
+) -> list:
+    """Make ``presenters`` the presenter set and return it.
+
+    ``existing`` is the current set when the caller already holds it;
+    otherwise the presentation is treated as new. Everyone added or removed
+    gets a new claims version, and the same statement returns the roles
+    the added users are checked against.
+    """
+    codes = set(presenters)
+    existing = set(existing or ())
+    removed = existing - codes
+    added = codes - existing
+    bumps = []
+    if removed or added:
+        stmt = bump_claims_versions(removed | added, User.role)
+        bumps = (await db.execute(stmt)).all()
+        roles = {code: role for code, _, _, role in bumps}
+        if any(roles.get(code) != UserRole.presenter for code in added):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Wrong role",
             )
 
-            presentation_presenters = await db.execute(stmt)
-            for p in presentation_presenters.scalars().all():
-                await db.delete(p)
-
-        for code in presenters:
-            user = await get_user_by_code(db, code)
-            if not user or user.role.value != "presenter":
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Wrong role",
-                )
-            db.add(
-                PresentationPresenter(
-                    presentation_code=presentation.code,
-                    user_code=code,
+    try:
+        if removed:
+            await db.execute(
+                delete(PresentationPresenter).where(
+                    PresentationPresenter.presentation_code == presentation_code,
+                    PresentationPresenter.user_code.in_(removed),
                 )
             )
+        if added:
+            await db.execute(
+                insert(PresentationPresenter),
+                [
+                    {"presentation_code": presentation_code, "user_code": code}
+                    for code in added
+                ],
+            )
         await db.commit()
     except IntegrityError:
-        ...
+        # create_presentation and update_presentation turn this into a 400
+        await db.rollback()
+        raise
+
+    principal_cache.invalidate_many(removed | added)
+    claims_versions.record(bump[:3] for bump in bumps)
+
+    return sorted(codes)
 
 
 async def create_room(
@@ -138,46 +195,60 @@ async def create_room(
         return False
 
 
+def _is_exclusion_violation(error: IntegrityError) -> bool:
+    return getattr(error.orig, "sqlstate", None) == EXCLUSION_VIOLATION
+
+
 async def create_schedule(
     db: AsyncSession,
     schedule: dict,
 ):
-    try:
-        start = schedule.get("start_time")
-        end = schedule.get("end_time")
-        if end <= start:
-            raise Exception("Wrong datetime")
-
-        stmt = (
-            select(Schedule)
-            .where(Schedule.start_time < end)
-            .where(Schedule.end_time > start)
+    start = schedule.get("start_time")
+    end = schedule.get("end_time")
+    room_code = schedule.get("room_code")
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Error: Wrong datetime",
         )
-        await db.execute(stmt)
-        results = await db.execute(stmt)
-        result = results.scalars().all()
 
-        if result:
-            raise Exception("Choose  another time")
+    if await schedule_index.confirm_overlaps(db, room_code, start, end):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Error: Choose another time",
+        )
 
-        schedule = Schedule(
+    stmt = (
+        insert(Schedule)
+        .values(
             start_time=start,
             end_time=end,
-            room_code=schedule.get("room_code"),
+            room_code=room_code,
             presentation_code=schedule.get("presentation_code"),
         )
-
-        db.add(schedule)
+        .returning(
+            Schedule.code,
+            Schedule.room_code,
+            Schedule.presentation_code,
+            Schedule.start_time,
+            Schedule.end_time,
+        )
+    )
+    try:
+        row = (await db.execute(stmt)).one()
         await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_exclusion_violation(e):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Error: Choose another time",
+            )
+        return None
 
-        return schedule
+    schedule_index.sync(row)
 
-    except IntegrityError:
-        ...
-    except Exception as e:
-        print(e)
-
-    await db.commit()
+    return schedule_row(row)
 
 
 async def update_schedule(
@@ -185,39 +256,269 @@ async def update_schedule(
     schedule_update: dict,
     schedule: Schedule,
 ):
-    try:
-        start = schedule_update.get("start_time", schedule.start_time)
-        end = schedule_update.get("end_time", schedule.end_time)
+    start = schedule_update.get("start_time", schedule.start_time)
+    end = schedule_update.get("end_time", schedule.end_time)
+    room_code = schedule_update.get("room_code", schedule.room_code)
 
-        if end <= start:
-            raise Exception("Wrong datetime")
-
-        stmt = (
-            select(Schedule)
-            .where(Schedule.start_time < end)
-            .where(Schedule.end_time > start)
-            .where(Schedule.code != schedule.code)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Error: Wrong datetime",
         )
-        await db.execute(stmt)
-        results = await db.execute(stmt)
-        result = results.scalars().all()
 
-        if result:
-            raise Exception("Choose  another time")
+    if await schedule_index.confirm_overlaps(
+        db, room_code, start, end, exclude=schedule.code
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Error: Choose another time",
+        )
 
+    try:
         for i, v in schedule_update.items():
             setattr(schedule, i, v)
 
         await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_exclusion_violation(e):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Error: Choose another time",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wrong input",
+        )
 
-        return schedule
+    schedule_index.sync(schedule)
 
-    except Exception as e:
+    return schedule_row(schedule)
+
+
+async def create_schedules_bulk(
+    db: AsyncSession,
+    schedules: list,
+):
+    results = [
+        {"index": i, "status": "created", "code": None, "detail": None}
+        for i in range(len(schedules))
+    ]
+
+    def reject(index: int, state: str, detail: str):
+        results[index].update(status=state, detail=detail)
+
+    if not schedules:
+        return results
+
+    room_codes = {s.get("room_code") for s in schedules}
+    presentation_codes = {s.get("presentation_code") for s in schedules}
+
+    rooms = await db.execute(select(Room.code).where(Room.code.in_(room_codes)))
+    known_rooms = set(rooms.scalars().all())
+
+    presentations = await db.execute(
+        select(Presentation.code, Schedule.code)
+        .outerjoin(Schedule, Schedule.presentation_code == Presentation.code)
+        .where(Presentation.code.in_(presentation_codes))
+    )
+    scheduled = {}
+    for presentation_code, schedule_code in presentations.all():
+        scheduled[presentation_code] = schedule_code is not None
+
+    slots = []
+    for i, schedule in enumerate(schedules):
+        presentation_code = schedule.get("presentation_code")
+        if schedule.get("end_time") <= schedule.get("start_time"):
+            reject(i, "invalid", "Wrong datetime")
+        elif schedule.get("room_code") not in known_rooms:
+            reject(i, "invalid", "Room not found")
+        elif presentation_code not in scheduled:
+            reject(i, "invalid", "Presentation not found")
+        elif scheduled[presentation_code]:
+            reject(i, "invalid", "Presentation already scheduled")
+        else:
+            slots.append(
+                Slot(
+                    index=i,
+                    room_code=schedule.get("room_code"),
+                    start=schedule.get("start_time"),
+                    end=schedule.get("end_time"),
+                )
+            )
+
+    if not slots:
+        return results
+
+    stmt = (
+        select(Schedule.room_code, Schedule.start_time, Schedule.end_time)
+        .where(Schedule.room_code.in_({slot.room_code for slot in slots}))
+        .where(Schedule.start_time < max(slot.end for slot in slots))
+        .where(Schedule.end_time > min(slot.start for slot in slots))
+        .order_by(Schedule.room_code, Schedule.start_time)
+    )
+    existing = await db.execute(stmt)
+    busy = [Busy(*row) for row in existing.all()]
+
+    # a presentation goes to its first slot that survives the sweep; later
+    # ones are dropped and, as they may have blocked other slots, the sweep
+    # runs again without them
+    while True:
+        conflicts = sweep_conflicts(slots=slots, existing=busy)
+        taken, duplicates = set(), set()
+        for slot in slots:
+            if conflicts[slot.index]:
+                continue
+            presentation_code = schedules[slot.index].get("presentation_code")
+            if presentation_code in taken:
+                duplicates.add(slot.index)
+            taken.add(presentation_code)
+
+        if not duplicates:
+            break
+        for index in duplicates:
+            reject(index, "invalid", "Presentation already scheduled")
+        slots = [slot for slot in slots if slot.index not in duplicates]
+
+    rows = []
+    for slot in slots:
+        if conflicts[slot.index]:
+            reject(slot.index, "conflict", conflicts[slot.index])
+            continue
+
+        code = uuid.uuid4()
+        results[slot.index]["code"] = code
+        schedule = schedules[slot.index]
+        rows.append(
+            {
+                "code": code,
+                "room_code": slot.room_code,
+                "presentation_code": schedule.get("presentation_code"),
+                "start_time": slot.start,
+                "end_time": slot.end,
+            }
+        )
+
+    if not rows:
+        return results
+
+    try:
+        await db.execute(insert(Schedule), rows)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_exclusion_violation(e):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Error: Schedules changed concurrently, retry the import",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error: {e}",
+            detail="Wrong input",
         )
 
+    for row in rows:
+        schedule_index.add(
+            code=row["code"],
+            room_code=row["room_code"],
+            start=row["start_time"],
+            end=row["end_time"],
+        )
+
+    return results
+
+
+async def create_agenda(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    duration: timedelta,
+    gap: timedelta = timedelta(0),
+    dry_run: bool = False,
+):
+    stmt = (
+        select(Presentation.code, PresentationPresenter.user_code)
+        .outerjoin(
+            PresentationPresenter,
+            PresentationPresenter.presentation_code == Presentation.code,
+        )
+        .outerjoin(Schedule, Schedule.presentation_code == Presentation.code)
+        .where(Schedule.code.is_(None))
+    )
+    presenters = {}
+    for presentation_code, user_code in (await db.execute(stmt)).all():
+        users = presenters.setdefault(presentation_code, set())
+        if user_code:
+            users.add(user_code)
+
+    rooms = (await db.execute(select(Room.code, Room.sit_count))).all()
+
+    stmt = (
+        select(
+            Schedule.room_code,
+            Schedule.start_time,
+            Schedule.end_time,
+            PresentationPresenter.user_code,
+        )
+        .outerjoin(
+            PresentationPresenter,
+            PresentationPresenter.presentation_code == Schedule.presentation_code,
+        )
+        .where(Schedule.start_time < end)
+        .where(Schedule.end_time > start)
+    )
+    busy_rooms, busy_presenters = defaultdict(set), defaultdict(set)
+    result = await db.execute(stmt)
+    for room_code, busy_start, busy_end, user_code in result.all():
+        busy_rooms[room_code].add((busy_start, busy_end))
+        if user_code:
+            busy_presenters[user_code].add((busy_start, busy_end))
+
+    assignments, unplaced = solve_agenda(
+        sessions=[
+            Session(code, frozenset(users)) for code, users in presenters.items()
+        ],
+        rooms=[tuple(room) for room in rooms],
+        slots=build_slots(start, end, duration, gap),
+        busy_rooms=busy_rooms,
+        busy_presenters=busy_presenters,
+    )
+
+    scheduled = [
+        {
+            "code": None,
+            "presentation_code": assignment.presentation_code,
+            "room_code": assignment.room_code,
+            "start_time": assignment.start,
+            "end_time": assignment.end,
+        }
+        for assignment in assignments
+    ]
+
+    if not dry_run and scheduled:
+        results = await create_schedules_bulk(db=db, schedules=scheduled)
+        for item, result in zip(list(scheduled), results):
+            if result["status"] == "created":
+                item["code"] = result["code"]
+            else:
+                scheduled.remove(item)
+                unplaced.append(item["presentation_code"])
+
+    return {
+        "scheduled": scheduled,
+        "unplaced": unplaced,
+    }
+
+
+async def delete_schedule(
+    db: AsyncSession,
+    schedule: Schedule,
+):
+    await db.delete(schedule)
+    await db.commit()
+
+    schedule_index.remove(schedule.code)
+
 
 async def get_schedules(
     db: AsyncSession,
@@ -233,7 +534,6 @@ async def get_schedules(
         stmt = stmt.where(Schedule.room_code == room_code)
     if future:
         stmt = stmt.where(Schedule.start_time > datetime.now())
-
     result = await db.execute(stmt)
 
     schedules = result.scalars().all()
@@ -309,26 +609,139 @@ async def get_room(
     return room
 
 
+async def get_availability(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    min_duration: timedelta,
+    min_sit_count: int = None,
+):
+    rooms_stmt = select(Room.code, Room.name, Room.sit_count).order_by(Room.name)
+    if min_sit_count:
+        rooms_stmt = rooms_stmt.where(Room.sit_count >= min_sit_count)
+
+    rooms = (await db.execute(rooms_stmt)).all()
+    if not rooms:
+        return []
+
+    stmt = (
+        select(Schedule.room_code, Schedule.start_time, Schedule.end_time)
+        .where(Schedule.room_code.in_([room.code for room in rooms]))
+        .where(Schedule.start_time < end)
+        .where(Schedule.end_time > start)
+        .order_by(Schedule.room_code, Schedule.start_time)
+    )
+    result = await db.execute(stmt)
+
+    busy = {room.code: [] for room in rooms}
+    for row in result.all():
+        busy[row.room_code].append(Busy(*row))
+
+    return [
+        {
+            "code": room.code,
+            "name": room.name,
+            "sit_count": room.sit_count,
+            "free": [
+                {"start_time": free_start, "end_time": free_end}
+                for free_start, free_end in free_intervals(
+                    busy=busy[room.code],
+                    start=start,
+                    end=end,
+                    min_duration=min_duration,
+                )
+            ],
+        }
+        for room in rooms
+    ]
+
+
 async def create_registration(
     db: AsyncSession,
     schedule_code: uuid.UUID,
     user_code: uuid.UUID,
 ):
-    try:
-        registration = Registration(
-            schedule_code=schedule_code,
-            user_code=user_code,
+    # Taking the seat, leaving the queue and inserting the registration are
+    # one statement, so the schedule row lock taken by the seat UPDATE is
+    # held for that statement and the commit only. A refused seat inserts
+    # nothing and the rollback puts a dequeued entry back.
+    capacity = (
+        select(Room.sit_count)
+        .where(Room.code == Schedule.room_code)
+        .scalar_subquery()
+    )
+    seat = (
+        update(Schedule)
+        .where(Schedule.code == schedule_code)
+        .where(Schedule.seats_taken < capacity)
+        .values(seats_taken=Schedule.seats_taken + 1)
+        .returning(Schedule.code)
+        .cte("seat")
+    )
+    dequeued = (
+        delete(Waitlist)
+        .where(Waitlist.schedule_code == schedule_code)
+        .where(Waitlist.user_code == user_code)
+        .cte("dequeued")
+    )
+    registrations = Registration.__table__
+    stmt = (
+        insert(registrations)
+        .add_cte(dequeued)
+        .from_select(
+            ["code", "schedule_code", "user_code"],
+            select(literal(uuid.uuid4()), seat.c.code, literal(user_code)),
+        )
+        .returning(
+            registrations.c.code,
+            registrations.c.schedule_code,
+            registrations.c.user_code,
         )
+    )
 
-        db.add(registration)
-        await db.commit()
-        return registration
+    try:
+        row = (await db.execute(stmt)).first()
+        if row is not None:
+            await db.commit()
+            return Registration(**row._mapping)
     except Exception as e:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error: {e}",
         )
 
+    await db.rollback()
+    exists = await db.scalar(
+        select(Schedule.code).where(Schedule.code == schedule_code)
+    )
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Schedule not found",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Session is full, join the waitlist",
+    )
+
+
+async def delete_registration(
+    db: AsyncSession,
+    registration: Registration,
+):
+    stmt = (
+        update(Schedule)
+        .where(Schedule.code == registration.schedule_code)
+        .where(Schedule.seats_taken > 0)
+        .values(seats_taken=Schedule.seats_taken - 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    await db.delete(registration)
+    await db.execute(stmt)
+    await db.commit()
+
 
 async def get_registration(
     schedule_code: uuid.UUID,
@@ -345,3 +758,159 @@ async def get_registration(
     registration = res.scalar_one_or_none()
 
     return registration
+
+
+async def create_waitlist_entry(
+    db: AsyncSession,
+    schedule_code: uuid.UUID,
+    user_code: uuid.UUID,
+):
+    registration = await get_registration(
+        schedule_code=schedule_code,
+        user_code=user_code,
+        db=db,
+    )
+    if registration:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Already registered",
+        )
+
+    try:
+        entry = await db.scalar(
+            insert(Waitlist)
+            .values(schedule_code=schedule_code, user_code=user_code)
+            .returning(Waitlist)
+        )
+        await db.commit()
+        return entry
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wrong input",
+        )
+
+
+async def get_waitlist_entry(
+    schedule_code: uuid.UUID,
+    user_code: uuid.UUID,
+    db: AsyncSession,
+):
+    stmt = (
+        select(Waitlist)
+        .where(Waitlist.schedule_code == schedule_code)
+        .where(Waitlist.user_code == user_code)
+    )
+
+    res = await db.execute(stmt)
+    entry = res.scalar_one_or_none()
+
+    return entry
+
+
+async def get_waitlisted_schedules(
+    db: AsyncSession,
+):
+    res = await db.execute(select(Waitlist.schedule_code).distinct())
+
+    return res.scalars().all()
+
+
+async def promote_waitlisted(
+    db: AsyncSession,
+    schedule_codes: set,
+) -> int:
+    # Lock the schedule rows first so concurrent promoters and
+    # create_registration see a consistent seats_taken.
+    locked = (
+        select(Schedule.code)
+        .where(Schedule.code.in_(schedule_codes))
+        .with_for_update()
+    )
+    await db.execute(locked)
+
+    # Users who already hold a seat can't be promoted; drop their entries
+    # so they neither block the queue nor get counted as promoted.
+    registered = (
+        select(Registration.code)
+        .where(Registration.schedule_code == Waitlist.schedule_code)
+        .where(Registration.user_code == Waitlist.user_code)
+        .exists()
+    )
+    ranked = (
+        select(
+            Waitlist.schedule_code,
+            Waitlist.user_code,
+            func.row_number()
+            .over(
+                partition_by=Waitlist.schedule_code,
+                order_by=Waitlist.created_at,
+            )
+            .label("position"),
+        )
+        .where(Waitlist.schedule_code.in_(schedule_codes))
+        .subquery()
+    )
+    stmt = (
+        select(ranked.c.schedule_code, ranked.c.user_code)
+        .join(Schedule, Schedule.code == ranked.c.schedule_code)
+        .join(Room, Room.code == Schedule.room_code)
+        .where(ranked.c.position <= Room.sit_count - Schedule.seats_taken)
+    )
+    schedules = Schedule.__table__
+
+    total = 0
+    # Each pass either promotes or purges at least one entry, so this ends
+    # once the freed seats are filled or the queue runs dry.
+    while True:
+        await db.execute(
+            delete(Waitlist)
+            .where(Waitlist.schedule_code.in_(schedule_codes))
+            .where(registered)
+            .execution_options(synchronize_session=False)
+        )
+        promoted = (await db.execute(stmt)).all()
+        if not promoted:
+            break
+
+        inserted = await db.execute(
+            pg_insert(Registration)
+            .values(
+                [
+                    {
+                        "code": uuid.uuid4(),
+                        "schedule_code": row.schedule_code,
+                        "user_code": row.user_code,
+                    }
+                    for row in promoted
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(Registration.schedule_code, Registration.user_code)
+        )
+        rows = [tuple(row) for row in inserted.all()]
+        if not rows:
+            continue
+
+        await db.execute(
+            delete(Waitlist)
+            .where(tuple_(Waitlist.schedule_code, Waitlist.user_code).in_(rows))
+            .execution_options(synchronize_session=False)
+        )
+
+        seats = Counter(schedule_code for schedule_code, _ in rows)
+        await db.execute(
+            schedules.update()
+            .where(schedules.c.code == bindparam("schedule_code"))
+            .values(seats_taken=schedules.c.seats_taken + bindparam("seats")),
+            [
+                {"schedule_code": code, "seats": count}
+                for code, count in seats.items()
+            ],
+        )
+        total += len(rows)
+
+    await db.commit()
+
+    return total
@@ -0,0 +1,74 @@
+import base64
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from starlette import status
+
+load_dotenv()
+
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+
+def page_size(limit: Optional[int], cursor: Optional[str] = None) -> Optional[int]:
+    """Rows per page, ``None`` for the whole listing when the client asked
+    for neither a limit nor a cursor."""
+    if not limit or limit < 1:
+        return PAGE_SIZE if cursor else None
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def fetch_limit(size: Optional[int]) -> Optional[int]:
+    """One row past the page tells whether another page follows."""
+    return None if size is None else size + 1
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else str(v) for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    token: Optional[str],
+    *types: Callable[[str], Any],
+) -> Optional[Tuple]:
+    if not token:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if len(values) != len(types):
+            raise ValueError("Cursor length mismatch")
+        return tuple(cast(value) for cast, value in zip(types, values))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def paginate(
+    rows: Sequence,
+    size: Optional[int],
+    key: Callable[[Any], Tuple],
+) -> Tuple[List, Optional[str]]:
+    """Trim a ``size + 1`` fetch to one page and build the next cursor."""
+    rows = list(rows)
+    if size is None or len(rows) <= size:
+        return rows, None
+
+    rows = rows[:size]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+schedule_cursor = (datetime.fromisoformat, uuid.UUID)
+code_cursor = (uuid.UUID,)
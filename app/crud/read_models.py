@@ -0,0 +1,231 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import AsyncSessionMaker
+from app.db.models import Presentation, PresentationPresenter, Room, Schedule
+
+# Read endpoints select only the columns their response schema renders and
+# aggregate child codes in SQL, so no ORM identity map or relationship
+# collections are built on the way to Pydantic.
+
+STREAM_BATCH_SIZE = 500
+
+
+def _schedules_statement(
+    room_code: uuid.UUID = None,
+    future: bool = False,
+) -> Select:
+    stmt = select(
+        Schedule.code,
+        Schedule.room_code,
+        Schedule.presentation_code,
+        Schedule.start_time,
+        Schedule.end_time,
+    ).order_by(Schedule.start_time, Schedule.code)
+
+    if room_code:
+        stmt = stmt.where(Schedule.room_code == room_code)
+    if future:
+        stmt = stmt.where(Schedule.start_time > datetime.now())
+
+    return stmt
+
+
+def schedule_row(row) -> dict:
+    return {
+        "code": row.code,
+        "room_code": row.room_code,
+        "presentation": {"code": row.presentation_code},
+        "start_time": row.start_time,
+        "end_time": row.end_time,
+    }
+
+
+def _rooms_statement() -> Select:
+    schedules = (
+        select(func.array_agg(aggregate_order_by(Schedule.code, Schedule.start_time)))
+        .where(Schedule.room_code == Room.code)
+        .scalar_subquery()
+    )
+
+    return select(
+        Room.code,
+        Room.name,
+        Room.sit_count,
+        schedules.label("schedules"),
+    ).order_by(Room.code)
+
+
+def _room_row(row) -> dict:
+    return {
+        "code": row.code,
+        "name": row.name,
+        "sit_count": row.sit_count,
+        "schedules": [{"code": code} for code in row.schedules or []],
+    }
+
+
+def _presentations_statement() -> Select:
+    users = (
+        select(func.array_agg(PresentationPresenter.user_code))
+        .where(PresentationPresenter.presentation_code == Presentation.code)
+        .scalar_subquery()
+    )
+    schedule = (
+        select(Schedule.code)
+        .where(Schedule.presentation_code == Presentation.code)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    return select(
+        Presentation.code,
+        Presentation.title,
+        Presentation.description,
+        users.label("users"),
+        schedule.label("schedule_code"),
+    ).order_by(Presentation.code)
+
+
+def presentation_response(
+    code: uuid.UUID,
+    title: str,
+    description: str,
+    users: list,
+    schedule_code: uuid.UUID = None,
+) -> dict:
+    return {
+        "code": code,
+        "title": title,
+        "description": description,
+        "users": [{"user_code": user_code} for user_code in users or []],
+        "schedule": {"code": schedule_code} if schedule_code else None,
+    }
+
+
+def _presentation_row(row) -> dict:
+    return presentation_response(
+        row.code,
+        row.title,
+        row.description,
+        row.users,
+        row.schedule_code,
+    )
+
+
+async def read_schedules(
+    db: AsyncSession,
+    room_code: uuid.UUID = None,
+    future: bool = False,
+    limit: int = None,
+    after: tuple = None,
+):
+    stmt = _schedules_statement(room_code=room_code, future=future)
+
+    if after:
+        stmt = stmt.where(tuple_(Schedule.start_time, Schedule.code) > tuple_(*after))
+    if limit:
+        stmt = stmt.limit(limit)
+
+    result = await db.execute(stmt)
+
+    return [schedule_row(row) for row in result]
+
+
+async def read_schedule(
+    db: AsyncSession,
+    code: uuid.UUID,
+):
+    stmt = _schedules_statement().where(Schedule.code == code)
+
+    row = (await db.execute(stmt)).one_or_none()
+
+    return schedule_row(row) if row else None
+
+
+async def read_rooms(
+    db: AsyncSession,
+    limit: int = None,
+    after: tuple = None,
+):
+    stmt = _rooms_statement()
+
+    if after:
+        stmt = stmt.where(Room.code > after[0])
+    if limit:
+        stmt = stmt.limit(limit)
+
+    result = await db.execute(stmt)
+
+    return [_room_row(row) for row in result]
+
+
+async def read_room(
+    db: AsyncSession,
+    code: uuid.UUID,
+):
+    stmt = _rooms_statement().where(Room.code == code)
+
+    row = (await db.execute(stmt)).one_or_none()
+
+    return _room_row(row) if row else None
+
+
+async def read_presentations(
+    db: AsyncSession,
+    user_code: uuid.UUID,
+    limit: int = None,
+    after: tuple = None,
+):
+    presented = select(PresentationPresenter.presentation_code).where(
+        PresentationPresenter.user_code == user_code
+    )
+    stmt = _presentations_statement().where(Presentation.code.in_(presented))
+
+    if after:
+        stmt = stmt.where(Presentation.code > after[0])
+    if limit:
+        stmt = stmt.limit(limit)
+
+    result = await db.execute(stmt)
+
+    return [_presentation_row(row) for row in result]
+
+
+async def read_presentation(
+    db: AsyncSession,
+    code: uuid.UUID,
+):
+    stmt = _presentations_statement().where(Presentation.code == code)
+
+    row = (await db.execute(stmt)).one_or_none()
+
+    return _presentation_row(row) if row else None
+
+
+async def stream_schedules(
+    room_code: uuid.UUID = None,
+    future: bool = False,
+    session_maker=AsyncSessionMaker,
+):
+    # Streaming outlives the request-scoped session, so it owns its own.
+    stmt = _schedules_statement(room_code=room_code, future=future)
+    stmt = stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    async with session_maker() as session:
+        result = await session.stream(stmt)
+        async for row in result:
+            yield schedule_row(row)
+
+
+async def stream_rooms(session_maker=AsyncSessionMaker):
+    stmt = _rooms_statement().execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    async with session_maker() as session:
+        result = await session.stream(stmt)
+        async for row in result:
+            yield _room_row(row)
@@ -1,15 +1,19 @@
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.db.models import User
 from .auth import hash_password
 from app.schemas import UserUpdate
+from app.services import claims_versions, principal_cache
 from sqlalchemy.exc import IntegrityError
 
 
 async def get_user_by_email(db: AsyncSession, email: str):
-    query = select(User).where(User.email == email)
+    query = (
+        select(User).options(selectinload(User.presentations)).where(User.email == email)
+    )
     user = await db.scalar(query)
     return user
 
@@ -26,6 +30,24 @@ async def get_user_by_code(db: AsyncSession, code: str):
     return user
 
 
+def bump_claims_versions(user_codes, *columns):
+    """UPDATE invalidating the token claims of ``user_codes``.
+
+    Returns code, new version and change time first, then ``columns``, for
+    ``claims_versions.record`` once the caller has committed.
+    """
+    return (
+        update(User)
+        .where(User.code.in_(user_codes))
+        .values(
+            claims_version=User.claims_version + 1,
+            claims_changed_at=func.now(),
+        )
+        .returning(User.code, User.claims_version, User.claims_changed_at, *columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
 async def create_user(db: AsyncSession, user: dict) -> User:
     hashed_password = await hash_password(user.get("password"))
     try:
@@ -38,6 +60,8 @@ async def create_user(db: AsyncSession, user: dict) -> User:
         )
         db.add(db_user)
         await db.commit()
+        # a new user has no presentations yet, no need to load them back
+        set_committed_value(db_user, "presentations", [])
         return db_user
     except IntegrityError:
         # TODO change to HTTPException
@@ -55,6 +79,13 @@ async def update_user(db: AsyncSession, user_code: str, user: UserUpdate):
         for i, v in user.items():
             setattr(db_user, i, v)
 
+        bumps = []
+        if "role" in user:
+            await db.flush()
+            bumps = (await db.execute(bump_claims_versions([db_user.code]))).all()
+
         await db.commit()
+        principal_cache.invalidate(db_user.code)
+        claims_versions.record(bumps)
         return db_user
     return None
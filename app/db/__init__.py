@@ -1,10 +1,14 @@
 from .database import (
-    database,
     engine,
     Base,
     AsyncSessionMaker,
     init_db,
+    prewarm_pools,
     get_async_session,
     DATABASE_URL,
     AsyncSessionMaker,
+    replica_engine,
+    replica_router,
 )
+from .loaders import EntityLoader, Loaders, get_loaders
+from .replica import ReplicaRouter, current_user_code, routed_session_maker
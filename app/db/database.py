@@ -1,11 +1,15 @@
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, make_url, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-import databases
 import os
 from dotenv import load_dotenv
 
+from app.db.instrumentation import install as install_instrumentation
+from app.db.pool import TimedQueuePool, prewarm, register_pool_metrics
+from app.db.replica import PrimarySession, ReplicaRouter
+from app.db.slow_queries import SLOW_QUERY_ENABLED, slow_queries
+
 load_dotenv()
 
 DATABASE_URL = (
@@ -17,22 +21,88 @@ DATABASE_URL = (
     + f"{os.getenv('POSTGRES_DB')}"
 )
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", str(DB_POOL_SIZE)))
+# asyncpg's own cache and SQLAlchemy's prepared statement cache, 0 disables
+# both (needed behind pgbouncer in transaction mode)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
+ENGINE_OPTIONS = dict(
+    echo=False,
+    future=True,
+    poolclass=TimedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    },
+)
+
+REPLICA_POSTGRES_HOST = os.getenv("REPLICA_POSTGRES_HOST")
+REPLICA_POSTGRES_PORT = os.getenv("REPLICA_POSTGRES_PORT", os.getenv("POSTGRES_PORT"))
+
+# replicas share the primary's roles and database, only the address differs
+REPLICA_DATABASE_URL = (
+    make_url(DATABASE_URL).set(
+        host=REPLICA_POSTGRES_HOST, port=int(REPLICA_POSTGRES_PORT)
+    )
+    if REPLICA_POSTGRES_HOST
+    else None
+)
+
+engine = create_async_engine(DATABASE_URL, **ENGINE_OPTIONS)
+install_instrumentation(engine)
+register_pool_metrics(engine)
+if SLOW_QUERY_ENABLED:
+    slow_queries.install(engine)
 
 AsyncSessionMaker = sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    sync_session_class=PrimarySession,
 )
 
-database = databases.Database(DATABASE_URL)
+replica_engine = None
+ReplicaSessionMaker = None
+
+if REPLICA_DATABASE_URL:
+    replica_engine = create_async_engine(REPLICA_DATABASE_URL, **ENGINE_OPTIONS)
+    install_instrumentation(replica_engine)
+    register_pool_metrics(replica_engine, name="replica")
+    if SLOW_QUERY_ENABLED:
+        slow_queries.install(replica_engine)
+
+    ReplicaSessionMaker = sessionmaker(
+        bind=replica_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+replica_router = ReplicaRouter(primary=AsyncSessionMaker, replica=ReplicaSessionMaker)
+replica_router.install()
 
 Base = declarative_base(metadata=MetaData())
 
 
 async def init_db():
     async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def prewarm_pools():
+    await prewarm(engine, DB_POOL_PREWARM)
+    if replica_engine is not None:
+        await prewarm(replica_engine, DB_POOL_PREWARM)
+
+
 async def get_async_session():
     async with AsyncSessionMaker() as session:
         yield session
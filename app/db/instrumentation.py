@@ -0,0 +1,130 @@
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session, raiseload
+
+from app.metrics import METRICS_ENABLED, registry
+
+load_dotenv()
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+REPEATED_QUERY_THRESHOLD = int(os.getenv("REPEATED_QUERY_THRESHOLD", "3"))
+DB_RAISELOAD = os.getenv("DB_RAISELOAD", "false").lower() == "true"
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+logger = logging.getLogger(__name__)
+
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL statements",
+)
+
+_PLACEHOLDERS = re.compile(r"\$\d+(?:::\w+)?(?:\s*,\s*\$\d+(?:::\w+)?)*")
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse bound parameters so expanded IN lists share one shape."""
+    return _PLACEHOLDERS.sub("?", " ".join(statement.split()))
+
+
+class QueryStats:
+    """Statements issued while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str):
+        self.count += 1
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = REPEATED_QUERY_THRESHOLD) -> dict:
+        return {
+            shape: count for shape, count in self.shapes.items() if count >= threshold
+        }
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_raiseload = DB_RAISELOAD
+
+
+def start_query_stats() -> QueryStats:
+    stats = QueryStats()
+    _query_stats.set(stats)
+    return stats
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+@contextmanager
+def untracked():
+    """Keep statements run inside out of the current request's stats."""
+    token = _query_stats.set(None)
+    try:
+        yield
+    finally:
+        _query_stats.reset(token)
+
+
+def report_repeated(stats: QueryStats, endpoint: str):
+    for shape, count in stats.repeated().items():
+        logger.warning(
+            "Possible N+1 on %s: statement ran %d times: %s", endpoint, count, shape
+        )
+
+
+def set_raiseload(enabled: bool):
+    """Make every unplanned relationship load raise instead of querying."""
+    global _raiseload
+    _raiseload = enabled
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    context._instrumentation_started = time.perf_counter()
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement)
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._instrumentation_started
+    DB_QUERY_SECONDS.observe(elapsed)
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.db_time += elapsed
+
+
+def _apply_raiseload(orm_execute_state):
+    if (
+        _raiseload
+        and orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        # explicit loader options on the statement still win over "*"
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*")
+        )
+
+
+def install(engine):
+    if not event.contains(Session, "do_orm_execute", _apply_raiseload):
+        event.listen(Session, "do_orm_execute", _apply_raiseload)
+
+    if QUERY_STATS_ENABLED or METRICS_ENABLED:
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_execute)
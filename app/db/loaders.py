@@ -0,0 +1,167 @@
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.models import Presentation, Schedule, User
+
+LOADERS_KEY = "loaders"
+
+
+class EntityLoader:
+    """Request scoped loader of one model by a key column.
+
+    Loads issued during the same event loop tick are coalesced into a
+    single ``IN`` query, and every key is fetched at most once per
+    request; ``clear`` forgets a key after the caller changed the row.
+    Rows fetched here also prime the loaders ``link``-ed to this one.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        lock: asyncio.Lock,
+        model,
+        key,
+        options: tuple = (),
+    ):
+        self.session = session
+        self.lock = lock
+        self.model = model
+        self.key = key
+        self.options = options
+        self.futures: Dict[Hashable, asyncio.Future] = {}
+        self.queue: List[Tuple[Hashable, asyncio.Future]] = []
+        self.tasks = set()
+        self.links: List[Tuple["EntityLoader", Optional[str], Optional[str]]] = []
+
+    def link(
+        self,
+        loader: "EntityLoader",
+        attribute: Optional[str] = None,
+        back: Optional[str] = None,
+    ):
+        """Prime ``loader`` with the ``attribute`` relationship of every
+        fetched row, or with the row itself (the same entity under another
+        key) when no attribute is given. ``back`` names the reverse side,
+        which is set to the row so the primed entity needs no lazy load."""
+        self.links.append((loader, attribute, back))
+
+    async def load(self, key: Hashable) -> Optional[Any]:
+        future = self.futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self.futures[key] = loop.create_future()
+            self.queue.append((key, future))
+            if len(self.queue) == 1:
+                loop.call_soon(self._dispatch)
+
+        return await future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Optional[Any]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, entity):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(entity)
+        self.futures[getattr(entity, self.key.key)] = future
+
+    def clear(self, key: Hashable):
+        self.futures.pop(key, None)
+
+    def _dispatch(self):
+        batch, self.queue = self.queue, []
+        task = asyncio.create_task(self._fetch(batch))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _fetch(self, batch: List[Tuple[Hashable, asyncio.Future]]):
+        stmt = (
+            select(self.model)
+            .options(*self.options)
+            .where(self.key.in_({key for key, _ in batch}))
+            .execution_options(populate_existing=True)
+        )
+        try:
+            # one AsyncSession cannot run two statements at once
+            async with self.lock:
+                rows = (await self.session.scalars(stmt)).all()
+        except Exception as error:
+            for key, future in batch:
+                if self.futures.get(key) is future:
+                    del self.futures[key]
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for row in rows:
+            self._prime_links(row)
+
+        found = {getattr(row, self.key.key): row for row in rows}
+        for key, future in batch:
+            if not future.done():
+                future.set_result(found.get(key))
+
+    def _prime_links(self, row):
+        unloaded = inspect(row).unloaded
+        for loader, attribute, back in self.links:
+            if attribute is None:
+                loader.prime(row)
+                continue
+            if attribute in unloaded:
+                continue
+
+            related = getattr(row, attribute)
+            if related is None:
+                continue
+            if back:
+                set_committed_value(related, back, row)
+            loader.prime(related)
+
+
+class Loaders:
+    def __init__(self, session: AsyncSession):
+        lock = asyncio.Lock()
+        self.users = EntityLoader(
+            session,
+            lock,
+            User,
+            User.code,
+            (selectinload(User.presentations),),
+        )
+        self.users_by_email = EntityLoader(
+            session,
+            lock,
+            User,
+            User.email,
+            (selectinload(User.presentations),),
+        )
+        self.presentations = EntityLoader(
+            session,
+            lock,
+            Presentation,
+            Presentation.code,
+            (selectinload(Presentation.schedule), selectinload(Presentation.users)),
+        )
+        self.schedules = EntityLoader(
+            session,
+            lock,
+            Schedule,
+            Schedule.code,
+            (selectinload(Schedule.presentation).selectinload(Presentation.users),),
+        )
+
+        self.users.link(self.users_by_email)
+        self.users_by_email.link(self.users)
+        self.presentations.link(self.schedules, "schedule", back="presentation")
+        self.schedules.link(self.presentations, "presentation", back="schedule")
+
+
+def get_loaders(session: AsyncSession) -> Loaders:
+    loaders = session.info.get(LOADERS_KEY)
+    if loaders is None:
+        loaders = session.info[LOADERS_KEY] = Loaders(session)
+    return loaders
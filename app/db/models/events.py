@@ -2,9 +2,9 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.dialects.postgresql import TIMESTAMP, ExcludeConstraint
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import ForeignKey, Integer, String, Column, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Column, Text, func, text
 from sqlalchemy import UUID as sqlalchemy_UUID
 from app.db.database import Base
 
@@ -80,6 +80,9 @@ class Presentation(Base):
 
 class PresentationPresenter(Base):
     __tablename__ = "presentation_presenters"
+    __table_args__ = (
+        Index("ix_presentation_presenters_user", "user_code", "presentation_code"),
+    )
 
     presentation_code: Mapped[UUID] = mapped_column(
         sqlalchemy_UUID,
@@ -116,6 +119,17 @@ class PresentationPresenter(Base):
 
 class Schedule(Base):
     __tablename__ = "schedules"
+    __table_args__ = (
+        ExcludeConstraint(
+            ("room_code", "="),
+            (text("tstzrange(start_time, end_time)"), "&&"),
+            name="schedules_room_time_excl",
+            using="gist",
+        ),
+        Index("ix_schedules_start_time_code", "start_time", "code"),
+        Index("ix_schedules_room_start_code", "room_code", "start_time", "code"),
+        Index("ix_schedules_presentation", "presentation_code"),
+    )
 
     code: Mapped[UUID] = mapped_column(
         sqlalchemy_UUID,
@@ -154,6 +168,13 @@ class Schedule(Base):
         nullable=False,
     )
 
+    seats_taken: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+
     room: Mapped[Room] = relationship(
         "Room",
         foreign_keys=[room_code],
@@ -177,6 +198,7 @@ class Schedule(Base):
 
 class Registration(Base):
     __tablename__ = "registrations"
+    __table_args__ = (Index("ix_registrations_user", "user_code"),)
 
     code: Mapped[UUID] = mapped_column(
         sqlalchemy_UUID,
@@ -218,3 +240,43 @@ class Registration(Base):
         back_populates="registrations",
         lazy="select",
     )
+
+
+class Waitlist(Base):
+    __tablename__ = "waitlist"
+    __table_args__ = (
+        Index("ix_waitlist_schedule_created", "schedule_code", "created_at"),
+    )
+
+    code: Mapped[UUID] = mapped_column(
+        sqlalchemy_UUID,
+        unique=True,
+        default=uuid4,
+        nullable=False,
+    )
+
+    schedule_code: Mapped[UUID] = mapped_column(
+        sqlalchemy_UUID,
+        ForeignKey(
+            "schedules.code",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+        nullable=False,
+    )
+
+    user_code: Mapped[UUID] = mapped_column(
+        sqlalchemy_UUID,
+        ForeignKey(
+            "user.code",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
@@ -1,8 +1,11 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
+from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Integer, String, Column, Enum
+from sqlalchemy import ForeignKey, Index, Integer, String, Column, Enum, func
+from sqlalchemy import UUID as sqlalchemy_UUID
 from app.db.database import Base
 from app.db.models.enums import UserRole
 
@@ -40,20 +43,28 @@ class User(Base):
     password_hash: Mapped[str] = mapped_column(
         String(255),
         nullable=False,
-        index=True,
         # length depends on hash algorythm
     )
 
-    refresh_token: Mapped[str] = mapped_column(
-        String(300),
-        nullable=True,
-    )
-
     role: Mapped[UserRole] = mapped_column(
         Enum(UserRole),
         nullable=False,
     )
 
+    # bumped whenever role or presenter set change, see ClaimsVersionStore
+    claims_version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+
+    claims_changed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        index=True,
+    )
+
     presentations: Mapped[list["PresentationPresenter"]] = relationship(
         "PresentationPresenter",
         back_populates="user",
@@ -65,3 +76,43 @@ class User(Base):
         back_populates="user",
         lazy="select",
     )
+
+
+class RefreshSession(Base):
+    __tablename__ = "refresh_sessions"
+    __table_args__ = (
+        Index("ix_refresh_sessions_user", "user_code"),
+        Index("ix_refresh_sessions_revoked_at", "revoked_at"),
+    )
+
+    jti: Mapped[UUID] = mapped_column(
+        sqlalchemy_UUID,
+        default=uuid4,
+        primary_key=True,
+        nullable=False,
+    )
+
+    user_code: Mapped[UUID] = mapped_column(
+        sqlalchemy_UUID,
+        ForeignKey(
+            "user.code",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+    )
+
+    revoked_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+    )
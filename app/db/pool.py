@@ -0,0 +1,73 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.metrics import registry
+
+POOL_WAIT_SECONDS = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+
+_engines = {}
+
+
+def _read(method: str):
+    return lambda: {
+        (name,): getattr(engine.pool, method)() for name, engine in _engines.items()
+    }
+
+
+for metric, documentation, method in (
+    ("db_pool_size", "Configured pool size", "size"),
+    ("db_pool_checked_out", "Connections currently checked out", "checkedout"),
+    ("db_pool_checked_in", "Idle connections in the pool", "checkedin"),
+    (
+        "db_pool_overflow",
+        "Connections beyond the pool size, negative while below it",
+        "overflow",
+    ),
+):
+    registry.gauge(metric, documentation, _read(method), labelnames=("pool",))
+
+
+def register_pool_metrics(engine, name: str = "primary"):
+    # read through the engine, dispose() replaces its pool
+    _engines[name] = engine
+
+
+async def prewarm(engine, count: int):
+    """Open ``count`` pooled connections up front and return them idle.
+
+    They are held together so the pool cannot hand the same one back, and
+    never more than the pool keeps, overflow connections would be closed
+    on release anyway.
+    """
+    count = min(count, engine.pool.size())
+    if count <= 0:
+        return
+
+    async with AsyncExitStack() as stack:
+        results = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(count)),
+            return_exceptions=True,
+        )
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.db.instrumentation import untracked
+
+load_dotenv()
+
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "1"))
+PRIMARY_PIN_SECONDS = float(os.getenv("PRIMARY_PIN_SECONDS", "5"))
+PRIMARY_PIN_SIZE = int(os.getenv("PRIMARY_PIN_SIZE", "100000"))
+
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """)
+
+SESSION_MAKER_KEY = "session_maker"
+
+logger = logging.getLogger(__name__)
+
+# Set by the auth dependencies so a commit can pin the caller to the primary
+current_user_code: ContextVar[Optional[uuid.UUID]] = ContextVar(
+    "current_user_code", default=None
+)
+
+
+def routed_session_maker(session):
+    """Maker the routed ``session`` came from, for work that outlives it."""
+    return session.info[SESSION_MAKER_KEY]
+
+
+class PrimarySession(Session):
+    """Session class of the primary maker, commits pin the current user."""
+
+
+class ReplicaRouter:
+    """Picks the primary or the replica session maker for a read.
+
+    Reads go to the primary when no replica is configured, when the caller
+    committed something within the last ``pin_seconds`` (read your own
+    writes) or when the replica's replay lag exceeds ``max_lag`` or cannot
+    be measured. Pins are process local, like the principal cache.
+    """
+
+    def __init__(
+        self,
+        primary,
+        replica=None,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = REPLICA_LAG_CHECK_SECONDS,
+        pin_seconds: float = PRIMARY_PIN_SECONDS,
+        pin_size: int = PRIMARY_PIN_SIZE,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.pin_seconds = pin_seconds
+        self.pin_size = pin_size
+        self.pins: OrderedDict = OrderedDict()
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self.lock = asyncio.Lock()
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self.lag_fallbacks = 0
+
+    def pin(self, user_code: uuid.UUID):
+        self.pins[user_code] = time.monotonic() + self.pin_seconds
+        self.pins.move_to_end(user_code)
+        while len(self.pins) > self.pin_size:
+            self.pins.popitem(last=False)
+
+    def pinned(self, user_code: Optional[uuid.UUID]) -> bool:
+        if user_code is None:
+            return False
+        deadline = self.pins.get(user_code)
+        if deadline is None:
+            return False
+        if deadline <= time.monotonic():
+            self.pins.pop(user_code, None)
+            return False
+        return True
+
+    async def measure_lag(self) -> Optional[float]:
+        async with self.replica() as session:
+            lag = (await session.execute(REPLICA_LAG_QUERY)).scalar()
+        return None if lag is None else float(lag)
+
+    async def replica_healthy(self) -> bool:
+        if time.monotonic() - self.checked_at >= self.check_interval:
+            async with self.lock:
+                if time.monotonic() - self.checked_at >= self.check_interval:
+                    try:
+                        # the probe is shared by every request in the
+                        # interval, not part of the one that triggered it
+                        with untracked():
+                            self.lag = await self.measure_lag()
+                    except Exception:
+                        logger.exception("Replica lag check failed")
+                        self.lag = None
+                    self.checked_at = time.monotonic()
+
+        return self.lag is not None and self.lag <= self.max_lag
+
+    async def session_maker(self, user_code: Optional[uuid.UUID] = None):
+        if self.replica is None or self.pinned(user_code):
+            self.primary_reads += 1
+            return self.primary
+
+        if not await self.replica_healthy():
+            self.lag_fallbacks += 1
+            self.primary_reads += 1
+            return self.primary
+
+        self.replica_reads += 1
+        return self.replica
+
+    def install(self, session_class=PrimarySession):
+        event.listen(session_class, "after_commit", self._after_commit)
+
+    def _after_commit(self, session):
+        user_code = current_user_code.get()
+        if user_code is not None:
+            self.pin(user_code)
+
+    def stats(self) -> dict:
+        return {
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+            "lag_fallbacks": self.lag_fallbacks,
+            "pinned_users": len(self.pins),
+            "lag_seconds": -1 if self.lag is None else self.lag,
+        }
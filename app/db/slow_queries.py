@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.instrumentation import statement_shape
+
+load_dotenv()
+
+SLOW_QUERY_ENABLED = os.getenv("SLOW_QUERY_ENABLED", "false").lower() == "true"
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "5000"))
+
+MAX_PARAMETER_LENGTH = 200
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(statement_shape(statement).encode()).hexdigest()[:16]
+
+
+def explainable(statement: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so only plain reads qualify
+    head = statement.lstrip()[:6].upper()
+    return head == "SELECT" and "FOR UPDATE" not in statement.upper()
+
+
+def _parameters(parameters) -> list:
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    elif not isinstance(parameters, (list, tuple)):
+        parameters = [parameters]
+    return [repr(value)[:MAX_PARAMETER_LENGTH] for value in parameters]
+
+
+class SlowQueryRecorder:
+    """Ring buffer of statements slower than a threshold.
+
+    A sample of the recorded SELECTs is re-run as ``EXPLAIN (ANALYZE,
+    BUFFERS)`` on a connection outside the application pool, inside a
+    transaction that is always rolled back; at most one plan per
+    fingerprint is captured at a time.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+        size: int = SLOW_QUERY_BUFFER_SIZE,
+        sample_rate: float = SLOW_QUERY_EXPLAIN_SAMPLE,
+        explain_timeout_ms: int = SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self.entries: deque = deque(maxlen=size)
+        self.fingerprints: Dict[str, dict] = {}
+        self.explaining = set()
+        self.tasks = set()
+        self.side_engines = {}
+
+    def install(self, engine):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._slow_query_started
+        if elapsed >= self.threshold:
+            self.record(statement, parameters, elapsed, executemany, conn.engine.url)
+
+    def record(
+        self,
+        statement: str,
+        parameters,
+        elapsed: float,
+        executemany: bool = False,
+        url=None,
+    ) -> dict:
+        key = fingerprint(statement)
+        entry = {
+            "fingerprint": key,
+            "statement": statement,
+            "parameters": [] if executemany else _parameters(parameters),
+            "duration_ms": round(elapsed * 1000, 3),
+            "recorded_at": datetime.now(timezone.utc),
+            "plan": None,
+        }
+        self.entries.append(entry)
+
+        summary = self.fingerprints.setdefault(
+            key, {"fingerprint": key, "count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        summary["count"] += 1
+        summary["total_ms"] += entry["duration_ms"]
+        summary["max_ms"] = max(summary["max_ms"], entry["duration_ms"])
+        if len(self.fingerprints) > self.entries.maxlen * 10:
+            self.fingerprints.pop(next(iter(self.fingerprints)))
+
+        if (
+            url is not None
+            and not executemany
+            and key not in self.explaining
+            and explainable(statement)
+            and random.random() < self.sample_rate
+        ):
+            self._schedule_explain(entry, statement, parameters, url)
+
+        return entry
+
+    def _schedule_explain(self, entry: dict, statement: str, parameters, url):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self.explaining.add(entry["fingerprint"])
+        task = loop.create_task(self._explain(entry, statement, parameters, url))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _explain(self, entry: dict, statement: str, parameters, url):
+        try:
+            # explained on the engine that ran it, replica reads on the replica
+            side_engine = self.side_engines.get(url)
+            if side_engine is None:
+                side_engine = self.side_engines[url] = create_async_engine(
+                    url, poolclass=NullPool
+                )
+
+            async with side_engine.connect() as conn:
+                transaction = await conn.begin()
+                try:
+                    await conn.exec_driver_sql(
+                        f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}"
+                    )
+                    result = await conn.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+                        parameters,
+                    )
+                    plan = result.scalar()
+                finally:
+                    await transaction.rollback()
+
+            entry["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+        except Exception:
+            logger.exception("EXPLAIN of slow query %s failed", entry["fingerprint"])
+        finally:
+            self.explaining.discard(entry["fingerprint"])
+
+    def snapshot(self) -> dict:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "queries": list(reversed(self.entries)),
+            "fingerprints": sorted(
+                self.fingerprints.values(), key=lambda s: s["total_ms"], reverse=True
+            ),
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self.fingerprints.clear()
+
+    async def close(self):
+        for task in list(self.tasks):
+            task.cancel()
+        for side_engine in self.side_engines.values():
+            await side_engine.dispose()
+        self.side_engines.clear()
+
+
+slow_queries = SlowQueryRecorder()
@@ -1,9 +1,19 @@
-from .user_dependencies import get_current_user, user_dependency
-from .db_dependency import db_dependency
+from .user_dependencies import (
+    get_current_user,
+    get_claims_principal,
+    user_dependency,
+    claims_user_dependency,
+    token_dependency,
+)
+from .db_dependency import db_dependency, read_db_dependency
 
 
 __all__ = [
     "get_current_user",
     "user_dependency",
+    "get_claims_principal",
+    "claims_user_dependency",
+    "token_dependency",
     "db_dependency",
+    "read_db_dependency",
 ]
@@ -1,4 +1,16 @@
 from fastapi import Depends
-from app.db import get_async_session
+from app.db import get_async_session, replica_router
+from app.db.replica import SESSION_MAKER_KEY
+
+from .user_dependencies import get_claims_principal
+
+
+async def get_read_session(user=Depends(get_claims_principal)):
+    maker = await replica_router.session_maker(user.code)
+    async with maker() as session:
+        session.info[SESSION_MAKER_KEY] = maker
+        yield session
+
 
 db_dependency = Depends(get_async_session)
+read_db_dependency = Depends(get_read_session)
@@ -1,38 +1,78 @@
 from typing import Annotated
 
-import jwt
-from dotenv import load_dotenv
-import os
 from starlette import status
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.auth import session_revoked
 from app.crud.users import get_user_by_code
-from app.db import get_async_session
+from app.db import current_user_code, get_async_session
+from app.services import Principal, claims_versions, principal_cache, token_service
+from app.tracing import traced
 
-load_dotenv()
-
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
+token_dependency = Annotated[str, Depends(oauth2_scheme)]
 
 
+@traced("auth")
 async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
+    token: token_dependency,
     db: AsyncSession = Depends(get_async_session),
 ):
+    principal = principal_cache.get(token)
+    if principal:
+        current_user_code.set(principal.code)
+        return principal
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = token_service.decode(token)
         code = payload.get("sub")
         if not code:
             raise Exception("Invalid token")
         user = await get_user_by_code(code=code, db=db)
         if not user:
             raise Exception("User not found")
-        return user
+        if await session_revoked(payload):
+            raise Exception("Session has been revoked")
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+    principal = Principal.from_user(user)
+    principal_cache.put(token, principal, expires_at=payload.get("exp"))
+    current_user_code.set(principal.code)
+
+    return principal
+
+
+@traced("auth")
+async def get_claims_principal(
+    token: token_dependency,
+    db: AsyncSession = Depends(get_async_session),
+):
+    # Authorizes straight from the token claims; tokens without claims or
+    # with claims older than the user's claims version fall back to
+    # get_current_user, the session stays unused otherwise.
+    try:
+        payload = token_service.decode(token)
+        principal = Principal.from_claims(payload)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
+    if principal is None or not claims_versions.fresh(
+        principal.code, payload.get("ver")
+    ):
+        return await get_current_user(token=token, db=db)
+
+    if await session_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked",
+        )
+
+    current_user_code.set(principal.code)
+    return principal
+
 
-user_dependency = Annotated[dict, Depends(get_current_user)]
+user_dependency = Annotated[Principal, Depends(get_current_user)]
+claims_user_dependency = Annotated[Principal, Depends(get_claims_principal)]
@@ -1,22 +1,84 @@
 from fastapi import FastAPI
 
-from app.crud import create_room, get_rooms
-from app.db import AsyncSessionMaker, init_db
-from .routes import event_router, user_router
+from app.crud import (create_room, get_rooms, get_waitlisted_schedules,
+                      promote_waitlisted)
+from app.db import (AsyncSessionMaker, init_db, prewarm_pools, replica_engine,
+                    replica_router)
+from app.db.instrumentation import QUERY_STATS_ENABLED
+from app.db.slow_queries import SLOW_QUERY_ENABLED, slow_queries
+from app.metrics import METRICS_ENABLED, registry
+from app.middleware import InstrumentationMiddleware
+from app.tracing import SERVER_TIMING_ENABLED, trace_file
+from app.services import (claims_versions, password_hasher, principal_cache,
+                          refresh_sessions, schedule_index, waitlist_worker)
+from .routes import admin_router, event_router, metrics_router, user_router
 
 app = FastAPI()
 
 app.include_router(user_router)
 app.include_router(event_router)
 
+if QUERY_STATS_ENABLED or METRICS_ENABLED or SERVER_TIMING_ENABLED:
+    app.add_middleware(InstrumentationMiddleware)
+
+if METRICS_ENABLED:
+    app.include_router(metrics_router)
+    registry.stats(
+        "principal_cache",
+        "Principal cache",
+        principal_cache.stats,
+        counters=("hits", "misses", "evictions"),
+    )
+    registry.stats(
+        "password_hasher",
+        "Password hasher",
+        password_hasher.stats,
+        counters=("completed", "failed", "rejected", "latency_seconds_total"),
+    )
+    registry.stats(
+        "refresh_sessions",
+        "Refresh sessions",
+        refresh_sessions.stats,
+        counters=("filter_passes", "backend_checks"),
+    )
+    registry.stats(
+        "claims_versions",
+        "Token claims versions",
+        claims_versions.stats,
+        counters=("stale_rejections",),
+    )
+    if replica_engine is not None:
+        registry.stats(
+            "replica",
+            "Read routing",
+            replica_router.stats,
+            counters=("primary_reads", "replica_reads", "lag_fallbacks"),
+        )
+
+if SLOW_QUERY_ENABLED:
+    app.include_router(admin_router)
+
 
 @app.on_event("startup")
 async def startup():
+    if trace_file is not None:
+        trace_file.start()
+
+    password_hasher.start()
+
     try:
         await init_db()
     except Exception as e:
         print(f"Error during DB initialization: {e}")
 
+    try:
+        await prewarm_pools()
+    except Exception as e:
+        print(f"Error during DB pool pre-warming: {e}")
+
+    await refresh_sessions.start()
+    await claims_versions.start()
+
     async with AsyncSessionMaker() as session:
         rooms = await get_rooms(session)
 
@@ -37,6 +99,22 @@ async def startup():
                 },
             )
 
+        await schedule_index.load(session)
+
+        waitlist_worker.start(handler=promote_waitlisted)
+        waitlist_worker.notify_many(await get_waitlisted_schedules(session))
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await waitlist_worker.stop()
+    await refresh_sessions.stop()
+    await claims_versions.stop()
+    password_hasher.shutdown()
+    await slow_queries.close()
+    if trace_file is not None:
+        trace_file.stop()
+
 
 @app.get("/")
 async def root():
@@ -0,0 +1,197 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines of every sample, without the header."""
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: Dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            values = list(self.values.items())
+        return [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in values
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        # per label set: one count per bucket, then the overflow, sum and count
+        self.series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            snapshot = [
+                (labels, list(series)) for labels, series in self.series.items()
+            ]
+
+        lines = []
+        names = self.labelnames + ("le",)
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} "
+                    f"{cumulative}"
+                )
+            suffix = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{suffix} {series[-1]}")
+        return lines
+
+
+class Gauge(Metric):
+    """Gauge read from a callback when the metrics are scraped.
+
+    The callback returns a number, or a mapping of label value tuples to
+    numbers for labelled gauges.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Callable = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in values.items()
+        ]
+
+
+class CallbackCounter(Gauge):
+    """Counter read from a callback, for totals kept by another object."""
+
+    kind = "counter"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, tuple(labelnames)))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), **kw
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, tuple(labelnames), **kw))
+
+    def gauge(self, name: str, documentation: str, callback: Callable, labelnames=()):
+        return self.register(
+            Gauge(name, documentation, tuple(labelnames), callback=callback)
+        )
+
+    def stats(
+        self,
+        prefix: str,
+        documentation: str,
+        callback: Callable[[], dict],
+        counters: Iterable[str] = (),
+    ):
+        """Expose every key of a ``stats()`` dict as ``<prefix>_<key>``.
+
+        Keys listed in ``counters`` only ever grow and are typed as counters,
+        the others are gauges.
+        """
+        counters = set(counters)
+        for key in callback():
+            metric = CallbackCounter if key in counters else Gauge
+            self.register(
+                metric(
+                    f"{prefix}_{key}",
+                    f"{documentation}: {key.replace('_', ' ')}",
+                    callback=lambda key=key: callback()[key],
+                )
+            )
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self.metrics.values()):
+            samples = metric.samples()
+            if samples:
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
@@ -0,0 +1,98 @@
+import time
+
+from app.db.instrumentation import (
+    QUERY_COUNT_HEADER,
+    QUERY_STATS_ENABLED,
+    report_repeated,
+    start_query_stats,
+)
+from app.metrics import COUNT_BUCKETS, METRICS_ENABLED, registry
+from app.tracing import (
+    SERVER_TIMING_ENABLED,
+    SERVER_TIMING_HEADER,
+    start_trace,
+    trace_file,
+)
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last body chunk",
+    ("method", "route", "status"),
+)
+REQUEST_DB_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements issued per request",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = registry.histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per request",
+    ("method", "route"),
+)
+
+
+def route_path(scope: dict) -> str:
+    """Path template of the matched route, unmatched paths share one label."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class InstrumentationMiddleware:
+    """Per request statement counts, N+1 warnings, metrics and Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        stats = start_query_stats()
+        trace = start_trace() if SERVER_TIMING_ENABLED else None
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                if QUERY_STATS_ENABLED:
+                    headers.append(
+                        (QUERY_COUNT_HEADER.lower().encode(), str(stats.count).encode())
+                    )
+                if trace is not None:
+                    timing = trace.server_timing(
+                        db=stats.db_time, app=time.perf_counter() - started
+                    )
+                    headers.append(
+                        (SERVER_TIMING_HEADER.lower().encode(), timing.encode())
+                    )
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_path(scope)
+            method = scope["method"]
+            if QUERY_STATS_ENABLED:
+                report_repeated(stats, f"{method} {route}")
+            if METRICS_ENABLED:
+                REQUEST_SECONDS.observe(
+                    time.perf_counter() - started, method, route, status_code
+                )
+                REQUEST_DB_QUERIES.observe(stats.count, method, route)
+                REQUEST_DB_SECONDS.observe(stats.db_time, method, route)
+            if trace_file is not None:
+                trace.add("db", stats.db_time)
+                trace_file.write(
+                    trace,
+                    ts=time.time(),
+                    method=method,
+                    route=route,
+                    status=status_code,
+                    queries=stats.count,
+                    total_ms=round((time.perf_counter() - started) * 1000, 3),
+                )
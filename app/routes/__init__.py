@@ -1,7 +1,11 @@
 from .user_routes import router as user_router
 from .event_routes import router as event_router
+from .metrics_routes import router as metrics_router
+from .admin_routes import router as admin_router
 
 __all__ = [
     "user_router",
     "event_router",
+    "metrics_router",
+    "admin_router",
 ]
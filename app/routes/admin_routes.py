@@ -0,0 +1,45 @@
+import hmac
+import os
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, Header, HTTPException
+from starlette import status
+
+from app.db.slow_queries import slow_queries
+from app.schemas import SlowQueryResponse
+
+load_dotenv()
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+async def require_admin(x_admin_token: str | None = Header(default=None)):
+    if (
+        not ADMIN_TOKEN
+        or not x_admin_token
+        or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action",
+        )
+
+
+@router.get(
+    path="/slow-queries",
+    response_model=SlowQueryResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def slow_query_log():
+    return slow_queries.snapshot()
+
+
+@router.delete(
+    path="/slow-queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_admin)],
+)
+async def slow_query_log_clear():
+    slow_queries.clear()
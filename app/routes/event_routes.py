@@ -1,20 +1,35 @@
 import uuid
+from datetime import datetime, timedelta
 from typing import List
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud import (create_presentation, create_registration, create_schedule,
-                      get_presentation, get_presentations, get_room, get_rooms,
-                      get_schedule, get_schedules, update_presentation,
-                      update_schedule)
+from app.crud import (create_agenda, create_presentation, create_registration,
+                      create_schedule, create_schedules_bulk,
+                      create_waitlist_entry, delete_registration,
+                      delete_schedule, get_availability, get_waitlist_entry,
+                      read_presentation, read_presentations, read_room,
+                      read_rooms, read_schedule, read_schedules, stream_rooms,
+                      stream_schedules, update_presentation, update_schedule)
 from app.crud.events import get_registration
-from app.dependencies import (db_dependency, user_dependency)
-from app.schemas import (PresentationRequest, PresentationResponse,
-                         PresentationUpdate, RegistrationResponse, RoomResponse,
-                         ScheduleUpdate, SchedulesRequest, SchedulesResponse)
+from app.crud.pagination import (code_cursor, decode_cursor, fetch_limit,
+                                 page_size, paginate, schedule_cursor)
+from app.db import get_loaders, routed_session_maker
+from app.dependencies import (claims_user_dependency, db_dependency,
+                              read_db_dependency, user_dependency)
+from app.schemas import (AgendaRequest, AgendaResponse, PresentationRequest,
+                         PresentationResponse, PresentationUpdate,
+                         RegistrationResponse, RoomAvailability, RoomResponse,
+                         ScheduleBulkResponse, ScheduleUpdate, SchedulesRequest,
+                         SchedulesResponse, WaitlistResponse)
+from app.services import principal_cache, schedule_index, waitlist_worker
+from .streaming import ndjson_response, wants_ndjson
+from .timing import route_class
 
-router = APIRouter(prefix="/events", tags=["Events"])
+router = APIRouter(prefix="/events", tags=["Events"], route_class=route_class)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 @router.post(
@@ -43,11 +58,6 @@ async def presentation_create(
             detail="Wrong input",
         )
 
-    presentation = await get_presentation(
-        code=presentation.code,
-        db=db,
-    )
-
     return presentation
 
 
@@ -78,12 +88,71 @@ async def schedule_create(
             detail="Wrong input",
         )
 
-    schedule = await get_schedule(
+    return schedule
+
+
+@router.post(
+    path="/schedule/bulk",
+    response_model=ScheduleBulkResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def schedule_bulk_create(
+    schedules: List[SchedulesRequest],
+    user: user_dependency,
+    db: AsyncSession = db_dependency,
+):
+    if user.role.value == "listener":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect request",
+        )
+
+    results = await create_schedules_bulk(
         db=db,
-        code=schedule.code,
+        schedules=[schedule.model_dump() for schedule in schedules],
     )
 
-    return schedule
+    created = sum(1 for result in results if result["status"] == "created")
+
+    return {
+        "created": created,
+        "rejected": len(results) - created,
+        "results": results,
+    }
+
+
+@router.post(
+    path="/agenda/solve",
+    response_model=AgendaResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def agenda_solve(
+    agenda: AgendaRequest,
+    user: user_dependency,
+    db: AsyncSession = db_dependency,
+):
+    if user.role.value == "listener":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect request",
+        )
+
+    if agenda.end_time <= agenda.start_time or agenda.duration <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wrong input",
+        )
+
+    result = await create_agenda(
+        db=db,
+        start=agenda.start_time,
+        end=agenda.end_time,
+        duration=timedelta(minutes=agenda.duration),
+        gap=timedelta(minutes=max(agenda.gap, 0)),
+        dry_run=agenda.dry_run,
+    )
+
+    return result
 
 
 @router.post(
@@ -117,10 +186,25 @@ async def registration_create(
     status_code=status.HTTP_200_OK,
 )
 async def presentations_all(
-    user: user_dependency,
-    db: AsyncSession = db_dependency,
+    response: Response,
+    user: claims_user_dependency,
+    db: AsyncSession = read_db_dependency,
+    limit: int = None,
+    cursor: str = None,
 ):
-    presentations = await get_presentations(db=db, user_code=user.code)
+    size = page_size(limit, cursor)
+    presentations = await read_presentations(
+        db=db,
+        user_code=user.code,
+        limit=fetch_limit(size),
+        after=decode_cursor(cursor, *code_cursor),
+    )
+
+    presentations, next_cursor = paginate(
+        presentations, size, key=lambda p: (p["code"],)
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return presentations
 
@@ -132,10 +216,10 @@ async def presentations_all(
 )
 async def presentation_get(
     presentation_code: uuid.UUID,
-    user: user_dependency,
-    db: AsyncSession = db_dependency,
+    user: claims_user_dependency,
+    db: AsyncSession = read_db_dependency,
 ):
-    presentation = await get_presentation(
+    presentation = await read_presentation(
         db=db,
         code=presentation_code,
     )
@@ -155,10 +239,28 @@ async def presentation_get(
     status_code=status.HTTP_200_OK,
 )
 async def rooms_all(
-    user: user_dependency,
-    db: AsyncSession = db_dependency,
+    request: Request,
+    response: Response,
+    user: claims_user_dependency,
+    db: AsyncSession = read_db_dependency,
+    limit: int = None,
+    cursor: str = None,
 ):
-    rooms = await get_rooms(db=db)
+    if wants_ndjson(request):
+        return ndjson_response(
+            stream_rooms(session_maker=routed_session_maker(db)), RoomResponse
+        )
+
+    size = page_size(limit, cursor)
+    rooms = await read_rooms(
+        db=db,
+        limit=fetch_limit(size),
+        after=decode_cursor(cursor, *code_cursor),
+    )
+
+    rooms, next_cursor = paginate(rooms, size, key=lambda r: (r["code"],))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return rooms
 
@@ -170,10 +272,10 @@ async def rooms_all(
 )
 async def rooms_all(
     room_code: uuid.UUID,
-    user: user_dependency,
-    db: AsyncSession = db_dependency,
+    user: claims_user_dependency,
+    db: AsyncSession = read_db_dependency,
 ):
-    room = await get_room(
+    room = await read_room(
         db=db,
         code=room_code,
     )
@@ -187,22 +289,75 @@ async def rooms_all(
     return room
 
 
+@router.get(
+    path="/availability",
+    response_model=List[RoomAvailability],
+    status_code=status.HTTP_200_OK,
+)
+async def availability_get(
+    start_time: datetime,
+    end_time: datetime,
+    user: claims_user_dependency,
+    db: AsyncSession = read_db_dependency,
+    min_duration: int = 30,
+    min_sit_count: int = None,
+):
+    if end_time <= start_time or min_duration <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wrong input",
+        )
+
+    rooms = await get_availability(
+        db=db,
+        start=start_time,
+        end=end_time,
+        min_duration=timedelta(minutes=min_duration),
+        min_sit_count=min_sit_count,
+    )
+
+    return rooms
+
+
 @router.get(
     path="/schedules",
     response_model=List[SchedulesResponse],
     status_code=status.HTTP_200_OK,
 )
 async def schedules_all(
-    user: user_dependency,
-    db: AsyncSession = db_dependency,
+    request: Request,
+    response: Response,
+    user: claims_user_dependency,
+    db: AsyncSession = read_db_dependency,
     room_code: uuid.UUID = None,
     future: bool = False,
+    limit: int = None,
+    cursor: str = None,
 ):
-    schedules = await get_schedules(
+    if wants_ndjson(request):
+        return ndjson_response(
+            stream_schedules(
+                room_code=room_code,
+                future=future,
+                session_maker=routed_session_maker(db),
+            ),
+            SchedulesResponse,
+        )
+
+    size = page_size(limit, cursor)
+    schedules = await read_schedules(
         db=db,
         room_code=room_code,
         future=future,
+        limit=fetch_limit(size),
+        after=decode_cursor(cursor, *schedule_cursor),
+    )
+
+    schedules, next_cursor = paginate(
+        schedules, size, key=lambda s: (s["start_time"], s["code"])
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return schedules
 
@@ -214,10 +369,10 @@ async def schedules_all(
 )
 async def schedule_get(
     code: uuid.UUID,
-    user: user_dependency,
-    db: AsyncSession = db_dependency,
+    user: claims_user_dependency,
+    db: AsyncSession = read_db_dependency,
 ):
-    schedule = await get_schedule(
+    schedule = await read_schedule(
         db=db,
         code=code,
     )
@@ -242,10 +397,7 @@ async def presentation_put_update(
     presentation_update: PresentationUpdate,
     db: AsyncSession = db_dependency,
 ):
-    presentation = await get_presentation(
-        db=db,
-        code=presentation_code,
-    )
+    presentation = await get_loaders(db).presentations.load(presentation_code)
 
     if not presentation or not any(
         map(lambda x: user.code == x.user_code, presentation.users)
@@ -269,12 +421,6 @@ async def presentation_put_update(
             detail="Wrong input",
         )
 
-    await db.refresh(presentation)
-    presentation = await get_presentation(
-        db=db,
-        code=presentation.code,
-    )
-
     return presentation
 
 
@@ -289,10 +435,8 @@ async def schedule_put_update(
     schedule_update: ScheduleUpdate,
     db: AsyncSession = db_dependency,
 ):
-    schedule = await get_schedule(
-        db=db,
-        code=schedule_code,
-    )
+    loaders = get_loaders(db)
+    schedule = await loaders.schedules.load(schedule_code)
 
     if not schedule or not any(
         map(
@@ -312,6 +456,7 @@ async def schedule_put_update(
         schedule=schedule,
         schedule_update=schedule_update,
     )
+    loaders.schedules.clear(schedule_code)
 
     if not schedule:
         raise HTTPException(
@@ -319,12 +464,6 @@ async def schedule_put_update(
             detail="Wrong input",
         )
 
-    await db.refresh(schedule)
-    schedule = await get_schedule(
-        db=db,
-        code=schedule.code,
-    )
-
     return schedule
 
 
@@ -336,10 +475,8 @@ async def presentation_delete(
     user: user_dependency,
     db: AsyncSession = db_dependency,
 ):
-    presentation = await get_presentation(
-        db=db,
-        code=code,
-    )
+    loaders = get_loaders(db)
+    presentation = await loaders.presentations.load(code)
 
     if not presentation or not any(
         map(lambda x: user.code == x.user_code, presentation.users)
@@ -349,8 +486,17 @@ async def presentation_delete(
             detail="You are not authorized to perform this action",
         )
 
+    schedule = presentation.schedule
+    presenters = [p.user_code for p in presentation.users]
+
     await db.delete(presentation)
     await db.commit()
+    loaders.presentations.clear(code)
+
+    if schedule:
+        loaders.schedules.clear(schedule.code)
+        schedule_index.remove(schedule.code)
+    principal_cache.invalidate_many(presenters)
 
     return None
 
@@ -369,17 +515,13 @@ async def schedule_delete(
             detail="Incorrect request",
         )
 
-    schedule = await get_schedule(
-        db=db,
-        code=code,
-    )
-
-    presentation = await get_presentation(
-        db=db,
-        code=schedule.presentation.code,
+    loaders = get_loaders(db)
+    schedule = await loaders.schedules.load(code)
+    presentation = schedule and await loaders.presentations.load(
+        schedule.presentation_code
     )
 
-    if not schedule or not any(
+    if not presentation or not any(
         map(lambda x: user.code == x.user_code, presentation.users)
     ):
         raise HTTPException(
@@ -387,8 +529,12 @@ async def schedule_delete(
             detail="You are not authorized to perform this action",
         )
 
-    await db.delete(schedule)
-    await db.commit()
+    await delete_schedule(
+        db=db,
+        schedule=schedule,
+    )
+    loaders.schedules.clear(code)
+    loaders.presentations.clear(presentation.code)
 
     return None
 
@@ -412,5 +558,60 @@ async def registration_delete(
             detail="Registration not found",
         )
 
-    await db.delete(registration)
+    await delete_registration(
+        db=db,
+        registration=registration,
+    )
+
+    waitlist_worker.notify(schedule_code)
+
+
+@router.post(
+    path="/waitlist/create",
+    response_model=WaitlistResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def waitlist_create(
+    user: user_dependency,
+    schedule_code: uuid.UUID,
+    db: AsyncSession = db_dependency,
+):
+    if user.role.value != "listener":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect request",
+        )
+
+    entry = await create_waitlist_entry(
+        db=db,
+        schedule_code=schedule_code,
+        user_code=user.code,
+    )
+
+    # a seat may have been freed before the listener joined
+    waitlist_worker.notify(schedule_code)
+
+    return entry
+
+
+@router.delete(
+    path="/waitlist/{schedule_code}",
+)
+async def waitlist_delete(
+    schedule_code: uuid.UUID,
+    user: user_dependency,
+    db: AsyncSession = db_dependency,
+):
+    entry = await get_waitlist_entry(
+        schedule_code=schedule_code,
+        user_code=user.code,
+        db=db,
+    )
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Waitlist entry not found",
+        )
+
+    await db.delete(entry)
     await db.commit()
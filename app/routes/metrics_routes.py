@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+
+from app.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get(path="/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
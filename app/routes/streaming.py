@@ -0,0 +1,27 @@
+from typing import AsyncIterator, Type
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _serialize(
+    rows: AsyncIterator[dict],
+    model: Type[BaseModel],
+) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield model.model_validate(row).model_dump_json().encode() + b"\n"
+
+
+def ndjson_response(
+    rows: AsyncIterator[dict],
+    model: Type[BaseModel],
+) -> StreamingResponse:
+    """Serialize and send each row as soon as the database yields it."""
+    return StreamingResponse(_serialize(rows, model), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,63 @@
+import asyncio
+import functools
+import time
+
+from fastapi.routing import APIRoute
+
+from app.tracing import SERVER_TIMING_ENABLED, current_trace
+
+
+def _timed_endpoint(endpoint):
+    if not asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        trace = current_trace()
+        if trace is None:
+            return await endpoint(*args, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            trace.endpoint = (started, time.perf_counter())
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """Route splitting its handler time into Server-Timing phases.
+
+    ``deps`` covers request parsing and dependencies, ``endpoint`` the
+    route function with its CRUD calls and ``serialize`` the response
+    model validation and rendering.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            trace = current_trace()
+            if trace is None:
+                return await handler(request)
+
+            started = time.perf_counter()
+            response = await handler(request)
+            finished = time.perf_counter()
+
+            if trace.endpoint is not None:
+                endpoint_started, endpoint_finished = trace.endpoint
+                trace.add("deps", endpoint_started - started)
+                trace.add("endpoint", endpoint_finished - endpoint_started)
+                trace.add("serialize", finished - endpoint_finished)
+
+            return response
+
+        return timed_handler
+
+
+route_class = TimedRoute if SERVER_TIMING_ENABLED else APIRoute
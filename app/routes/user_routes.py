@@ -1,18 +1,21 @@
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud import (create_access_token, create_refresh_token, create_user,
-                      get_user_by_code, get_user_by_email, update_user,
-                      verify_password, verify_refresh_token)
+                      revoke_session, verify_password, verify_refresh_token)
+from app.db import get_loaders
 from app.dependencies import (
     db_dependency,
+    token_dependency,
     user_dependency,
 )
-from app.schemas import (LoginResponse, RefreshRequest, UserRequest,
-                         UserResponse, UserUpdate)
+from app.schemas import LoginResponse, RefreshRequest, UserRequest, UserResponse
+from .timing import route_class
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=route_class)
 
 
 @router.post(
@@ -23,19 +26,17 @@ router = APIRouter(prefix="/users", tags=["Users"])
 async def create_new_user(user: UserRequest, db: AsyncSession = db_dependency):
     user_data = user.model_dump()
     user_data["password"] = user_data["password"].get_secret_value()
-    db_user = await get_user_by_email(db, user_data["email"])
+    loaders = get_loaders(db)
+    db_user = await loaders.users_by_email.load(user_data["email"])
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken"
         )
-    response = await create_user(db, user_data)
-
-    user = await get_user_by_code(
-        db=db,
-        code=response.code,
-    )
 
-    return user
+    db_user = await create_user(db, user_data)
+    loaders.users.prime(db_user)
+    loaders.users_by_email.prime(db_user)
+    return db_user
 
 
 @router.post(
@@ -48,7 +49,7 @@ async def login_user(
     db: AsyncSession = db_dependency,
 ):
     email = user.username
-    db_user = await get_user_by_email(db, email)
+    db_user = await get_loaders(db).users_by_email.load(email)
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,18 +65,13 @@ async def login_user(
             detail="Incorrect email or password",
         )
 
+    refresh_token, session_id = await create_refresh_token(user_code=str(db_user.code))
     access_token = await create_access_token(
         user_code=str(db_user.code),
-    )
-    refresh_token = await create_refresh_token(user_code=str(db_user.code))
-
-    user_update = UserUpdate(
-        refresh_token=refresh_token,
-    )
-    await update_user(
-        db=db,
-        user_code=db_user.code,
-        user=user_update,
+        role=db_user.role,
+        presentations=[p.presentation_code for p in db_user.presentations],
+        claims_version=db_user.claims_version,
+        session_id=session_id,
     )
 
     return {
@@ -103,28 +99,26 @@ async def refresh_token(
             detail=is_valid[1],
         )
 
-    code = is_valid[1]
+    code = is_valid[1]["sub"]
 
-    db_user = await get_user_by_code(db, code)
+    db_user = await get_loaders(db).users.load(uuid.UUID(code))
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect refresh token",
         )
 
-    if not db_user.refresh_token:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User has not refresh token",
-        )
-
     access_token = await create_access_token(
         user_code=str(code),
+        role=db_user.role,
+        presentations=[p.presentation_code for p in db_user.presentations],
+        claims_version=db_user.claims_version,
+        session_id=is_valid[1]["jti"],
     )
 
     return {
         "access_token": access_token,
-        "refresh_token": db_user.refresh_token,
+        "refresh_token": token.refresh_token,
         "token_type": "bearer",
     }
 
@@ -136,7 +130,7 @@ async def refresh_token(
 )
 async def logout_user(
     user: user_dependency,
-    db: AsyncSession = db_dependency,
+    token: token_dependency,
 ):
     if not user:
         raise HTTPException(
@@ -144,14 +138,7 @@ async def logout_user(
             detail="User not found",
         )
 
-    user_update = UserUpdate(
-        refresh_token="_",
-    )
-    await update_user(
-        db=db,
-        user_code=user.code,
-        user=user_update,
-    )
+    await revoke_session(token=token, user_code=user.code)
 
 
 @router.get(
@@ -168,4 +155,12 @@ async def get_me(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-    return user
+
+    db_user = await get_loaders(db).users.load(user.code)
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+
+    return db_user
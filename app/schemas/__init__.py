@@ -12,10 +12,21 @@ from .events import (
     PresentationUpdate,
     RoomRequest,
     RoomResponse,
+    RoomAvailability,
     SchedulesRequest,
     SchedulesResponse,
+    ScheduleBulkResponse,
     ScheduleUpdate,
+    AgendaRequest,
+    AgendaResponse,
     RegistrationResponse,
+    WaitlistResponse,
+)
+
+from .admin import (
+    SlowQuery,
+    SlowQueryFingerprint,
+    SlowQueryResponse,
 )
 
 __all__ = [
@@ -28,8 +39,16 @@ __all__ = [
     "PresentationResponse",
     "RoomRequest",
     "RoomResponse",
+    "RoomAvailability",
     "SchedulesRequest",
     "SchedulesResponse",
+    "ScheduleBulkResponse",
+    "AgendaRequest",
+    "AgendaResponse",
     "ScheduleUpdate",
     "RegistrationResponse",
+    "WaitlistResponse",
+    "SlowQuery",
+    "SlowQueryFingerprint",
+    "SlowQueryResponse",
 ]
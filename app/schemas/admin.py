@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+
+class SlowQuery(BaseModel):
+    fingerprint: str
+    statement: str
+    parameters: List[str]
+    duration_ms: float
+    recorded_at: datetime
+    plan: Optional[Any] = None
+
+
+class SlowQueryFingerprint(BaseModel):
+    fingerprint: str
+    count: int
+    total_ms: float
+    max_ms: float
+
+
+class SlowQueryResponse(BaseModel):
+    threshold_ms: float
+    queries: List[SlowQuery]
+    fingerprints: List[SlowQueryFingerprint]
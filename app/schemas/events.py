@@ -49,6 +49,18 @@ class RoomResponse(BaseModel):
     schedules: List[RelationCode]
 
 
+class FreeInterval(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+
+class RoomAvailability(BaseModel):
+    code: uuid.UUID
+    name: str
+    sit_count: int
+    free: List[FreeInterval]
+
+
 class SchedulesRequest(BaseModel):
     room_code: uuid.UUID
     presentation_code: uuid.UUID
@@ -64,6 +76,40 @@ class SchedulesResponse(BaseModel):
     end_time: datetime
 
 
+class ScheduleBulkResult(BaseModel):
+    index: int
+    status: str
+    code: uuid.UUID | None = None
+    detail: str | None = None
+
+
+class ScheduleBulkResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[ScheduleBulkResult]
+
+
+class AgendaRequest(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    duration: int = 60
+    gap: int = 0
+    dry_run: bool = False
+
+
+class AgendaItem(BaseModel):
+    code: uuid.UUID | None = None
+    presentation_code: uuid.UUID
+    room_code: uuid.UUID
+    start_time: datetime
+    end_time: datetime
+
+
+class AgendaResponse(BaseModel):
+    scheduled: List[AgendaItem]
+    unplaced: List[uuid.UUID]
+
+
 class ScheduleUpdate(BaseModel):
     room_code: Optional[uuid.UUID] = None
     presentation_code: Optional[uuid.UUID] = None
@@ -75,3 +121,10 @@ class RegistrationResponse(BaseModel):
     code: uuid.UUID
     schedule_code: uuid.UUID
     user_code: uuid.UUID
+
+
+class WaitlistResponse(BaseModel):
+    code: uuid.UUID
+    schedule_code: uuid.UUID
+    user_code: uuid.UUID
+    created_at: datetime
@@ -34,7 +34,6 @@ class UserUpdate(BaseModel):
     last_name: str = None
     email: EmailStr = None
     password: SecretStr = None
-    refresh_token: str = None
 
 
 class LoginResponse(BaseModel):
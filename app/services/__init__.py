@@ -0,0 +1,46 @@
+from .schedule_index import schedule_index, ScheduleIndex, as_utc
+from .intervals import Slot, Busy, sweep_conflicts, free_intervals
+from .agenda import Session, Assignment, build_slots, solve_agenda
+from .waitlist import waitlist_worker, WaitlistWorker
+from .principals import principal_cache, Principal, PrincipalCache
+from .claims_versions import claims_versions, ClaimsVersionStore
+from .password_hasher import password_hasher, PasswordHasher, PasswordHasherBusy
+from .tokens import token_service, TokenService
+from .bloom import BloomFilter
+from .refresh_sessions import (
+    refresh_sessions,
+    RefreshSessionStore,
+    MemorySessionBackend,
+    PostgresSessionBackend,
+)
+
+__all__ = [
+    "schedule_index",
+    "ScheduleIndex",
+    "as_utc",
+    "Slot",
+    "Busy",
+    "sweep_conflicts",
+    "free_intervals",
+    "Session",
+    "Assignment",
+    "build_slots",
+    "solve_agenda",
+    "waitlist_worker",
+    "WaitlistWorker",
+    "principal_cache",
+    "Principal",
+    "PrincipalCache",
+    "claims_versions",
+    "ClaimsVersionStore",
+    "password_hasher",
+    "PasswordHasher",
+    "PasswordHasherBusy",
+    "token_service",
+    "TokenService",
+    "BloomFilter",
+    "refresh_sessions",
+    "RefreshSessionStore",
+    "MemorySessionBackend",
+    "PostgresSessionBackend",
+]
@@ -0,0 +1,188 @@
+import bisect
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .schedule_index import as_utc
+
+
+class Session(NamedTuple):
+    presentation_code: uuid.UUID
+    presenters: FrozenSet[uuid.UUID]
+
+
+class Assignment(NamedTuple):
+    presentation_code: uuid.UUID
+    room_code: uuid.UUID
+    start: datetime
+    end: datetime
+
+
+def build_slots(
+    start: datetime,
+    end: datetime,
+    duration: timedelta,
+    gap: timedelta = timedelta(0),
+) -> List[Tuple[datetime, datetime]]:
+    slots = []
+    cursor = as_utc(start)
+    end = as_utc(end)
+    while cursor + duration <= end:
+        slots.append((cursor, cursor + duration))
+        cursor += duration + gap
+    return slots
+
+
+class AgendaSolver:
+    """Greedy interval-graph coloring of sessions onto (slot, room) pairs.
+
+    Slots are the colors: two sessions sharing a presenter may not get the
+    same slot, and a slot holds at most one session per room. Sessions are
+    placed most-constrained first (busiest presenters), each into the
+    earliest slot that fits, biggest free room first. When nothing fits,
+    a single level of backtracking tries to move one already placed
+    session out of the way.
+    """
+
+    def __init__(
+        self,
+        slots: List[Tuple[datetime, datetime]],
+        rooms: List[Tuple[uuid.UUID, int]],
+        busy_rooms: Dict[uuid.UUID, list] = None,
+        busy_presenters: Dict[uuid.UUID, list] = None,
+    ):
+        self.slots = slots
+        self.starts = [start for start, _ in slots]
+        self.rank = {
+            code: rank
+            for rank, (code, _) in enumerate(sorted(rooms, key=lambda r: -r[1]))
+        }
+
+        self.free_rooms: List[List[uuid.UUID]] = [
+            sorted(self.rank, key=self.rank.get) for _ in slots
+        ]
+        self.presenters: List[Set[uuid.UUID]] = [set() for _ in slots]
+        self.occupants: List[Dict[uuid.UUID, Session]] = [{} for _ in slots]
+        self.placed: Dict[uuid.UUID, Tuple[int, uuid.UUID]] = {}
+
+        for room_code, intervals in (busy_rooms or {}).items():
+            for i in self._overlapping(intervals):
+                if room_code in self.free_rooms[i]:
+                    self.free_rooms[i].remove(room_code)
+
+        for user_code, intervals in (busy_presenters or {}).items():
+            for i in self._overlapping(intervals):
+                self.presenters[i].add(user_code)
+
+        self.free_count = sum(len(free) for free in self.free_rooms)
+
+    def _overlapping(self, intervals: Iterable[Tuple[datetime, datetime]]):
+        for start, end in intervals:
+            start, end = as_utc(start), as_utc(end)
+            i = max(bisect.bisect_right(self.starts, start) - 1, 0)
+            while i < len(self.slots) and self.slots[i][0] < end:
+                if self.slots[i][1] > start:
+                    yield i
+                i += 1
+
+    def _fits(self, session: Session, i: int) -> bool:
+        return bool(self.free_rooms[i]) and not (
+            session.presenters & self.presenters[i]
+        )
+
+    def _first_fit(self, session: Session, skip: int = None) -> Optional[int]:
+        for i in range(len(self.slots)):
+            if i != skip and self._fits(session, i):
+                return i
+        return None
+
+    def _place(self, session: Session, i: int, room_code: uuid.UUID = None):
+        room_code = room_code or self.free_rooms[i][0]
+        self.free_rooms[i].remove(room_code)
+        self.presenters[i].update(session.presenters)
+        self.occupants[i][room_code] = session
+        self.placed[session.presentation_code] = (i, room_code)
+        self.free_count -= 1
+
+    def _unplace(self, session: Session) -> Tuple[int, uuid.UUID]:
+        i, room_code = self.placed.pop(session.presentation_code)
+        self.presenters[i].difference_update(session.presenters)
+        del self.occupants[i][room_code]
+        bisect.insort(self.free_rooms[i], room_code, key=self.rank.get)
+        self.free_count += 1
+        return i, room_code
+
+    def _relocate(self, session: Session) -> bool:
+        if not self.free_count:
+            return False
+
+        for i in range(len(self.slots)):
+            if session.presenters & self.presenters[i]:
+                continue
+
+            for room_code, other in list(self.occupants[i].items()):
+                self._unplace(other)
+                target = self._first_fit(other, skip=i)
+                if target is not None:
+                    self._place(other, target)
+                    self._place(session, i, room_code)
+                    return True
+                self._place(other, i, room_code)
+
+        return False
+
+    def solve(
+        self,
+        sessions: Iterable[Session],
+    ) -> Tuple[List[Assignment], List[uuid.UUID]]:
+        sessions = list(sessions)
+        load = Counter(user for session in sessions for user in session.presenters)
+        sessions.sort(
+            key=lambda s: (
+                -sum(load[user] for user in s.presenters),
+                -len(s.presenters),
+                str(s.presentation_code),
+            )
+        )
+
+        unplaced = []
+        for session in sessions:
+            slot = self._first_fit(session)
+            if slot is not None:
+                self._place(session, slot)
+            elif not self._relocate(session):
+                unplaced.append(session.presentation_code)
+
+        assignments = [
+            Assignment(code, room_code, *self.slots[i])
+            for code, (i, room_code) in self.placed.items()
+        ]
+        assignments.sort(key=lambda a: (a.start, self.rank[a.room_code]))
+
+        return assignments, unplaced
+
+
+def solve_agenda(
+    sessions: Iterable[Session],
+    rooms: List[Tuple[uuid.UUID, int]],
+    slots: List[Tuple[datetime, datetime]],
+    busy_rooms: Optional[Dict[uuid.UUID, list]] = None,
+    busy_presenters: Optional[Dict[uuid.UUID, list]] = None,
+) -> Tuple[List[Assignment], List[uuid.UUID]]:
+    solver = AgendaSolver(
+        slots=slots,
+        rooms=rooms,
+        busy_rooms=busy_rooms,
+        busy_presenters=busy_presenters,
+    )
+    return solver.solve(sessions)
@@ -0,0 +1,45 @@
+import hashlib
+import math
+from typing import Hashable
+
+
+class BloomFilter:
+    """Fixed size set membership test without false negatives.
+
+    ``key in bloom`` being False means the key was never added; True only
+    means it may have been, at roughly ``error_rate`` once ``capacity``
+    keys are in.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: Hashable):
+        digest = hashlib.blake2b(str(key).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, key: Hashable):
+        if key in self:
+            return
+
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def saturated(self) -> bool:
+        return self.count >= self.capacity
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+
+from app.db import AsyncSessionMaker
+from app.db.models import User
+
+load_dotenv()
+
+CLAIMS_VERSION_SYNC_SECONDS = float(os.getenv("CLAIMS_VERSION_SYNC_SECONDS", "5"))
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+
+# bumps committed by a slow transaction can carry an older timestamp than
+# the last one seen, so every sync looks back a bit
+SYNC_OVERLAP = timedelta(seconds=30)
+
+logger = logging.getLogger(__name__)
+
+Bump = Tuple[uuid.UUID, int, datetime]
+
+
+class ClaimsVersionStore:
+    """Current access token claims version of every recently changed user.
+
+    ``user.claims_version`` is bumped in the transaction that changes what
+    a token claims (role or presenter set). Bumps made by this process are
+    recorded right away, others arrive with the periodic sync. Users
+    unchanged for longer than the token lifetime are forgotten: every token
+    issued before such a change has expired, so version 0 admits them all.
+    """
+
+    def __init__(
+        self,
+        session_maker=AsyncSessionMaker,
+        sync_interval: float = CLAIMS_VERSION_SYNC_SECONDS,
+        horizon: timedelta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    ):
+        self.session_maker = session_maker
+        self.sync_interval = sync_interval
+        self.horizon = horizon
+        self.versions: Dict[uuid.UUID, Tuple[int, datetime]] = {}
+        self.synced_until: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        self.stale_rejections = 0
+
+    def current(self, user_code: uuid.UUID) -> int:
+        entry = self.versions.get(user_code)
+        return 0 if entry is None else entry[0]
+
+    def fresh(self, user_code: uuid.UUID, version) -> bool:
+        if not isinstance(version, int) or version < self.current(user_code):
+            self.stale_rejections += 1
+            return False
+
+        return True
+
+    def record(self, bumps: Iterable[Bump]):
+        for user_code, version, changed_at in bumps:
+            if version > self.current(user_code):
+                self.versions[user_code] = (version, changed_at)
+
+    def forget_expired(self):
+        horizon = datetime.now(timezone.utc) - self.horizon
+        for user_code, (_, changed_at) in list(self.versions.items()):
+            if changed_at < horizon:
+                del self.versions[user_code]
+
+    async def changed_since(self, since: datetime) -> List[Bump]:
+        stmt = select(User.code, User.claims_version, User.claims_changed_at).where(
+            User.claims_changed_at >= since
+        )
+        async with self.session_maker() as db:
+            return [tuple(row) for row in await db.execute(stmt)]
+
+    async def sync(self):
+        if self.synced_until is None:
+            since = datetime.now(timezone.utc) - self.horizon
+        else:
+            since = self.synced_until - SYNC_OVERLAP
+
+        for bump in await self.changed_since(since):
+            self.record([bump])
+            if self.synced_until is None or bump[2] > self.synced_until:
+                self.synced_until = bump[2]
+
+        self.forget_expired()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Claims version sync failed")
+
+    async def start(self):
+        await self.sync()
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    def stats(self) -> dict:
+        return {
+            "tracked_users": len(self.versions),
+            "stale_rejections": self.stale_rejections,
+        }
+
+
+claims_versions = ClaimsVersionStore()
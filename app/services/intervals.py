@@ -0,0 +1,103 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .schedule_index import as_utc
+
+
+class Slot(NamedTuple):
+    index: int
+    room_code: uuid.UUID
+    start: datetime
+    end: datetime
+
+
+class Busy(NamedTuple):
+    room_code: uuid.UUID
+    start: datetime
+    end: datetime
+
+
+def sweep_conflicts(
+    slots: Iterable[Slot],
+    existing: Iterable[Busy],
+) -> Dict[int, Optional[str]]:
+    """Validate a batch of slots against each other and existing rows.
+
+    Both sides are sorted by start per room and merged in a single pass.
+    Among slots of the same batch that overlap, the earliest one wins.
+    Returns a mapping of slot index to ``None`` when it was accepted or
+    the rejection reason otherwise.
+    """
+    by_room: Dict[uuid.UUID, List[Slot]] = defaultdict(list)
+    for slot in slots:
+        by_room[slot.room_code].append(
+            slot._replace(start=as_utc(slot.start), end=as_utc(slot.end))
+        )
+
+    busy_by_room: Dict[uuid.UUID, List[Busy]] = defaultdict(list)
+    for busy in existing:
+        if busy.room_code in by_room:
+            busy_by_room[busy.room_code].append(
+                busy._replace(start=as_utc(busy.start), end=as_utc(busy.end))
+            )
+
+    result = {}
+    for room_code, room_slots in by_room.items():
+        room_slots.sort(key=lambda s: (s.start, s.index))
+        busy = sorted(busy_by_room.get(room_code, []), key=lambda b: b.start)
+
+        position = 0
+        busy_until = None
+        busy_reason = None
+        for slot in room_slots:
+            while position < len(busy) and busy[position].start < slot.start:
+                if busy_until is None or busy[position].end > busy_until:
+                    busy_until = busy[position].end
+                    busy_reason = "Overlaps an existing schedule"
+                position += 1
+
+            if busy_until is not None and slot.start < busy_until:
+                result[slot.index] = busy_reason
+            elif position < len(busy) and busy[position].start < slot.end:
+                result[slot.index] = "Overlaps an existing schedule"
+            else:
+                result[slot.index] = None
+                if busy_until is None or slot.end > busy_until:
+                    busy_until = slot.end
+                    busy_reason = f"Overlaps item {slot.index}"
+
+    return result
+
+
+def free_intervals(
+    busy: Iterable[Busy],
+    start: datetime,
+    end: datetime,
+    min_duration: timedelta = timedelta(0),
+) -> List[Tuple[datetime, datetime]]:
+    """Return the gaps of one room inside ``[start, end)``.
+
+    ``busy`` must be sorted by start time; a single sweep keeps the
+    furthest end seen so far and emits every gap that is long enough.
+    """
+    start, end = as_utc(start), as_utc(end)
+    min_duration = max(min_duration, timedelta(microseconds=1))
+
+    result = []
+    cursor = start
+    for interval in busy:
+        if cursor >= end:
+            break
+
+        gap_end = min(as_utc(interval.start), end)
+        if gap_end - cursor >= min_duration:
+            result.append((cursor, gap_end))
+
+        cursor = max(cursor, as_utc(interval.end))
+
+    if end - cursor >= min_duration:
+        result.append((cursor, end))
+
+    return result
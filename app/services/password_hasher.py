@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+BCRYPT_RETRY_AFTER_SECONDS = int(os.getenv("BCRYPT_RETRY_AFTER_SECONDS", "1"))
+
+
+class PasswordHasherBusy(Exception):
+    def __init__(self, retry_after: int = BCRYPT_RETRY_AFTER_SECONDS):
+        super().__init__("Password hashing is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """bcrypt on a dedicated process pool with bounded admission.
+
+    Hashing never touches the event loop's default executor, so a login
+    storm cannot starve unrelated ``to_thread`` work. Once ``max_pending``
+    operations are running or queued, new ones fail fast with
+    ``PasswordHasherBusy`` instead of queueing without limit.
+    """
+
+    def __init__(
+        self,
+        workers: int = BCRYPT_WORKERS,
+        max_pending: int = BCRYPT_MAX_PENDING,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def start(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+
+        self.start()
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, fn, *args)
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            self.pending -= 1
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(bcrypt.hashpw, password.encode(), bcrypt.gensalt())
+        return hashed.decode()
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(bcrypt.checkpw, password.encode(), hashed.encode())
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": max(self.pending - self.workers, 0),
+            "in_flight": min(self.pending, self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "latency_seconds_total": self.latency_total,
+            "latency_seconds_max": self.latency_max,
+        }
+
+
+password_hasher = PasswordHasher()
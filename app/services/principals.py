@@ -0,0 +1,175 @@
+import base64
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from app.db.models import UserRole
+
+load_dotenv()
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+# Bump to reject every access token issued with an older claims layout
+TOKEN_CLAIMS_VERSION = int(os.getenv("TOKEN_CLAIMS_VERSION", "1"))
+
+
+def encode_code(code: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(code.bytes).decode().rstrip("=")
+
+
+def decode_code(value: str) -> uuid.UUID:
+    return uuid.UUID(bytes=base64.urlsafe_b64decode(value + "=="))
+
+
+@dataclass(frozen=True)
+class PrincipalPresentation:
+    presentation_code: uuid.UUID
+
+
+@dataclass(frozen=True)
+class Principal:
+    """What authorization needs to know about the caller.
+
+    Mirrors the ``User`` attributes routes read (``code``, ``role`` and
+    ``presentations[*].presentation_code``) without holding an ORM object.
+    Token claims carry the same fields; their ``ver`` is the user's claims
+    version at issue time, checked against ``ClaimsVersionStore``.
+    """
+
+    code: uuid.UUID
+    role: UserRole
+    presentations: Tuple[PrincipalPresentation, ...] = field(default=())
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        if payload.get("fmt") != TOKEN_CLAIMS_VERSION or "role" not in payload:
+            return None
+
+        return cls(
+            code=uuid.UUID(payload["sub"]),
+            role=UserRole(payload["role"]),
+            presentations=tuple(
+                PrincipalPresentation(decode_code(code))
+                for code in payload.get("prs", ())
+            ),
+        )
+
+    def to_claims(self, version: int = 0) -> dict:
+        return {
+            "role": self.role.value,
+            "prs": [encode_code(p.presentation_code) for p in self.presentations],
+            "fmt": TOKEN_CLAIMS_VERSION,
+            "ver": version,
+        }
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            code=user.code,
+            role=user.role,
+            presentations=tuple(
+                PrincipalPresentation(p.presentation_code) for p in user.presentations
+            ),
+        )
+
+
+class PrincipalCache:
+    """Bounded LRU of verified access tokens with a per-entry deadline.
+
+    The cache is process local; ``ttl`` bounds how long another worker's
+    change can go unnoticed, while changes made in this process
+    invalidate the affected users right away.
+    """
+
+    def __init__(
+        self,
+        max_size: int = PRINCIPAL_CACHE_SIZE,
+        ttl: float = PRINCIPAL_CACHE_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self.tokens: Dict[uuid.UUID, Set[str]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        with self.lock:
+            entry = self.entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            deadline, principal = entry
+            if deadline <= time.time():
+                self._drop(token)
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def put(self, token: str, principal: Principal, expires_at: float = None):
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        with self.lock:
+            self._drop(token)
+            self.entries[token] = (deadline, principal)
+            self.tokens.setdefault(principal.code, set()).add(token)
+
+            while len(self.entries) > self.max_size:
+                oldest = next(iter(self.entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def discard(self, token: str):
+        with self.lock:
+            self._drop(token)
+
+    def invalidate(self, user_code: uuid.UUID):
+        with self.lock:
+            for token in list(self.tokens.get(user_code, ())):
+                self._drop(token)
+
+    def invalidate_many(self, user_codes: Iterable[uuid.UUID]):
+        for user_code in user_codes:
+            self.invalidate(user_code)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.tokens.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+        }
+
+    def _drop(self, token: str):
+        entry = self.entries.pop(token, None)
+        if entry is None:
+            return
+
+        user_code = entry[1].code
+        tokens = self.tokens.get(user_code)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self.tokens[user_code]
+
+
+principal_cache = PrincipalCache()
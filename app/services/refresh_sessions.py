@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, func, insert, select, update
+
+from app.db import AsyncSessionMaker
+from app.db.models.users import RefreshSession
+from .bloom import BloomFilter
+
+load_dotenv()
+
+REFRESH_SESSION_BACKEND = os.getenv("REFRESH_SESSION_BACKEND", "postgres")
+REFRESH_BLOOM_CAPACITY = int(os.getenv("REFRESH_BLOOM_CAPACITY", "100000"))
+REFRESH_BLOOM_ERROR_RATE = float(os.getenv("REFRESH_BLOOM_ERROR_RATE", "0.001"))
+REFRESH_SESSION_SYNC_SECONDS = float(os.getenv("REFRESH_SESSION_SYNC_SECONDS", "5"))
+REFRESH_SESSION_PURGE_SECONDS = float(
+    os.getenv("REFRESH_SESSION_PURGE_SECONDS", "3600")
+)
+
+# revocations committed by a slow transaction can carry an older
+# timestamp than the last one seen, so every sync looks back a bit
+SYNC_OVERLAP = timedelta(seconds=30)
+
+logger = logging.getLogger(__name__)
+
+Revocation = Tuple[uuid.UUID, datetime]
+
+
+class MemorySessionBackend:
+    """Refresh sessions kept in a dict, for tests and single process runs."""
+
+    def __init__(self):
+        self.sessions: Dict[uuid.UUID, dict] = {}
+
+    async def create(self, jti: uuid.UUID, user_code: uuid.UUID, expires_at: datetime):
+        self.sessions[jti] = {
+            "user_code": user_code,
+            "expires_at": expires_at,
+            "revoked_at": None,
+        }
+
+    async def is_revoked(self, jti: uuid.UUID) -> bool:
+        session = self.sessions.get(jti)
+        return session is None or session["revoked_at"] is not None
+
+    async def revoke(self, jti: uuid.UUID) -> List[uuid.UUID]:
+        session = self.sessions.get(jti)
+        if session is None or session["revoked_at"] is not None:
+            return []
+
+        session["revoked_at"] = datetime.now(timezone.utc)
+        return [jti]
+
+    async def revoke_user(self, user_code: uuid.UUID) -> List[uuid.UUID]:
+        now = datetime.now(timezone.utc)
+        revoked = []
+        for jti, session in self.sessions.items():
+            if session["user_code"] == user_code and session["revoked_at"] is None:
+                session["revoked_at"] = now
+                revoked.append(jti)
+
+        return revoked
+
+    async def revoked_since(self, since: Optional[datetime]) -> List[Revocation]:
+        now = datetime.now(timezone.utc)
+        return [
+            (jti, session["revoked_at"])
+            for jti, session in self.sessions.items()
+            if session["revoked_at"] is not None
+            and session["expires_at"] > now
+            and (since is None or session["revoked_at"] >= since)
+        ]
+
+    async def purge_expired(self) -> int:
+        now = datetime.now(timezone.utc)
+        expired = [
+            jti
+            for jti, session in self.sessions.items()
+            if session["expires_at"] <= now
+        ]
+        for jti in expired:
+            del self.sessions[jti]
+
+        return len(expired)
+
+
+class PostgresSessionBackend:
+    """Refresh sessions in the ``refresh_sessions`` table."""
+
+    def __init__(self, session_maker=AsyncSessionMaker):
+        self.session_maker = session_maker
+
+    async def create(self, jti: uuid.UUID, user_code: uuid.UUID, expires_at: datetime):
+        async with self.session_maker() as db:
+            await db.execute(
+                insert(RefreshSession).values(
+                    jti=jti,
+                    user_code=user_code,
+                    expires_at=expires_at,
+                )
+            )
+            await db.commit()
+
+    async def is_revoked(self, jti: uuid.UUID) -> bool:
+        async with self.session_maker() as db:
+            row = (
+                await db.execute(
+                    select(RefreshSession.revoked_at).where(RefreshSession.jti == jti)
+                )
+            ).first()
+
+        return row is None or row.revoked_at is not None
+
+    async def _revoke(self, condition) -> List[uuid.UUID]:
+        async with self.session_maker() as db:
+            result = await db.execute(
+                update(RefreshSession)
+                .where(condition, RefreshSession.revoked_at.is_(None))
+                .values(revoked_at=func.now())
+                .returning(RefreshSession.jti)
+            )
+            revoked = list(result.scalars())
+            await db.commit()
+
+        return revoked
+
+    async def revoke(self, jti: uuid.UUID) -> List[uuid.UUID]:
+        return await self._revoke(RefreshSession.jti == jti)
+
+    async def revoke_user(self, user_code: uuid.UUID) -> List[uuid.UUID]:
+        return await self._revoke(RefreshSession.user_code == user_code)
+
+    async def revoked_since(self, since: Optional[datetime]) -> List[Revocation]:
+        stmt = select(RefreshSession.jti, RefreshSession.revoked_at).where(
+            RefreshSession.revoked_at.is_not(None),
+            RefreshSession.expires_at > func.now(),
+        )
+        if since is not None:
+            stmt = stmt.where(RefreshSession.revoked_at >= since)
+
+        async with self.session_maker() as db:
+            return [tuple(row) for row in await db.execute(stmt)]
+
+    async def purge_expired(self) -> int:
+        async with self.session_maker() as db:
+            result = await db.execute(
+                delete(RefreshSession).where(RefreshSession.expires_at <= func.now())
+            )
+            await db.commit()
+
+        return result.rowcount
+
+
+class RefreshSessionStore:
+    """Refresh sessions addressed by the token ``jti``.
+
+    Every user may hold any number of sessions. Revoked ``jti`` values are
+    mirrored into a Bloom filter, so the common "not revoked" answer needs
+    no database round trip; only filter hits are confirmed by the backend.
+    Revocations made by other processes reach the filter on the next
+    periodic sync.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        capacity: int = REFRESH_BLOOM_CAPACITY,
+        error_rate: float = REFRESH_BLOOM_ERROR_RATE,
+        sync_interval: float = REFRESH_SESSION_SYNC_SECONDS,
+        purge_interval: float = REFRESH_SESSION_PURGE_SECONDS,
+    ):
+        self.backend = backend or MemorySessionBackend()
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.purge_interval = purge_interval
+        self.revoked = BloomFilter(capacity, error_rate)
+        self.rebuilding: Optional[BloomFilter] = None
+        self.synced_until: Optional[datetime] = None
+        self.purged_at = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+        self.filter_passes = 0
+        self.backend_checks = 0
+
+    async def open(self, user_code: uuid.UUID, expires_at: datetime) -> uuid.UUID:
+        jti = uuid.uuid4()
+        await self.backend.create(jti, user_code, expires_at)
+        return jti
+
+    def maybe_revoked(self, jti: uuid.UUID) -> bool:
+        if jti in self.revoked:
+            return True
+
+        self.filter_passes += 1
+        return False
+
+    async def is_revoked(self, jti: uuid.UUID) -> bool:
+        if not self.maybe_revoked(jti):
+            return False
+
+        self.backend_checks += 1
+        return await self.backend.is_revoked(jti)
+
+    async def revoke(self, jti: uuid.UUID):
+        self._remember(await self.backend.revoke(jti))
+
+    async def revoke_user(self, user_code: uuid.UUID):
+        self._remember(await self.backend.revoke_user(user_code))
+
+    def _remember(self, jtis):
+        for jti in jtis:
+            self.revoked.add(jti)
+            if self.rebuilding is not None:
+                self.rebuilding.add(jti)
+
+    async def sync(self):
+        if self.revoked.saturated:
+            # expired revocations never leave the filter, start over; the old
+            # filter keeps answering until the new one holds the backend's
+            # revocations and whatever was revoked here meanwhile
+            revoked = self.rebuilding = BloomFilter(self.capacity, self.error_rate)
+            synced_until = None
+        else:
+            revoked, synced_until = self.revoked, self.synced_until
+
+        since = None if synced_until is None else synced_until - SYNC_OVERLAP
+        try:
+            revocations = await self.backend.revoked_since(since)
+        finally:
+            self.rebuilding = None
+
+        for jti, revoked_at in revocations:
+            revoked.add(jti)
+            if synced_until is None or revoked_at > synced_until:
+                synced_until = revoked_at
+        self.revoked, self.synced_until = revoked, synced_until
+
+        if time.monotonic() - self.purged_at >= self.purge_interval:
+            self.purged_at = time.monotonic()
+            await self.backend.purge_expired()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Refresh session sync failed")
+
+    async def start(self):
+        await self.sync()
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    def stats(self) -> dict:
+        return {
+            "filter_passes": self.filter_passes,
+            "backend_checks": self.backend_checks,
+            "revoked_in_filter": self.revoked.count,
+        }
+
+
+SESSION_BACKENDS = {
+    "memory": MemorySessionBackend,
+    "postgres": PostgresSessionBackend,
+}
+
+refresh_sessions = RefreshSessionStore(
+    backend=SESSION_BACKENDS[REFRESH_SESSION_BACKEND](),
+)
@@ -0,0 +1,173 @@
+import bisect
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Schedule
+
+
+def as_utc(value: datetime) -> datetime:
+    # asyncpg stores naive datetimes in timestamptz columns as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class RoomIntervals:
+    """Sorted slots of a single room.
+
+    Slots inside a room never overlap, so ordering by start also orders
+    them by end and an overlap query is a bisect plus a short walk back.
+    """
+
+    def __init__(self):
+        self.starts: List[datetime] = []
+        self.slots: List[Tuple[datetime, datetime, uuid.UUID]] = []
+
+    def add(self, start: datetime, end: datetime, code: uuid.UUID):
+        position = bisect.bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.slots.insert(position, (start, end, code))
+
+    def remove(self, start: datetime, code: uuid.UUID) -> bool:
+        position = bisect.bisect_left(self.starts, start)
+        while position < len(self.slots) and self.starts[position] == start:
+            if self.slots[position][2] == code:
+                del self.starts[position]
+                del self.slots[position]
+                return True
+            position += 1
+        return False
+
+    def overlaps(
+        self,
+        start: datetime,
+        end: datetime,
+        exclude: uuid.UUID = None,
+    ) -> List[uuid.UUID]:
+        position = bisect.bisect_left(self.starts, end)
+        result = []
+        while position > 0:
+            position -= 1
+            slot_start, slot_end, code = self.slots[position]
+            if slot_end <= start:
+                break
+            if code != exclude:
+                result.append(code)
+        return result
+
+    def __len__(self):
+        return len(self.slots)
+
+
+class ScheduleIndex:
+    """In-process interval index of schedules keyed by room_code."""
+
+    def __init__(self):
+        self.rooms: Dict[uuid.UUID, RoomIntervals] = defaultdict(RoomIntervals)
+        self.entries: Dict[uuid.UUID, Tuple[uuid.UUID, datetime, datetime]] = {}
+        self.loaded = False
+
+    async def load(self, db: AsyncSession):
+        stmt = select(
+            Schedule.code,
+            Schedule.room_code,
+            Schedule.start_time,
+            Schedule.end_time,
+        ).order_by(Schedule.room_code, Schedule.start_time)
+
+        result = await db.execute(stmt)
+
+        self.clear()
+        for code, room_code, start, end in result.all():
+            self.add(code, room_code, start, end)
+
+        self.loaded = True
+
+    def clear(self):
+        self.rooms.clear()
+        self.entries.clear()
+        self.loaded = False
+
+    def add(
+        self,
+        code: uuid.UUID,
+        room_code: uuid.UUID,
+        start: datetime,
+        end: datetime,
+    ):
+        self.remove(code)
+
+        start, end = as_utc(start), as_utc(end)
+        self.rooms[room_code].add(start, end, code)
+        self.entries[code] = (room_code, start, end)
+
+    def remove(self, code: uuid.UUID):
+        entry = self.entries.pop(code, None)
+        if entry is None:
+            return
+
+        room_code, start, _ = entry
+        self.rooms[room_code].remove(start, code)
+
+    def overlaps(
+        self,
+        room_code: uuid.UUID,
+        start: datetime,
+        end: datetime,
+        exclude: uuid.UUID = None,
+    ) -> List[uuid.UUID]:
+        room = self.rooms.get(room_code)
+        if not room:
+            return []
+
+        return room.overlaps(as_utc(start), as_utc(end), exclude=exclude)
+
+    async def confirm_overlaps(
+        self,
+        db: AsyncSession,
+        room_code: uuid.UUID,
+        start: datetime,
+        end: datetime,
+        exclude: uuid.UUID = None,
+    ) -> List[uuid.UUID]:
+        """Overlaps the database still agrees with.
+
+        Other workers and cascades change schedules without touching this
+        process's index, so a hit is only a hint: the hit rows are re-read
+        by primary key and re-synced before answering. Misses are left to
+        the exclusion constraint.
+        """
+        hits = self.overlaps(room_code, start, end, exclude=exclude)
+        if not hits:
+            return hits
+
+        stmt = select(
+            Schedule.code,
+            Schedule.room_code,
+            Schedule.start_time,
+            Schedule.end_time,
+        ).where(Schedule.code.in_(hits))
+        rows = (await db.execute(stmt)).all()
+
+        for code in set(hits) - {row.code for row in rows}:
+            self.remove(code)
+        for row in rows:
+            self.sync(row)
+
+        return self.overlaps(room_code, start, end, exclude=exclude)
+
+    def sync(self, schedule: Schedule):
+        self.add(
+            code=schedule.code,
+            room_code=schedule.room_code,
+            start=schedule.start_time,
+            end=schedule.end_time,
+        )
+
+
+schedule_index = ScheduleIndex()
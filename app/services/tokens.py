@@ -0,0 +1,122 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from calendar import timegm
+from datetime import datetime
+
+import jwt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SECRET_KEY = os.getenv("SECRET_KEY")
+ALGORITHM = os.getenv("ALGORITHM")
+
+HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class TokenService:
+    """HMAC JWT signing and verification done inline on the event loop.
+
+    An HS256 operation takes a few microseconds, far less than handing it
+    to a thread. The keyed HMAC state and the encoded header segment are
+    computed once and reused for every token. Errors are raised as the
+    same ``jwt`` exceptions PyJWT uses, and algorithms other than HS*
+    are delegated to PyJWT.
+    """
+
+    def __init__(self, secret: str, algorithm: str, leeway: float = 0):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.leeway = leeway
+        self.digest = HMAC_DIGESTS.get(algorithm)
+
+        if self.digest is not None:
+            self.mac = hmac.new((secret or "").encode(), digestmod=self.digest)
+            header = json.dumps(
+                {"alg": algorithm, "typ": "JWT"},
+                separators=(",", ":"),
+                sort_keys=True,
+            )
+            self.header_segment = _b64encode(header.encode())
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self.mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, payload: dict) -> str:
+        if self.digest is None:
+            return jwt.encode(payload, self.secret, self.algorithm)
+
+        claims = dict(payload)
+        for claim in ("exp", "iat", "nbf"):
+            if isinstance(claims.get(claim), datetime):
+                claims[claim] = timegm(claims[claim].utctimetuple())
+
+        body = json.dumps(claims, separators=(",", ":"), default=str).encode()
+        signing_input = self.header_segment + b"." + _b64encode(body)
+
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode()
+
+    def decode(self, token: str) -> dict:
+        if self.digest is None:
+            return jwt.decode(token, self.secret, algorithms=[self.algorithm])
+
+        try:
+            raw = token.encode()
+            signing_input, signature = raw.rsplit(b".", 1)
+            header_segment, payload_segment = signing_input.split(b".", 1)
+
+            if header_segment != self.header_segment:
+                header = json.loads(_b64decode(header_segment))
+                if header.get("alg") != self.algorithm:
+                    raise jwt.InvalidAlgorithmError(
+                        "The specified alg value is not allowed"
+                    )
+
+            if not hmac.compare_digest(
+                self._sign(signing_input), _b64decode(signature)
+            ):
+                raise jwt.InvalidSignatureError("Signature verification failed")
+
+            payload = json.loads(_b64decode(payload_segment))
+        except jwt.InvalidTokenError:
+            raise
+        except (ValueError, TypeError, AttributeError):
+            raise jwt.DecodeError("Invalid token")
+
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload")
+
+        now = time.time()
+        exp = payload.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise jwt.DecodeError("Expiration Time claim (exp) must be a number")
+            if exp <= now - self.leeway:
+                raise jwt.ExpiredSignatureError("Signature has expired")
+
+        nbf = payload.get("nbf")
+        if isinstance(nbf, (int, float)) and nbf > now + self.leeway:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+
+        return payload
+
+
+token_service = TokenService(SECRET_KEY, ALGORITHM)
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import Awaitable, Callable, Iterable, Optional, Set
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import AsyncSessionMaker
+
+load_dotenv()
+
+WAITLIST_BATCH_SIZE = int(os.getenv("WAITLIST_BATCH_SIZE", "100"))
+WAITLIST_BATCH_DELAY_MS = int(os.getenv("WAITLIST_BATCH_DELAY_MS", "50"))
+
+logger = logging.getLogger(__name__)
+
+PromoteHandler = Callable[[AsyncSession, Set[uuid.UUID]], Awaitable[int]]
+
+
+class WaitlistWorker:
+    """Background task promoting waitlisted listeners into freed seats.
+
+    Cancellations only enqueue the schedule code; the worker waits a short
+    moment so that a burst of drop-outs collapses into one batch, then
+    hands the distinct schedule codes to the promote handler.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = WAITLIST_BATCH_SIZE,
+        batch_delay: float = WAITLIST_BATCH_DELAY_MS / 1000,
+    ):
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.handler: Optional[PromoteHandler] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def notify(self, schedule_code: uuid.UUID):
+        self.queue.put_nowait(schedule_code)
+
+    def notify_many(self, schedule_codes: Iterable[uuid.UUID]):
+        for schedule_code in schedule_codes:
+            self.notify(schedule_code)
+
+    def start(self, handler: PromoteHandler):
+        self.handler = handler
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    async def next_batch(self) -> Set[uuid.UUID]:
+        batch = {await self.queue.get()}
+        await asyncio.sleep(self.batch_delay)
+
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.add(self.queue.get_nowait())
+
+        return batch
+
+    async def run(self):
+        while True:
+            batch = await self.next_batch()
+            try:
+                async with AsyncSessionMaker() as session:
+                    promoted = await self.handler(session, batch)
+                logger.info(
+                    "Promoted %s waitlisted listeners over %s schedules",
+                    promoted,
+                    len(batch),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Waitlist promotion failed, requeueing batch")
+                await asyncio.sleep(1)
+                self.notify_many(batch)
+
+
+waitlist_worker = WaitlistWorker()
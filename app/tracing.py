@@ -0,0 +1,113 @@
+import functools
+import json
+import logging
+import os
+import queue
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+TRACE_FILE = os.getenv("TRACE_FILE")
+TRACE_FILE_MAX_BYTES = int(os.getenv("TRACE_FILE_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_FILE_BACKUPS = int(os.getenv("TRACE_FILE_BACKUPS", "5"))
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class Trace:
+    """Phase durations of one request, in seconds."""
+
+    __slots__ = ("started", "spans", "active", "endpoint")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, float] = {}
+        self.active = set()
+        self.endpoint: Optional[Tuple[float, float]] = None
+
+    def add(self, name: str, duration: float):
+        self.spans[name] = self.spans.get(name, 0.0) + duration
+
+    def server_timing(self, **extra: float) -> str:
+        spans = {**self.spans, **extra}
+        return ", ".join(
+            f"{name};dur={duration * 1000:.2f}" for name, duration in spans.items()
+        )
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+def start_trace() -> Trace:
+    trace = Trace()
+    _trace.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+
+def traced(name: str):
+    """Add the duration of an async function to the current trace.
+
+    Nested calls under the same name are counted once; without an active
+    trace the wrapper only costs a context variable lookup.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            trace = _trace.get()
+            if trace is None or name in trace.active:
+                return await func(*args, **kwargs)
+
+            trace.active.add(name)
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                trace.add(name, time.perf_counter() - started)
+                trace.active.discard(name)
+
+        return wrapper
+
+    return decorator
+
+
+class TraceFile:
+    """Rotating JSONL file written from a background thread."""
+
+    def __init__(self, path: str, max_bytes: int, backups: int):
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        records = queue.SimpleQueue()
+        self.listener = QueueListener(records, handler)
+        self.logger = logging.getLogger("app.tracing.file")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(QueueHandler(records))
+
+    def start(self):
+        self.listener.start()
+
+    def stop(self):
+        self.listener.stop()
+
+    def write(self, trace: Trace, **fields):
+        spans = {name: round(value * 1000, 3) for name, value in trace.spans.items()}
+        self.logger.info(json.dumps({**fields, "spans_ms": spans}, default=str))
+
+
+trace_file = (
+    TraceFile(TRACE_FILE, TRACE_FILE_MAX_BYTES, TRACE_FILE_BACKUPS)
+    if SERVER_TIMING_ENABLED and TRACE_FILE
+    else None
+)
@@ -0,0 +1,81 @@
+"""Throughput of a typical read at different pool sizes under concurrent load.
+
+Run against a local database (the usual POSTGRES_* settings):
+
+    python -m benchmarks.bench_pool --sizes 5 10 20 40 --concurrency 100
+
+Every request checks out a session, reads a page of rooms and returns it,
+like ``GET /events/rooms``; ``--sleep`` adds server-side time per query to
+mimic slower statements.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import read_rooms
+from app.db import DATABASE_URL
+from app.db.database import ENGINE_OPTIONS
+from app.db.pool import prewarm
+
+
+async def request(maker, sleep: float) -> float:
+    started = time.perf_counter()
+    async with maker() as session:
+        if sleep:
+            await session.execute(text("SELECT pg_sleep(:s)"), {"s": sleep})
+        await read_rooms(session, limit=50)
+    return time.perf_counter() - started
+
+
+async def run(size: int, count: int, concurrency: int, sleep: float):
+    engine = create_async_engine(
+        DATABASE_URL, **{**ENGINE_OPTIONS, "pool_size": size, "max_overflow": 0}
+    )
+    maker = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await prewarm(engine, size)
+
+    queue = asyncio.Queue()
+    for _ in range(count):
+        queue.put_nowait(None)
+    latencies = []
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            latencies.append(await request(maker, sleep))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    latencies.sort()
+    return (
+        count / elapsed,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    )
+
+
+async def main(sizes, count: int, concurrency: int, sleep: float):
+    print(f"{'pool size':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for size in sizes:
+        throughput, p50, p99 = await run(size, count, concurrency, sleep)
+        print(f"{size:>10}{throughput:>10.0f}{p50:>10.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--sleep", type=float, default=0.0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sizes, args.count, args.concurrency, args.sleep))
@@ -0,0 +1,111 @@
+"""Compare the ORM read path with the projection read models.
+
+Run against a local database (the usual POSTGRES_* settings):
+
+    python -m benchmarks.bench_read_models --seed 2000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.crud import get_rooms, get_schedules, read_rooms, read_schedules
+from app.db import AsyncSessionMaker, init_db
+from app.db.models import Presentation, Room, Schedule
+from app.schemas import RoomResponse, SchedulesResponse
+
+ROOMS = TypeAdapter(list[RoomResponse])
+SCHEDULES = TypeAdapter(list[SchedulesResponse])
+
+
+async def seed(count: int):
+    rooms = [
+        {"code": uuid.uuid4(), "name": f"bench-{uuid.uuid4().hex[:8]}", "sit_count": 50}
+        for _ in range(10)
+    ]
+    presentations = [
+        {"code": uuid.uuid4(), "title": "bench", "description": "bench"}
+        for _ in range(count)
+    ]
+    start = datetime(2200, 1, 1, tzinfo=timezone.utc)
+    schedules = [
+        {
+            "code": uuid.uuid4(),
+            "room_code": rooms[i % len(rooms)]["code"],
+            "presentation_code": presentation["code"],
+            "start_time": start + timedelta(hours=i // len(rooms)),
+            "end_time": start + timedelta(hours=i // len(rooms), minutes=50),
+        }
+        for i, presentation in enumerate(presentations)
+    ]
+
+    async with AsyncSessionMaker() as session:
+        await session.execute(insert(Room), rooms)
+        await session.execute(insert(Presentation), presentations)
+        await session.execute(insert(Schedule), schedules)
+        await session.commit()
+
+
+async def orm_rooms(db):
+    return ROOMS.validate_python(await get_rooms(db), from_attributes=True)
+
+
+async def projected_rooms(db):
+    return ROOMS.validate_python(await read_rooms(db))
+
+
+async def orm_schedules(db):
+    return SCHEDULES.validate_python(await get_schedules(db), from_attributes=True)
+
+
+async def projected_schedules(db):
+    return SCHEDULES.validate_python(await read_schedules(db))
+
+
+async def measure(handler, repeat: int):
+    wall = cpu = 0.0
+    for _ in range(repeat):
+        async with AsyncSessionMaker() as session:
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            await handler(session)
+            wall += time.perf_counter() - wall_start
+            cpu += time.process_time() - cpu_start
+
+    tracemalloc.start()
+    async with AsyncSessionMaker() as session:
+        await handler(session)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return wall / repeat * 1000, cpu / repeat * 1000, peak / 1024
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0, help="schedules to insert first")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    await init_db()
+    if args.seed:
+        await seed(args.seed)
+
+    print(f"{'endpoint':<22}{'wall ms':>10}{'cpu ms':>10}{'peak KiB':>12}")
+    for name, handler in [
+        ("rooms orm", orm_rooms),
+        ("rooms projection", projected_rooms),
+        ("schedules orm", orm_schedules),
+        ("schedules projection", projected_schedules),
+    ]:
+        wall, cpu, peak = await measure(handler, args.repeat)
+        print(f"{name:<22}{wall:>10.2f}{cpu:>10.2f}{peak:>12.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
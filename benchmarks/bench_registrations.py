@@ -0,0 +1,60 @@
+"""Registration latency when a burst of listeners hits one session.
+
+Needs the app running on 0.0.0.0:8000, like the tests:
+
+    python -m benchmarks.bench_registrations --listeners 200
+
+Every listener is registered and logged in first; only the concurrent
+``POST /events/registration/create`` burst is timed. Seats taken and
+refusals are printed too, they must add up to the room capacity.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette import status
+
+from tests.test_registration_capacity import (
+    create_session,
+    register,
+    register_and_login,
+)
+
+
+def timed_register(token: str, schedule_code: str):
+    started = time.perf_counter()
+    code = register(token, schedule_code)
+    return code, (time.perf_counter() - started) * 1000
+
+
+def main(listeners: int):
+    schedule_code, sit_count = create_session(register_and_login("presenter"))
+
+    listeners = max(listeners, sit_count + 10)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        tokens = list(pool.map(register_and_login, ["listener"] * listeners))
+
+    with ThreadPoolExecutor(max_workers=listeners) as pool:
+        results = list(pool.map(lambda t: timed_register(t, schedule_code), tokens))
+
+    codes = [code for code, _ in results]
+    latencies = sorted(latency for _, latency in results)
+    print(f"capacity {sit_count}, listeners {listeners}")
+    print(
+        f"taken {codes.count(status.HTTP_201_CREATED)}, "
+        f"refused {codes.count(status.HTTP_409_CONFLICT)}"
+    )
+    print(
+        f"p50 {statistics.median(latencies):.1f} ms, "
+        f"p99 {latencies[max(int(len(latencies) * 0.99) - 1, 0)]:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--listeners", type=int, default=80)
+    args = parser.parse_args()
+
+    main(args.listeners)
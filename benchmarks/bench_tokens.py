@@ -0,0 +1,85 @@
+"""Compare PyJWT in a worker thread with the inline token service.
+
+No database is needed:
+
+    python -m benchmarks.bench_tokens --count 20000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+
+from app.services.tokens import TokenService
+
+SECRET = "bench-secret"
+ALGORITHM = "HS256"
+
+
+def make_payload():
+    now = datetime.now(timezone.utc)
+    return {
+        "sub": str(uuid.uuid4()),
+        "exp": now + timedelta(minutes=30),
+        "iat": now.timestamp(),
+        "role": "listener",
+        "prs": [],
+        "fmt": 1,
+        "ver": 0,
+    }
+
+
+async def threaded_round_trip(payload):
+    token = await asyncio.to_thread(jwt.encode, payload, SECRET, ALGORITHM)
+    return await asyncio.to_thread(jwt.decode, token, SECRET, algorithms=[ALGORITHM])
+
+
+def inline_round_trip(service):
+    async def round_trip(payload):
+        return service.decode(service.encode(payload))
+
+    return round_trip
+
+
+async def measure(name, round_trip, count, concurrency):
+    payloads = [make_payload() for _ in range(count)]
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(payload):
+        async with semaphore:
+            start = time.perf_counter()
+            await round_trip(payload)
+            latencies.append(time.perf_counter() - start)
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(
+        f"{name:<10} {count / wall:>10.0f} ops/s  "
+        f"p50 {p50:>8.1f}us  p99 {p99:>8.1f}us  cpu {cpu:.3f}s"
+    )
+
+
+async def main(count: int, concurrency: int):
+    service = TokenService(SECRET, ALGORITHM)
+    await measure("to_thread", threaded_round_trip, count, concurrency)
+    await measure("inline", inline_round_trip(service), count, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.count, args.concurrency))
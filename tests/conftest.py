@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import Base, DATABASE_URL
+
+
+class ThrowawaySchema:
+    """A Postgres schema of its own holding the app's tables."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def engine(self):
+        # public stays off the path, otherwise create_all sees the app's
+        # tables there and test data lands in them
+        return create_async_engine(
+            DATABASE_URL,
+            connect_args={"server_settings": {"search_path": self.name}},
+        )
+
+    async def create(self):
+        engine = self.engine()
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"CREATE SCHEMA {self.name}"))
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+                await conn.run_sync(Base.metadata.create_all)
+        finally:
+            await engine.dispose()
+
+    async def drop(self):
+        engine = self.engine()
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA {self.name} CASCADE"))
+        finally:
+            await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def schema(request):
+    """Throwaway schema for the module, skipped without a reachable Postgres
+    (the usual POSTGRES_* settings)."""
+    module = request.module.__name__.rsplit(".", 1)[-1]
+    schema = ThrowawaySchema(f"{module}_{uuid.uuid4().hex[:8]}")
+    try:
+        asyncio.run(schema.create())
+    except (OSError, ConnectionError) as e:
+        pytest.skip(f"Postgres is not available: {e}")
+
+    yield schema
+
+    asyncio.run(schema.drop())
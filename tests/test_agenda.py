@@ -0,0 +1,89 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.services.agenda import Session, build_slots, solve_agenda
+
+START = datetime(2025, 5, 1, 9, tzinfo=timezone.utc)
+
+
+def test_build_slots():
+    slots = build_slots(
+        START,
+        START + timedelta(hours=3),
+        duration=timedelta(minutes=50),
+        gap=timedelta(minutes=10),
+    )
+
+    assert slots == [
+        (START + timedelta(hours=h), START + timedelta(hours=h, minutes=50))
+        for h in range(3)
+    ]
+
+
+def test_presenters_are_not_double_booked():
+    big, small = uuid.uuid4(), uuid.uuid4()
+    presenter, other = uuid.uuid4(), uuid.uuid4()
+    sessions = [
+        Session(uuid.uuid4(), frozenset({presenter})),
+        Session(uuid.uuid4(), frozenset({presenter, other})),
+        Session(uuid.uuid4(), frozenset({other})),
+    ]
+    slots = build_slots(START, START + timedelta(hours=2), timedelta(hours=1))
+
+    assignments, unplaced = solve_agenda(
+        sessions, rooms=[(small, 50), (big, 100)], slots=slots
+    )
+
+    assert unplaced == []
+    assert len(assignments) == 3
+    for user in (presenter, other):
+        starts = [
+            a.start
+            for a in assignments
+            for s in sessions
+            if s.presentation_code == a.presentation_code and user in s.presenters
+        ]
+        assert len(starts) == len(set(starts))
+    rooms_per_slot = {(a.start, a.room_code) for a in assignments}
+    assert len(rooms_per_slot) == 3
+
+
+def test_existing_schedules_are_respected():
+    room = uuid.uuid4()
+    presenter = uuid.uuid4()
+    slots = build_slots(START, START + timedelta(hours=3), timedelta(hours=1))
+
+    assignments, unplaced = solve_agenda(
+        [Session(uuid.uuid4(), frozenset({presenter})) for _ in range(3)],
+        rooms=[(room, 10)],
+        slots=slots,
+        busy_rooms={room: [(START, START + timedelta(hours=1))]},
+        busy_presenters={
+            presenter: [(START + timedelta(hours=1), START + timedelta(hours=2))]
+        },
+    )
+
+    assert [a.start for a in assignments] == [START + timedelta(hours=2)]
+    assert len(unplaced) == 2
+
+
+def test_backtracking_moves_a_placed_session():
+    room = uuid.uuid4()
+    first, second = uuid.uuid4(), uuid.uuid4()
+    flexible = Session(uuid.uuid4(), frozenset({first}))
+    constrained = Session(uuid.uuid4(), frozenset({second}))
+    slots = build_slots(START, START + timedelta(hours=2), timedelta(hours=1))
+
+    assignments, unplaced = solve_agenda(
+        [flexible, constrained],
+        rooms=[(room, 10)],
+        slots=slots,
+        busy_presenters={
+            second: [(START + timedelta(hours=1), START + timedelta(hours=2))]
+        },
+    )
+
+    assert unplaced == []
+    placed = {a.presentation_code: a.start for a in assignments}
+    assert placed[constrained.presentation_code] == START
+    assert placed[flexible.presentation_code] == START + timedelta(hours=1)
@@ -0,0 +1,59 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.services.claims_versions import ClaimsVersionStore
+
+
+def store(changes=()) -> ClaimsVersionStore:
+    versions = ClaimsVersionStore(horizon=timedelta(minutes=15))
+    seen = []
+
+    async def changed_since(since):
+        seen.append(since)
+        return [change for change in changes if change[2] >= since]
+
+    versions.changed_since = changed_since
+    versions.seen = seen
+    return versions
+
+
+def test_tokens_older_than_the_current_version_are_stale():
+    versions = store()
+    code = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+
+    assert versions.fresh(code, 0)
+
+    versions.record([(code, 2, now), (code, 1, now)])
+
+    assert versions.current(code) == 2
+    assert not versions.fresh(code, 1)
+    assert not versions.fresh(code, None)
+    assert versions.fresh(code, 2)
+    assert versions.stats()["stale_rejections"] == 2
+
+
+def test_sync_picks_up_other_processes_and_resumes_from_the_last_change():
+    now = datetime.now(timezone.utc)
+    code = uuid.uuid4()
+    versions = store([(code, 4, now)])
+
+    asyncio.run(versions.sync())
+    asyncio.run(versions.sync())
+
+    assert versions.current(code) == 4
+    assert versions.seen[0] <= now - timedelta(minutes=15) + timedelta(seconds=1)
+    assert versions.seen[1] == now - timedelta(seconds=30)
+
+
+def test_changes_older_than_the_token_lifetime_are_forgotten():
+    versions = store()
+    old, recent = uuid.uuid4(), uuid.uuid4()
+    now = datetime.now(timezone.utc)
+
+    versions.record([(old, 3, now - timedelta(hours=1)), (recent, 3, now)])
+    versions.forget_expired()
+
+    assert versions.current(old) == 0
+    assert versions.current(recent) == 3
@@ -0,0 +1,60 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.services.intervals import Busy, Slot, free_intervals, sweep_conflicts
+
+START = datetime(2025, 5, 1, 9, tzinfo=timezone.utc)
+ROOM = uuid.uuid4()
+
+
+def at(hours: float):
+    return START + timedelta(hours=hours)
+
+
+def test_batch_items_conflict_with_each_other():
+    slots = [
+        Slot(0, ROOM, at(1), at(2)),
+        Slot(1, ROOM, at(0), at(1.5)),
+        Slot(2, ROOM, at(2), at(3)),
+    ]
+
+    result = sweep_conflicts(slots, existing=[])
+
+    assert result == {0: "Overlaps item 1", 1: None, 2: None}
+
+
+def test_batch_items_conflict_with_existing_rows():
+    other_room = uuid.uuid4()
+    slots = [
+        Slot(0, ROOM, at(0), at(1)),
+        Slot(1, ROOM, at(1.5), at(2.5)),
+        Slot(2, ROOM, at(3), at(4)),
+        Slot(3, other_room, at(1), at(2)),
+    ]
+    existing = [
+        Busy(ROOM, at(0.5), at(1.5)),
+        Busy(ROOM, at(3.5), at(5)),
+    ]
+
+    result = sweep_conflicts(slots, existing)
+
+    assert result[0] == "Overlaps an existing schedule"
+    assert result[1] is None
+    assert result[2] == "Overlaps an existing schedule"
+    assert result[3] is None
+
+
+def test_free_intervals_inside_window():
+    busy = [
+        Busy(ROOM, at(-1), at(0.5)),
+        Busy(ROOM, at(1), at(2)),
+        Busy(ROOM, at(2.25), at(3)),
+    ]
+
+    result = free_intervals(busy, at(0), at(4), min_duration=timedelta(minutes=30))
+
+    assert result == [(at(0.5), at(1)), (at(3), at(4))]
+
+
+def test_free_intervals_empty_room():
+    assert free_intervals([], at(0), at(1)) == [(at(0), at(1))]
@@ -0,0 +1,141 @@
+import asyncio
+import uuid
+
+from sqlalchemy import ForeignKey, String, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+    selectinload,
+)
+
+from app.db.loaders import EntityLoader
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    code: Mapped[str] = mapped_column(String(36), primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+
+
+async def scenario(body):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    codes = [str(uuid.uuid4()) for _ in range(3)]
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            Item(code=code, name=f"item {i}") for i, code in enumerate(codes)
+        )
+        await session.commit()
+
+        statements.clear()
+        loader = EntityLoader(session, asyncio.Lock(), Item, Item.code)
+        result = await body(loader, codes)
+
+    await engine.dispose()
+    return result, [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_loads_in_one_tick_share_one_query():
+    async def body(loader, codes):
+        return await asyncio.gather(
+            loader.load(codes[0]),
+            loader.load(codes[1]),
+            loader.load(codes[0]),
+            loader.load("missing"),
+        )
+
+    items, selects = asyncio.run(scenario(body))
+
+    assert [item and item.name for item in items] == [
+        "item 0",
+        "item 1",
+        "item 0",
+        None,
+    ]
+    assert len(selects) == 1
+
+
+def test_repeated_loads_are_cached_until_cleared():
+    async def body(loader, codes):
+        first = await loader.load(codes[2])
+        second = await loader.load(codes[2])
+        loader.clear(codes[2])
+        third = await loader.load(codes[2])
+        return first is second is third
+
+    same, selects = asyncio.run(scenario(body))
+
+    assert same
+    assert len(selects) == 2
+
+
+class Parent(Base):
+    __tablename__ = "parents"
+
+    code: Mapped[str] = mapped_column(String(36), primary_key=True)
+    child: Mapped["Child"] = relationship(back_populates="parent")
+
+
+class Child(Base):
+    __tablename__ = "children"
+
+    code: Mapped[str] = mapped_column(String(36), primary_key=True)
+    parent_code: Mapped[str] = mapped_column(ForeignKey("parents.code"))
+    parent: Mapped[Parent] = relationship(back_populates="child")
+
+
+def test_loaded_relationships_prime_the_linked_loader():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine) as session:
+            session.add(Child(code="c", parent=Parent(code="p")))
+            await session.commit()
+
+            lock = asyncio.Lock()
+            children = EntityLoader(
+                session, lock, Child, Child.code, (selectinload(Child.parent),)
+            )
+            parents = EntityLoader(session, lock, Parent, Parent.code)
+            children.link(parents, "parent", back="child")
+
+            statements.clear()
+            child = await children.load("c")
+            parent = await parents.load("p")
+            result = parent is child.parent and parent.child is child
+
+        await engine.dispose()
+        return result, [
+            s for s in statements if s.lstrip().upper().startswith("SELECT")
+        ]
+
+    linked, selects = asyncio.run(run())
+
+    assert linked
+    assert len(selects) == 2
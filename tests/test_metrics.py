@@ -0,0 +1,51 @@
+import pytest
+
+from app.metrics import Metric, Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram(
+        "request_seconds", "Request latency", ("route",), buckets=(0.1, 1.0)
+    )
+
+    latency.observe(0.05, "/rooms")
+    latency.observe(0.5, "/rooms")
+    latency.observe(5, "/rooms")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE request_seconds histogram" in lines
+    assert 'request_seconds_bucket{route="/rooms",le="0.1"} 1' in lines
+    assert 'request_seconds_bucket{route="/rooms",le="1.0"} 2' in lines
+    assert 'request_seconds_bucket{route="/rooms",le="+Inf"} 3' in lines
+    assert 'request_seconds_count{route="/rooms"} 3' in lines
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    registry.counter("errors_total", "Errors", ("detail",)).inc('say "hi"\n')
+
+    assert 'errors_total{detail="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_stats_dicts_become_gauges_and_counters():
+    registry = Registry()
+    stats = {"hits": 3, "size": 1}
+    registry.stats("cache", "Cache", lambda: stats, counters=("hits",))
+    stats["hits"] = 4
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE cache_hits counter" in lines
+    assert "cache_hits 4" in lines
+    assert "# TYPE cache_size gauge" in lines
+    assert "cache_size 1" in lines
+
+
+def test_metric_without_samples_cannot_be_created():
+    class Broken(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Broken("broken", "Broken")
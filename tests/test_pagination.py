@@ -0,0 +1,44 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.crud.pagination import (MAX_PAGE_SIZE, PAGE_SIZE, decode_cursor,
+                                 encode_cursor, fetch_limit, page_size,
+                                 paginate, schedule_cursor)
+
+
+def test_cursor_round_trip():
+    key = (datetime(2025, 5, 1, 9, tzinfo=timezone.utc), uuid.uuid4())
+
+    assert decode_cursor(encode_cursor(*key), *schedule_cursor) == key
+
+
+def test_invalid_cursor():
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor", *schedule_cursor)
+
+
+def test_paginate_builds_next_cursor_only_when_more_rows():
+    rows = [(i,) for i in range(3)]
+
+    page, cursor = paginate(rows, 2, key=lambda row: row)
+    assert page == rows[:2]
+    assert decode_cursor(cursor, int) == (1,)
+
+    assert paginate(rows, 3, key=lambda row: row) == (rows, None)
+
+
+def test_listing_is_unbounded_without_limit_or_cursor():
+    rows = [(i,) for i in range(PAGE_SIZE + 1)]
+
+    assert page_size(None) is None
+    assert fetch_limit(page_size(None)) is None
+    assert paginate(rows, page_size(None), key=lambda row: row) == (rows, None)
+
+
+def test_cursor_without_limit_uses_the_default_page_size():
+    assert page_size(None, "cursor") == PAGE_SIZE
+    assert fetch_limit(page_size(None, "cursor")) == PAGE_SIZE + 1
+    assert page_size(MAX_PAGE_SIZE + 1) == MAX_PAGE_SIZE
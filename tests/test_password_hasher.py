@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+def test_hash_and_verify_on_the_pool():
+    hasher = PasswordHasher(workers=1, max_pending=4)
+
+    async def scenario():
+        hashed = await hasher.hash("string")
+        return await hasher.verify("string", hashed), await hasher.verify(
+            "wrong", hashed
+        )
+
+    try:
+        assert asyncio.run(scenario()) == (True, False)
+    finally:
+        hasher.shutdown()
+
+    assert hasher.stats()["completed"] == 3
+    assert hasher.stats()["failed"] == 0
+
+
+def test_failures_are_not_counted_as_completed():
+    hasher = PasswordHasher(workers=1, max_pending=4)
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await hasher.verify("string", "not a bcrypt hash")
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+    assert hasher.stats()["completed"] == 0
+    assert hasher.stats()["failed"] == 1
+
+
+def test_saturated_pool_fails_fast():
+    hasher = PasswordHasher(workers=1, max_pending=1)
+
+    async def scenario():
+        first = asyncio.create_task(hasher.hash("string"))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("string")
+        await first
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+    assert hasher.stats()["rejected"] == 1
@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import engine
+from app.db.database import DB_POOL_PRE_PING, DB_POOL_SIZE
+from app.db.pool import TimedQueuePool, prewarm
+
+
+def test_engine_uses_the_configured_pool():
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == DB_POOL_SIZE
+    assert engine.pool._pre_ping == DB_POOL_PRE_PING
+
+
+@pytest.mark.parametrize("count, opened", [(3, 3), (10, 4), (0, 0)])
+def test_prewarm_opens_up_to_pool_size_connections(count, opened):
+    async def scenario():
+        engine = create_async_engine(
+            "sqlite+aiosqlite://", poolclass=TimedQueuePool, pool_size=4
+        )
+        await prewarm(engine, count)
+        state = engine.pool.checkedin(), engine.pool.checkedout()
+        await engine.dispose()
+        return state
+
+    assert asyncio.run(scenario()) == (opened, 0)
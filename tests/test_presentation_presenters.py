@@ -0,0 +1,122 @@
+"""Presenter writes against a throwaway schema.
+
+Needs a reachable Postgres (the usual POSTGRES_* settings); the module is
+skipped otherwise.
+"""
+
+import asyncio
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.events import create_presentation_presenter
+
+
+async def seed(conn, roles: list, presenting: int) -> dict:
+    """Create a presentation, users with ``roles`` and make the first
+    ``presenting`` of them its presenters."""
+    presentation = uuid.uuid4()
+    users = [uuid.uuid4() for _ in roles]
+
+    await conn.execute(
+        text(
+            "INSERT INTO presentation (code, title, description)"
+            " VALUES (:code, 't', 'd')"
+        ),
+        {"code": presentation},
+    )
+    await conn.execute(
+        text(
+            'INSERT INTO "user" (code, first_name, last_name, email,'
+            " password_hash, role)"
+            " VALUES (:code, 'f', 'l', :email, 'x', CAST(:role AS userrole))"
+        ),
+        [
+            {"code": code, "email": f"{code}@example.com", "role": role}
+            for code, role in zip(users, roles)
+        ],
+    )
+    if presenting:
+        await conn.execute(
+            text(
+                "INSERT INTO presentation_presenters (presentation_code, user_code)"
+                " VALUES (:presentation, :user)"
+            ),
+            [
+                {"presentation": presentation, "user": code}
+                for code in users[:presenting]
+            ],
+        )
+    return {"presentation": presentation, "users": users}
+
+
+async def presenters(conn, presentation) -> set:
+    rows = await conn.execute(
+        text(
+            "SELECT user_code FROM presentation_presenters"
+            " WHERE presentation_code = :presentation"
+        ),
+        {"presentation": presentation},
+    )
+    return set(rows.scalars().all())
+
+
+def run(schema, roles: list, presenting: int, update):
+    """Seed, call create_presentation_presenter with ``update(users)`` and
+    return what it raised or returned along with the stored presenters."""
+
+    async def scenario():
+        engine = schema.engine()
+        try:
+            async with engine.begin() as conn:
+                keys = await seed(conn, roles, presenting)
+            presentation, users = keys["presentation"], keys["users"]
+
+            async with AsyncSession(engine) as db:
+                try:
+                    result = await create_presentation_presenter(
+                        db=db,
+                        presenters=update(users),
+                        presentation_code=presentation,
+                        existing=set(users[:presenting]),
+                    )
+                except HTTPException as e:
+                    result = e
+
+            async with engine.connect() as conn:
+                return users, result, await presenters(conn, presentation)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(scenario())
+
+
+def test_non_presenter_is_rejected(schema):
+    users, result, stored = run(
+        schema, ["presenter", "listener"], 1, lambda users: [users[0], users[1]]
+    )
+
+    assert isinstance(result, HTTPException)
+    assert result.status_code == 400
+    assert stored == {users[0]}
+
+
+def test_presenters_are_added_and_removed_in_one_update(schema):
+    users, result, stored = run(
+        schema, ["presenter", "presenter", "presenter"], 2, lambda users: users[1:]
+    )
+
+    assert result == sorted(users[1:])
+    assert stored == set(users[1:])
+
+
+def test_unknown_user_leaves_presenters_unchanged(schema):
+    users, result, stored = run(
+        schema, ["presenter", "presenter"], 1, lambda users: [users[1], uuid.uuid4()]
+    )
+
+    assert isinstance(result, HTTPException)
+    assert result.status_code == 400
+    assert stored == {users[0]}
@@ -0,0 +1,116 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.db.models import UserRole
+from app.crud.auth import create_access_token
+from app.dependencies import get_claims_principal, user_dependencies
+from app.services.claims_versions import ClaimsVersionStore
+from app.services.principals import (
+    Principal,
+    PrincipalCache,
+    PrincipalPresentation,
+)
+
+
+def principal(code=None) -> Principal:
+    return Principal(code=code or uuid.uuid4(), role=UserRole.listener)
+
+
+def test_hit_and_miss_counters():
+    cache = PrincipalCache(max_size=10, ttl=60)
+    user = principal()
+
+    assert cache.get("token") is None
+    cache.put("token", user)
+    assert cache.get("token") == user
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_with_the_token():
+    cache = PrincipalCache(max_size=10, ttl=60)
+    cache.put("token", principal(), expires_at=time.time() - 1)
+
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = PrincipalCache(max_size=2, ttl=60)
+    cache.put("first", principal())
+    cache.put("second", principal())
+    cache.get("first")
+    cache.put("third", principal())
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_drops_every_token_of_a_user():
+    cache = PrincipalCache(max_size=10, ttl=60)
+    code = uuid.uuid4()
+    cache.put("web", principal(code))
+    cache.put("mobile", principal(code))
+    cache.put("other", principal())
+
+    cache.invalidate(code)
+
+    assert cache.get("web") is None
+    assert cache.get("mobile") is None
+    assert cache.get("other") is not None
+
+
+def test_claims_round_trip_role_and_presentations():
+    user = Principal(
+        code=uuid.uuid4(),
+        role=UserRole.presenter,
+        presentations=(PrincipalPresentation(uuid.uuid4()),),
+    )
+
+    payload = {"sub": str(user.code), **user.to_claims(3)}
+
+    assert payload["ver"] == 3
+    assert Principal.from_claims(payload) == user
+    assert Principal.from_claims({"sub": str(user.code)}) is None
+    assert Principal.from_claims({**payload, "fmt": 0}) is None
+
+
+def test_stale_claims_fall_back_to_the_database(monkeypatch):
+    code, presentation = uuid.uuid4(), uuid.uuid4()
+    loads = []
+
+    async def get_user_by_code(code, db):
+        loads.append(code)
+        return SimpleNamespace(
+            code=uuid.UUID(code),
+            role=UserRole.presenter,
+            presentations=[SimpleNamespace(presentation_code=presentation)],
+        )
+
+    monkeypatch.setattr(user_dependencies, "get_user_by_code", get_user_by_code)
+    monkeypatch.setattr(user_dependencies, "claims_versions", ClaimsVersionStore())
+
+    async def authorize(version):
+        token = await create_access_token(
+            user_code=str(code),
+            role=UserRole.presenter,
+            claims_version=version,
+            session_id=str(uuid.uuid4()),
+        )
+        return await get_claims_principal(token=token, db=None)
+
+    async def scenario():
+        user_dependencies.claims_versions.record(
+            [(code, 1, datetime.now(timezone.utc))]
+        )
+        return await authorize(0), await authorize(1)
+
+    stale, fresh = asyncio.run(scenario())
+
+    assert stale.presentations == (PrincipalPresentation(presentation),)
+    assert fresh == Principal(code, UserRole.presenter)
+    assert len(loads) == 1
@@ -0,0 +1,108 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import requests
+from starlette import status
+
+BASE_URL = "http://0.0.0.0:8000"
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+# Worst case statement counts, including a cold principal cache on the
+# first request made with a token.
+BUDGETS = {
+    "register": 2,
+    "login": 3,
+    "me": 4,
+    "rooms": 1,
+    "schedules": 1,
+    "presentations": 1,
+    "presentation_create": 5,
+    "presentation_update": 9,
+    "schedule_create": 3,
+    "registration_create": 4,
+}
+
+
+def within_budget(name: str, response: requests.Response):
+    assert response.status_code < 400, response.text
+
+    count = int(response.headers[QUERY_COUNT_HEADER])
+    assert count <= BUDGETS[name], f"{name} ran {count} statements"
+
+
+def register_and_login(role: str) -> tuple:
+    email = f"{role}-{uuid.uuid4().hex}@example.com"
+    response = requests.post(
+        BASE_URL + "/users/register",
+        json={
+            "first_name": "Budget",
+            "last_name": "Test",
+            "email": email,
+            "password": "string",
+            "role": role,
+        },
+    )
+    within_budget("register", response)
+    code = response.json()["code"]
+
+    response = requests.post(
+        BASE_URL + "/users/login",
+        data={"username": email, "password": "string"},
+    )
+    within_budget("login", response)
+
+    return code, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_read_endpoints_stay_within_budget():
+    _, headers = register_and_login("listener")
+
+    within_budget("me", requests.get(BASE_URL + "/users/me", headers=headers))
+    for name in ("rooms", "schedules", "presentations"):
+        response = requests.get(BASE_URL + f"/events/{name}", headers=headers)
+        within_budget(name, response)
+
+
+def test_write_endpoints_stay_within_budget():
+    presenter, headers = register_and_login("presenter")
+    co_presenter, _ = register_and_login("presenter")
+
+    response = requests.post(
+        BASE_URL + "/events/presentation/create",
+        headers=headers,
+        json={"title": "Budget", "description": "Budget", "presenters": [presenter]},
+    )
+    within_budget("presentation_create", response)
+    presentation = response.json()["code"]
+
+    response = requests.patch(
+        BASE_URL + f"/events/presentation/update/{presentation}",
+        headers=headers,
+        json={"title": "Budget 2", "presenters": [presenter, co_presenter]},
+    )
+    within_budget("presentation_update", response)
+
+    room = requests.get(BASE_URL + "/events/rooms", headers=headers).json()[0]
+    start = datetime(2100, 1, 1, tzinfo=timezone.utc) + timedelta(
+        minutes=random.randrange(0, 10**6) * 5
+    )
+    response = requests.post(
+        BASE_URL + "/events/schedule/create",
+        headers=headers,
+        json={
+            "room_code": room["code"],
+            "presentation_code": presentation,
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=5)).isoformat(),
+        },
+    )
+    within_budget("schedule_create", response)
+
+    _, listener = register_and_login("listener")
+    response = requests.post(
+        BASE_URL + "/events/registration/create",
+        headers=listener,
+        params={"schedule_code": response.json()["code"]},
+    )
+    within_budget("registration_create", response)
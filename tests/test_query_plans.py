@@ -0,0 +1,278 @@
+"""EXPLAIN every CRUD read and the hot write paths against a seeded
+throwaway schema.
+
+Needs a reachable Postgres (the usual POSTGRES_* settings); the module is
+skipped otherwise. A sequential scan on any table holding more than
+QUERY_PLAN_SEQ_SCAN_ROWS rows fails the query that caused it. Every
+query runs in a transaction that is rolled back, so writes leave the
+seed as it was.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import (
+    get_availability,
+    get_presentation,
+    get_presentations,
+    get_room,
+    get_schedule,
+    get_schedules,
+    get_user_by_code,
+    get_user_by_email,
+    read_presentation,
+    read_presentations,
+    read_room,
+    read_rooms,
+    read_schedule,
+    read_schedules,
+)
+from app.crud.events import (
+    create_presentation_presenter,
+    create_registration,
+    create_schedules_bulk,
+    get_registration,
+    get_waitlist_entry,
+    promote_waitlisted,
+)
+from app.db import get_loaders
+from app.db.models import Presentation
+
+SEED_ROWS = int(os.getenv("QUERY_PLAN_SEED_ROWS", "20000"))
+SEQ_SCAN_ROWS = int(os.getenv("QUERY_PLAN_SEQ_SCAN_ROWS", "1000"))
+ROOMS = 100
+
+SEED = [
+    """
+    INSERT INTO room (code, name, sit_count)
+    SELECT gen_random_uuid(), 'room ' || i, 50 FROM generate_series(1, :rooms) i
+    """,
+    """
+    INSERT INTO "user" (code, first_name, last_name, email, password_hash, role)
+    SELECT gen_random_uuid(), 'first', 'last', 'user' || i || '@example.com', 'x',
+           (CASE WHEN i % 2 = 0 THEN 'presenter' ELSE 'listener' END)::userrole
+    FROM generate_series(1, :rows) i
+    """,
+    """
+    INSERT INTO presentation (code, title, description)
+    SELECT gen_random_uuid(), 'title ' || i, 'description' FROM generate_series(1, :rows) i
+    """,
+    """
+    INSERT INTO presentation_presenters (presentation_code, user_code)
+    SELECT p.code, u.code
+    FROM (SELECT code, row_number() OVER (ORDER BY code) AS rn FROM presentation) p
+    JOIN (SELECT code, row_number() OVER (ORDER BY code) AS rn FROM "user" WHERE role = 'presenter') u
+      ON u.rn = p.rn % (:rows / 2) + 1
+    """,
+    """
+    INSERT INTO schedules (code, room_code, presentation_code, start_time, end_time,
+                           seats_taken)
+    SELECT gen_random_uuid(), r.code, p.code,
+           timestamptz '2030-01-01' + (p.rn / :rooms) * interval '1 hour',
+           timestamptz '2030-01-01' + (p.rn / :rooms) * interval '1 hour'
+               + interval '50 minutes',
+           1
+    FROM (SELECT code, row_number() OVER (ORDER BY code) - 1 AS rn FROM presentation) p
+    JOIN (SELECT code, row_number() OVER (ORDER BY code) - 1 AS rn FROM room) r
+      ON r.rn = p.rn % :rooms
+    """,
+    """
+    INSERT INTO registrations (code, schedule_code, user_code)
+    SELECT gen_random_uuid(), s.code, u.code
+    FROM (SELECT code, row_number() OVER (ORDER BY code) AS rn FROM schedules) s
+    JOIN (SELECT code, row_number() OVER (ORDER BY code) AS rn FROM "user" WHERE role = 'listener') u
+      ON u.rn = s.rn
+    """,
+    """
+    INSERT INTO waitlist (code, schedule_code, user_code)
+    SELECT gen_random_uuid(), s.code, u.code
+    FROM (SELECT code, row_number() OVER (ORDER BY code) AS rn FROM schedules) s
+    JOIN (SELECT code, row_number() OVER (ORDER BY code) AS rn FROM "user" WHERE role = 'listener') u
+      ON u.rn = s.rn % (:rows / 2) + 1
+    """,
+]
+
+START = datetime(2030, 1, 2, tzinfo=timezone.utc)
+
+
+async def schedule_new_presentation(db, k):
+    # every seeded presentation is scheduled already and would be turned
+    # down before the overlap lookup
+    code = uuid.uuid4()
+    await db.execute(insert(Presentation).values(code=code, title="t", description="d"))
+    return await create_schedules_bulk(
+        db,
+        [
+            {
+                "room_code": k["room"],
+                "presentation_code": code,
+                "start_time": START,
+                "end_time": START + timedelta(minutes=50),
+            }
+        ],
+    )
+
+
+QUERIES = {
+    "get_user_by_email": lambda db, k: get_user_by_email(db, k["email"]),
+    "get_user_by_code": lambda db, k: get_user_by_code(db, k["presenter"]),
+    "get_presentation": lambda db, k: get_presentation(k["presentation"], db),
+    "get_presentations": lambda db, k: get_presentations(db, k["presenter"]),
+    "read_presentation": lambda db, k: read_presentation(db, k["presentation"]),
+    "read_presentations": lambda db, k: read_presentations(
+        db, k["presenter"], limit=100
+    ),
+    "get_schedule": lambda db, k: get_schedule(db, k["schedule"]),
+    "get_schedules_room": lambda db, k: get_schedules(db, room_code=k["room"]),
+    "read_schedule": lambda db, k: read_schedule(db, k["schedule"]),
+    "read_schedules": lambda db, k: read_schedules(db, limit=100),
+    "read_schedules_after": lambda db, k: read_schedules(
+        db, limit=100, after=(START, k["schedule"])
+    ),
+    "get_room": lambda db, k: get_room(db, k["room"]),
+    "read_room": lambda db, k: read_room(db, k["room"]),
+    "read_rooms": lambda db, k: read_rooms(db, limit=100),
+    "get_availability": lambda db, k: get_availability(
+        db, START, START + timedelta(hours=8), timedelta(minutes=30)
+    ),
+    "get_registration": lambda db, k: get_registration(
+        k["schedule"], k["listener"], db
+    ),
+    "get_waitlist_entry": lambda db, k: get_waitlist_entry(
+        k["schedule"], k["listener"], db
+    ),
+    "load_presentations": lambda db, k: get_loaders(db).presentations.load(
+        k["presentation"]
+    ),
+    "create_registration": lambda db, k: create_registration(
+        db, k["schedule"], k["newcomer"]
+    ),
+    "promote_waitlisted": lambda db, k: promote_waitlisted(db, {k["schedule"]}),
+    "create_schedules_bulk": schedule_new_presentation,
+    "create_presentation_presenter": lambda db, k: create_presentation_presenter(
+        db,
+        presenters=[k["other_presenter"]],
+        presentation_code=k["presentation"],
+        existing={k["presenter"]},
+    ),
+}
+
+
+async def seed(schema) -> dict:
+    engine = schema.engine()
+    try:
+        async with engine.begin() as conn:
+            for statement in SEED:
+                await conn.execute(text(statement), {"rows": SEED_ROWS, "rooms": ROOMS})
+
+        # statistics are transactional, a rolled back ANALYZE leaves none
+        async with engine.begin() as conn:
+            await conn.execute(text("ANALYZE"))
+
+        async with engine.connect() as conn:
+            keys = (await conn.execute(text("""
+                        SELECT s.code AS schedule, s.room_code AS room,
+                               s.presentation_code AS presentation,
+                               pp.user_code AS presenter, r.user_code AS listener,
+                               u.email AS email,
+                               (SELECT code FROM "user"
+                                WHERE role = 'listener' AND code <> r.user_code
+                                LIMIT 1) AS newcomer,
+                               (SELECT code FROM "user"
+                                WHERE role = 'presenter' AND code <> pp.user_code
+                                LIMIT 1) AS other_presenter
+                        FROM schedules s
+                        JOIN presentation_presenters pp
+                          ON pp.presentation_code = s.presentation_code
+                        JOIN registrations r ON r.schedule_code = s.code
+                        JOIN "user" u ON u.code = r.user_code
+                        LIMIT 1
+                        """))).one()
+            return dict(keys._mapping)
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def keys(schema):
+    return asyncio.run(seed(schema))
+
+
+VERBS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from seq_scans(child)
+
+
+async def explain(schema, query, keys) -> list:
+    engine = schema.engine()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(VERBS):
+            if executemany:
+                parameters = parameters[0]
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            # commits inside the CRUD functions only release a savepoint
+            async with AsyncSession(
+                bind=conn, join_transaction_mode="create_savepoint"
+            ) as db:
+                await query(db, keys)
+            await transaction.rollback()
+
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        offenders = []
+        async with engine.connect() as conn:
+            sizes = dict(
+                (
+                    await conn.execute(
+                        text(
+                            "SELECT relname, reltuples FROM pg_class "
+                            "JOIN pg_namespace ON pg_namespace.oid = relnamespace "
+                            "WHERE nspname = :schema"
+                        ),
+                        {"schema": schema.name},
+                    )
+                ).all()
+            )
+            for statement, parameters in statements:
+                plan = (
+                    await conn.exec_driver_sql(
+                        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                    )
+                ).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                for relation in seq_scans(plan[0]["Plan"]):
+                    if sizes.get(relation, 0) > SEQ_SCAN_ROWS:
+                        offenders.append((relation, statement))
+
+        return offenders
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("name", sorted(QUERIES))
+def test_query_uses_indexes(schema, keys, name):
+    offenders = asyncio.run(explain(schema, QUERIES[name], keys))
+
+    assert not offenders, "\n\n".join(
+        f"Seq Scan on {relation}:\n{statement}" for relation, statement in offenders
+    )
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from sqlalchemy import ForeignKey, String, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from app.db import instrumentation
+from app.db.instrumentation import (install, set_raiseload, start_query_stats,
+                                    statement_shape)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Parent(Base):
+    __tablename__ = "parents"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    children: Mapped[list["Child"]] = relationship(lazy="select")
+
+
+class Child(Base):
+    __tablename__ = "children"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    parent_id: Mapped[int] = mapped_column(ForeignKey("parents.id"))
+    name: Mapped[str] = mapped_column(String(20))
+
+
+async def seeded_engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    install(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        for i in range(5):
+            session.add(Parent(id=i, children=[Child(name=f"child {i}")]))
+        await session.commit()
+
+    return engine
+
+
+def test_placeholders_collapse_into_one_shape():
+    assert statement_shape("SELECT a FROM t WHERE c IN ($1::UUID, $2::UUID)") == (
+        statement_shape("SELECT a FROM t WHERE c IN ($1::UUID)")
+    )
+
+
+def test_lazy_loads_per_row_are_flagged():
+    async def scenario():
+        engine = await seeded_engine()
+        stats = start_query_stats()
+        async with AsyncSession(engine) as session:
+            parents = (await session.scalars(select(Parent))).all()
+            for parent in parents:
+                await session.run_sync(lambda _: parent.children)
+        await engine.dispose()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats.count == 6
+    assert list(stats.repeated(threshold=5).values()) == [5]
+
+
+def test_raiseload_mode_rejects_unplanned_loads(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_raiseload", False)
+
+    async def scenario():
+        engine = await seeded_engine()
+        set_raiseload(True)
+        try:
+            async with AsyncSession(engine) as session:
+                parent = await session.scalar(select(Parent).limit(1))
+                await session.run_sync(lambda _: parent.children)
+        finally:
+            await engine.dispose()
+
+    with pytest.raises(InvalidRequestError):
+        asyncio.run(scenario())
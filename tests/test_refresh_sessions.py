@@ -0,0 +1,110 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.services.bloom import BloomFilter
+from app.services.refresh_sessions import MemorySessionBackend, RefreshSessionStore
+
+
+def expires(days=1):
+    return datetime.now(timezone.utc) + timedelta(days=days)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [uuid.uuid4() for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(uuid.uuid4() in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+def test_sessions_are_revoked_one_at_a_time():
+    async def scenario():
+        store = RefreshSessionStore(backend=MemorySessionBackend())
+        user = uuid.uuid4()
+        laptop = await store.open(user, expires())
+        phone = await store.open(user, expires())
+
+        await store.revoke(laptop)
+
+        return await store.is_revoked(laptop), await store.is_revoked(phone), store
+
+    laptop_revoked, phone_revoked, store = asyncio.run(scenario())
+
+    assert laptop_revoked
+    assert not phone_revoked
+    # the live session was answered by the filter alone
+    assert store.stats()["backend_checks"] == 1
+
+
+def test_revoke_user_closes_every_session():
+    async def scenario():
+        store = RefreshSessionStore(backend=MemorySessionBackend())
+        user = uuid.uuid4()
+        sessions = [await store.open(user, expires()) for _ in range(3)]
+
+        await store.revoke_user(user)
+
+        return [await store.is_revoked(jti) for jti in sessions]
+
+    assert asyncio.run(scenario()) == [True, True, True]
+
+
+def test_sync_picks_up_revocations_from_other_processes():
+    async def scenario():
+        backend = MemorySessionBackend()
+        here = RefreshSessionStore(backend=backend)
+        there = RefreshSessionStore(backend=backend)
+        jti = await here.open(uuid.uuid4(), expires())
+
+        await there.revoke(jti)
+        before = here.maybe_revoked(jti)
+        await here.sync()
+
+        return before, here.maybe_revoked(jti)
+
+    assert asyncio.run(scenario()) == (False, True)
+
+
+def test_saturated_filter_is_rebuilt_without_expired_sessions():
+    async def scenario():
+        backend = MemorySessionBackend()
+        store = RefreshSessionStore(backend=backend, capacity=2)
+        expired = await store.open(uuid.uuid4(), expires(days=-1))
+        live = await store.open(uuid.uuid4(), expires())
+
+        await store.revoke(expired)
+        await store.revoke(live)
+        await store.sync()
+
+        return store.revoked.count, store.maybe_revoked(live)
+
+    assert asyncio.run(scenario()) == (1, True)
+
+
+def test_filter_keeps_answering_while_it_is_rebuilt():
+    async def scenario():
+        backend = MemorySessionBackend()
+        store = RefreshSessionStore(backend=backend, capacity=1)
+        first = await store.open(uuid.uuid4(), expires())
+        second = await store.open(uuid.uuid4(), expires())
+        await store.revoke(first)
+
+        revoked_since = backend.revoked_since
+        during = []
+
+        async def slow_revoked_since(since):
+            revocations = await revoked_since(since)
+            during.append(store.maybe_revoked(first))
+            await store.revoke(second)
+            return revocations
+
+        backend.revoked_since = slow_revoked_since
+        await store.sync()
+
+        return during, store.maybe_revoked(first), store.maybe_revoked(second)
+
+    assert asyncio.run(scenario()) == ([True], True, True)
@@ -0,0 +1,96 @@
+import os
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import requests
+from starlette import status
+
+BASE_URL = "http://0.0.0.0:8000"
+
+LISTENERS = int(os.getenv("LOAD_TEST_LISTENERS", "80"))
+
+
+def register_and_login(role: str) -> str:
+    email = f"{role}-{uuid.uuid4().hex}@example.com"
+    response = requests.post(
+        BASE_URL + "/users/register",
+        json={
+            "first_name": "Load",
+            "last_name": "Test",
+            "email": email,
+            "password": "string",
+            "role": role,
+        },
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = requests.post(
+        BASE_URL + "/users/login",
+        data={"username": email, "password": "string"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    return response.json()["access_token"]
+
+
+def auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def create_session(token: str):
+    me = requests.get(BASE_URL + "/users/me", headers=auth(token)).json()
+
+    rooms = requests.get(BASE_URL + "/events/rooms", headers=auth(token)).json()
+    room = min(rooms, key=lambda r: r["sit_count"])
+
+    presentation = requests.post(
+        BASE_URL + "/events/presentation/create",
+        headers=auth(token),
+        json={
+            "title": "Load test",
+            "description": "Seat capacity under burst",
+            "presenters": [me["code"]],
+        },
+    ).json()
+
+    start = datetime(2100, 1, 1, tzinfo=timezone.utc) + timedelta(
+        minutes=random.randrange(0, 10**6) * 5
+    )
+    response = requests.post(
+        BASE_URL + "/events/schedule/create",
+        headers=auth(token),
+        json={
+            "room_code": room["code"],
+            "presentation_code": presentation["code"],
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=5)).isoformat(),
+        },
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    return response.json()["code"], room["sit_count"]
+
+
+def register(token: str, schedule_code: str) -> int:
+    response = requests.post(
+        BASE_URL + "/events/registration/create",
+        headers=auth(token),
+        params={"schedule_code": schedule_code},
+    )
+    return response.status_code
+
+
+def test_concurrent_registrations_respect_capacity():
+    schedule_code, sit_count = create_session(register_and_login("presenter"))
+
+    listeners = max(LISTENERS, sit_count + 10)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        tokens = list(pool.map(register_and_login, ["listener"] * listeners))
+
+    with ThreadPoolExecutor(max_workers=listeners) as pool:
+        codes = list(pool.map(lambda t: register(t, schedule_code), tokens))
+
+    assert codes.count(status.HTTP_201_CREATED) == sit_count
+    assert codes.count(status.HTTP_409_CONFLICT) == listeners - sit_count
@@ -0,0 +1,203 @@
+"""Read routing between the primary and a replica.
+
+The last test needs a primary and a streaming replica of it (the usual
+POSTGRES_* settings plus REPLICA_POSTGRES_HOST/PORT) and is skipped
+otherwise.
+"""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.instrumentation import current_query_stats, start_query_stats
+from app.db.models import UserRole
+from app.db.replica import PrimarySession, ReplicaRouter, current_user_code
+from app.services import Principal
+
+
+def router(lag=0.0, **kwargs):
+    router = ReplicaRouter(primary="primary", replica="replica", **kwargs)
+
+    async def measure_lag():
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+    router.measure_lag = measure_lag
+    return router
+
+
+def test_reads_use_the_primary_without_a_replica():
+    router = ReplicaRouter(primary="primary")
+
+    assert asyncio.run(router.session_maker(uuid.uuid4())) == "primary"
+
+
+def test_reads_go_to_a_healthy_replica():
+    assert asyncio.run(router(lag=0.5).session_maker(uuid.uuid4())) == "replica"
+
+
+def test_lagging_or_unreachable_replica_falls_back_to_primary():
+    lagging = router(lag=30.0, max_lag=5)
+    unreachable = router(lag=ConnectionRefusedError())
+    unknown = router(lag=None)
+
+    for candidate in (lagging, unreachable, unknown):
+        assert asyncio.run(candidate.session_maker()) == "primary"
+        assert candidate.lag_fallbacks == 1
+
+
+def test_lag_is_checked_at_most_once_per_interval():
+    candidate = router(lag=0.0, check_interval=60)
+    calls = []
+    measure = candidate.measure_lag
+
+    async def counted():
+        calls.append(1)
+        return await measure()
+
+    candidate.measure_lag = counted
+
+    async def reads():
+        return await asyncio.gather(*(candidate.session_maker() for _ in range(5)))
+
+    assert set(asyncio.run(reads())) == {"replica"}
+    assert len(calls) == 1
+
+
+def test_lag_check_is_left_out_of_the_request_stats():
+    candidate = router()
+    seen = []
+
+    async def measure_lag():
+        seen.append(current_query_stats())
+        return 0.0
+
+    candidate.measure_lag = measure_lag
+
+    async def read():
+        stats = start_query_stats()
+        await candidate.session_maker()
+        return stats, current_query_stats()
+
+    stats, after = asyncio.run(read())
+
+    assert seen == [None]
+    assert after is stats
+
+
+def test_pin_window_sends_the_writer_to_the_primary():
+    candidate = router(pin_seconds=60)
+    writer, other = uuid.uuid4(), uuid.uuid4()
+
+    candidate.pin(writer)
+
+    assert asyncio.run(candidate.session_maker(writer)) == "primary"
+    assert asyncio.run(candidate.session_maker(other)) == "replica"
+
+    candidate.pins[writer] = time.monotonic() - 1
+    assert asyncio.run(candidate.session_maker(writer)) == "replica"
+    assert writer not in candidate.pins
+
+
+def test_pins_are_bounded():
+    candidate = router(pin_size=2)
+    users = [uuid.uuid4() for _ in range(3)]
+
+    for user in users:
+        candidate.pin(user)
+
+    assert list(candidate.pins) == users[1:]
+
+
+def test_commit_on_the_primary_pins_the_current_user():
+    candidate = router()
+
+    class Session(PrimarySession):
+        pass
+
+    candidate.install(Session)
+    user = uuid.uuid4()
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        maker = sessionmaker(
+            bind=engine, class_=AsyncSession, sync_session_class=Session
+        )
+
+        async with maker() as session:
+            await session.execute(text("SELECT 1"))
+            await session.commit()
+        anonymous_pins = len(candidate.pins)
+
+        current_user_code.set(user)
+        async with maker() as session:
+            await session.execute(text("SELECT 1"))
+            await session.commit()
+
+        await engine.dispose()
+        return anonymous_pins
+
+    assert asyncio.run(scenario()) == 0
+    assert candidate.pinned(user)
+
+
+def test_routed_session_remembers_its_maker(monkeypatch):
+    from app.db import replica_router, routed_session_maker
+    from app.dependencies.db_dependency import get_read_session
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    maker = sessionmaker(bind=engine, class_=AsyncSession)
+    chosen = []
+
+    async def session_maker(user_code=None):
+        chosen.append(user_code)
+        return maker
+
+    monkeypatch.setattr(replica_router, "session_maker", session_maker)
+    user = Principal(code=uuid.uuid4(), role=UserRole.listener)
+
+    async def scenario():
+        sessions = get_read_session(user=user)
+        session = await sessions.__anext__()
+        routed = routed_session_maker(session)
+        await sessions.aclose()
+        await engine.dispose()
+        return routed
+
+    assert asyncio.run(scenario()) is maker
+    assert chosen == [user.code]
+
+
+def test_replica_lag_against_live_servers():
+    from app.db.database import (
+        AsyncSessionMaker,
+        ReplicaSessionMaker,
+        engine,
+        replica_engine,
+    )
+
+    if ReplicaSessionMaker is None:
+        pytest.skip("REPLICA_POSTGRES_HOST is not set")
+
+    candidate = ReplicaRouter(primary=AsyncSessionMaker, replica=ReplicaSessionMaker)
+
+    async def scenario():
+        try:
+            lag = await candidate.measure_lag()
+        finally:
+            await engine.dispose()
+            await replica_engine.dispose()
+        return lag
+
+    try:
+        lag = asyncio.run(scenario())
+    except OSError as e:
+        pytest.skip(f"Replica is not available: {e}")
+
+    assert lag is not None and lag >= 0
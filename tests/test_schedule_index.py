@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from app.services.schedule_index import ScheduleIndex
+
+START = datetime(2025, 5, 1, 9, tzinfo=timezone.utc)
+
+
+def slot(hours_from: float, hours_to: float):
+    return START + timedelta(hours=hours_from), START + timedelta(hours=hours_to)
+
+
+def test_overlaps_per_room():
+    index = ScheduleIndex()
+    room, other_room = uuid.uuid4(), uuid.uuid4()
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    index.add(first, room, *slot(0, 1))
+    index.add(second, room, *slot(2, 3))
+
+    assert index.overlaps(room, *slot(0.5, 2.5)) == [second, first]
+    assert index.overlaps(room, *slot(1, 2)) == []
+    assert index.overlaps(other_room, *slot(0, 3)) == []
+
+
+def test_exclude_and_move():
+    index = ScheduleIndex()
+    room = uuid.uuid4()
+    code = uuid.uuid4()
+
+    index.add(code, room, *slot(0, 1))
+    assert index.overlaps(room, *slot(0, 1), exclude=code) == []
+
+    index.add(code, room, *slot(4, 5))
+    assert index.overlaps(room, *slot(0, 1)) == []
+    assert index.overlaps(room, *slot(4.5, 6)) == [code]
+
+    index.remove(code)
+    assert index.overlaps(room, *slot(0, 10)) == []
+
+
+def test_naive_datetimes_are_utc():
+    index = ScheduleIndex()
+    room = uuid.uuid4()
+    code = uuid.uuid4()
+
+    index.add(code, room, *slot(0, 1))
+
+    naive_start = datetime(2025, 5, 1, 9, 30)
+    naive_end = datetime(2025, 5, 1, 10, 30)
+    assert index.overlaps(room, naive_start, naive_end) == [code]
+
+
+class Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, stmt):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+def test_stale_hits_are_confirmed_against_the_database():
+    index = ScheduleIndex()
+    room = uuid.uuid4()
+    deleted, moved, kept = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    index.add(deleted, room, *slot(0, 1))
+    index.add(moved, room, *slot(1, 2))
+    index.add(kept, room, *slot(2, 3))
+
+    row = namedtuple("Row", "code room_code start_time end_time")
+    db = Rows([row(moved, room, *slot(5, 6)), row(kept, room, *slot(2, 3))])
+
+    assert asyncio.run(index.confirm_overlaps(db, room, *slot(0, 2))) == []
+    assert deleted not in index.entries
+    assert index.overlaps(room, *slot(5, 6)) == [moved]
+    assert asyncio.run(index.confirm_overlaps(db, room, *slot(2.5, 4))) == [kept]
@@ -0,0 +1,118 @@
+"""Bulk schedule import against a throwaway schema.
+
+Needs a reachable Postgres (the usual POSTGRES_* settings); the module is
+skipped otherwise.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.events import create_schedules_bulk
+
+START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+async def seed(conn, rooms: int, presentations: int) -> dict:
+    keys = {
+        "rooms": [uuid.uuid4() for _ in range(rooms)],
+        "presentations": [uuid.uuid4() for _ in range(presentations)],
+    }
+
+    await conn.execute(
+        text("INSERT INTO room (code, name, sit_count) VALUES (:code, :name, 10)"),
+        [{"code": code, "name": str(code)} for code in keys["rooms"]],
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO presentation (code, title, description)"
+            " VALUES (:code, 't', 'd')"
+        ),
+        [{"code": code} for code in keys["presentations"]],
+    )
+    return keys
+
+
+def slot(room, presentation, hour: float) -> dict:
+    start = START + timedelta(hours=hour)
+    return {
+        "room_code": room,
+        "presentation_code": presentation,
+        "start_time": start,
+        "end_time": start + timedelta(hours=1),
+    }
+
+
+def run(schema, rooms: int, presentations: int, batch, existing=()):
+    """Seed, import ``batch(keys)`` after scheduling ``existing(keys)`` and
+    return the per item statuses with the stored presentation codes."""
+
+    async def scenario():
+        engine = schema.engine()
+        try:
+            async with engine.begin() as conn:
+                keys = await seed(conn, rooms, presentations)
+                for row in existing(keys) if existing else ():
+                    await conn.execute(
+                        text(
+                            "INSERT INTO schedules (code, room_code,"
+                            " presentation_code, start_time, end_time)"
+                            " VALUES (gen_random_uuid(), :room_code,"
+                            " :presentation_code, :start_time, :end_time)"
+                        ),
+                        row,
+                    )
+
+            async with AsyncSession(engine) as db:
+                results = await create_schedules_bulk(db, batch(keys))
+
+            async with engine.connect() as conn:
+                stored = await conn.execute(
+                    text(
+                        "SELECT presentation_code FROM schedules"
+                        " WHERE presentation_code = ANY(:codes)"
+                    ),
+                    {"codes": keys["presentations"]},
+                )
+                return keys, [r["status"] for r in results], set(stored.scalars())
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(scenario())
+
+
+def test_presentation_falls_back_to_a_slot_that_survives_the_sweep(schema):
+    # the first slot of presentation 0 overlaps presentation 1, which is
+    # already scheduled, so the second one has to be used
+    keys, statuses, stored = run(
+        schema,
+        rooms=1,
+        presentations=2,
+        existing=lambda k: [slot(k["rooms"][0], k["presentations"][1], 0)],
+        batch=lambda k: [
+            slot(k["rooms"][0], k["presentations"][0], 0.5),
+            slot(k["rooms"][0], k["presentations"][0], 2),
+        ],
+    )
+
+    assert statuses == ["conflict", "created"]
+    assert stored == set(keys["presentations"])
+
+
+def test_dropped_duplicate_does_not_block_other_slots(schema):
+    keys, statuses, stored = run(
+        schema,
+        rooms=2,
+        presentations=2,
+        batch=lambda k: [
+            slot(k["rooms"][0], k["presentations"][0], 0),
+            slot(k["rooms"][1], k["presentations"][0], 0),
+            slot(k["rooms"][1], k["presentations"][1], 0.5),
+        ],
+    )
+
+    assert statuses == ["created", "invalid", "created"]
+    assert stored == set(keys["presentations"])
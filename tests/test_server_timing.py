@@ -0,0 +1,58 @@
+import asyncio
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.middleware import InstrumentationMiddleware
+from app.routes.timing import TimedRoute
+from app.tracing import traced
+
+
+class Item(BaseModel):
+    code: int
+
+
+@traced("auth")
+async def current_user():
+    await asyncio.sleep(0.01)
+    return "user"
+
+
+@traced("auth")
+async def claims_user(user: Annotated[str, Depends(current_user)]):
+    # nested auth spans count once
+    return await current_user()
+
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/items", response_model=List[Item])
+async def items(user: Annotated[str, Depends(claims_user)]):
+    return [{"code": i} for i in range(100)]
+
+
+app = FastAPI()
+app.include_router(router)
+app.add_middleware(InstrumentationMiddleware)
+
+
+def timings(header: str) -> dict:
+    spans = {}
+    for entry in header.split(", "):
+        name, duration = entry.split(";dur=")
+        spans[name] = float(duration)
+    return spans
+
+
+def test_server_timing_splits_the_request_into_phases():
+    response = TestClient(app).get("/items")
+
+    spans = timings(response.headers["Server-Timing"])
+
+    assert set(spans) == {"auth", "deps", "endpoint", "serialize", "db", "app"}
+    assert 20 <= spans["auth"] <= spans["deps"]
+    assert spans["deps"] + spans["endpoint"] + spans["serialize"] <= spans["app"]
+    assert response.headers["X-DB-Query-Count"] == "0"
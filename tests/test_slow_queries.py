@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.slow_queries import SlowQueryRecorder, explainable, fingerprint
+
+
+def test_fingerprint_ignores_placeholders_and_whitespace():
+    assert fingerprint("SELECT * FROM users WHERE code IN ($1, $2)") == fingerprint(
+        "SELECT *\n  FROM users WHERE code IN ($1, $2, $3)"
+    )
+    assert fingerprint("SELECT 1 FROM users") != fingerprint("SELECT 1 FROM rooms")
+
+
+def test_only_plain_selects_are_explained():
+    assert explainable("  SELECT 1")
+    assert not explainable("SELECT * FROM schedules FOR UPDATE")
+    assert not explainable("UPDATE users SET role = 'listener'")
+    assert not explainable("DELETE FROM schedules")
+
+
+def test_ring_buffer_keeps_latest_entries_and_aggregates():
+    recorder = SlowQueryRecorder(threshold_ms=0, size=2, sample_rate=0)
+
+    for index in range(3):
+        recorder.record("SELECT * FROM rooms WHERE id = $1", (index,), 0.5)
+    recorder.record("SELECT * FROM users", (), 0.1)
+
+    snapshot = recorder.snapshot()
+    assert [q["parameters"] for q in snapshot["queries"]] == [[], ["2"]]
+
+    rooms, users = snapshot["fingerprints"]
+    assert rooms["count"] == 3
+    assert rooms["total_ms"] == pytest.approx(1500)
+    assert users["max_ms"] == pytest.approx(100)
+
+    recorder.clear()
+    assert recorder.snapshot()["queries"] == []
+
+
+def test_listener_records_statements_over_threshold():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        fast = SlowQueryRecorder(threshold_ms=10_000, sample_rate=0)
+        slow = SlowQueryRecorder(threshold_ms=0, sample_rate=0)
+        fast.install(engine)
+        slow.install(engine)
+
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT :value"), {"value": 1})
+
+        await engine.dispose()
+        return fast, slow
+
+    fast, slow = asyncio.run(scenario())
+
+    assert not fast.entries
+    entry = slow.entries[-1]
+    assert entry["statement"] == "SELECT ?"
+    assert entry["parameters"] == ["1"]
+    assert entry["plan"] is None
+
+
+def test_writes_are_never_sampled_for_explain():
+    async def scenario():
+        recorder = SlowQueryRecorder(threshold_ms=0, sample_rate=1)
+        recorder.record(
+            "UPDATE rooms SET name = $1", ("x",), 1.0, url="postgresql+asyncpg://"
+        )
+        return recorder
+
+    recorder = asyncio.run(scenario())
+
+    assert not recorder.tasks
+    assert not recorder.explaining
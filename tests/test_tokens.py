@@ -0,0 +1,51 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+
+from app.services.tokens import TokenService
+
+SECRET = "test-secret"
+
+
+def payload(minutes=5):
+    return {
+        "sub": "user",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=minutes),
+        "iat": time.time(),
+    }
+
+
+def test_tokens_interoperate_with_pyjwt():
+    service = TokenService(SECRET, "HS256")
+
+    token = service.encode(payload())
+    assert jwt.decode(token, SECRET, algorithms=["HS256"])["sub"] == "user"
+
+    token = jwt.encode(payload(), SECRET, "HS256")
+    assert service.decode(token)["sub"] == "user"
+
+
+def test_expired_token_is_rejected():
+    service = TokenService(SECRET, "HS256")
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        service.decode(service.encode(payload(minutes=-1)))
+
+
+def test_tampered_and_foreign_tokens_are_rejected():
+    service = TokenService(SECRET, "HS256")
+    token = service.encode(payload())
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        service.decode(token[:-4] + ("AAAA" if token[-4:] != "AAAA" else "BBBB"))
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        TokenService("other-secret", "HS256").decode(token)
+
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        service.decode(jwt.encode(payload(), SECRET, "HS512"))
+
+    with pytest.raises(jwt.DecodeError):
+        service.decode("not-a-token")
@@ -0,0 +1,204 @@
+"""Waitlist promotion against a throwaway schema.
+
+Needs a reachable Postgres (the usual POSTGRES_* settings); the module is
+skipped otherwise.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.events import create_registration, promote_waitlisted
+
+START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+async def seed(conn, sit_count: int, seats_taken: int, listeners: int) -> dict:
+    room, presentation, schedule = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    users = [uuid.uuid4() for _ in range(listeners)]
+
+    await conn.execute(
+        text("INSERT INTO room (code, name, sit_count) VALUES (:code, :name, :seats)"),
+        {"code": room, "name": str(room), "seats": sit_count},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO presentation (code, title, description)"
+            " VALUES (:code, 't', 'd')"
+        ),
+        {"code": presentation},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO schedules (code, room_code, presentation_code,"
+            " start_time, end_time, seats_taken)"
+            " VALUES (:code, :room, :presentation, :start, :end, :taken)"
+        ),
+        {
+            "code": schedule,
+            "room": room,
+            "presentation": presentation,
+            "start": START,
+            "end": START + timedelta(hours=1),
+            "taken": seats_taken,
+        },
+    )
+    await conn.execute(
+        text(
+            'INSERT INTO "user" (code, first_name, last_name, email,'
+            " password_hash, role)"
+            " VALUES (:code, 'f', 'l', :email, 'x', 'listener')"
+        ),
+        [{"code": code, "email": f"{code}@example.com"} for code in users],
+    )
+    return {"schedule": schedule, "users": users}
+
+
+async def waitlisted(conn, schedule) -> list:
+    rows = await conn.execute(
+        text(
+            "SELECT user_code FROM waitlist WHERE schedule_code = :schedule"
+            " ORDER BY created_at"
+        ),
+        {"schedule": schedule},
+    )
+    return rows.scalars().all()
+
+
+async def seats_taken(conn, schedule) -> int:
+    return await conn.scalar(
+        text("SELECT seats_taken FROM schedules WHERE code = :schedule"),
+        {"schedule": schedule},
+    )
+
+
+def test_registered_user_does_not_hold_up_the_queue(schema):
+    async def scenario():
+        engine = schema.engine()
+        try:
+            async with engine.begin() as conn:
+                keys = await seed(conn, sit_count=2, seats_taken=1, listeners=2)
+                schedule, (first, second) = keys["schedule"], keys["users"]
+                # first already holds the taken seat but is still queued
+                # ahead of second
+                await conn.execute(
+                    text(
+                        "INSERT INTO registrations (code, schedule_code, user_code)"
+                        " VALUES (gen_random_uuid(), :schedule, :user)"
+                    ),
+                    {"schedule": schedule, "user": first},
+                )
+                await conn.execute(
+                    text(
+                        "INSERT INTO waitlist (code, schedule_code, user_code,"
+                        " created_at) VALUES (gen_random_uuid(), :schedule,"
+                        " :user, :created)"
+                    ),
+                    [
+                        {"schedule": schedule, "user": first, "created": START},
+                        {
+                            "schedule": schedule,
+                            "user": second,
+                            "created": START + timedelta(minutes=1),
+                        },
+                    ],
+                )
+
+            async with AsyncSession(engine) as db:
+                promoted = await promote_waitlisted(db, {schedule})
+
+            async with engine.connect() as conn:
+                registered = await conn.scalar(
+                    text(
+                        "SELECT count(*) FROM registrations"
+                        " WHERE schedule_code = :schedule AND user_code = :user"
+                    ),
+                    {"schedule": schedule, "user": second},
+                )
+                return (
+                    promoted,
+                    registered,
+                    await waitlisted(conn, schedule),
+                    await seats_taken(conn, schedule),
+                )
+        finally:
+            await engine.dispose()
+
+    promoted, registered, queue, taken = asyncio.run(scenario())
+
+    assert promoted == 1
+    assert registered == 1
+    assert queue == []
+    assert taken == 2
+
+
+def test_promotion_fills_every_free_seat(schema):
+    async def scenario():
+        engine = schema.engine()
+        try:
+            async with engine.begin() as conn:
+                keys = await seed(conn, sit_count=2, seats_taken=0, listeners=3)
+                schedule, users = keys["schedule"], keys["users"]
+                await conn.execute(
+                    text(
+                        "INSERT INTO waitlist (code, schedule_code, user_code,"
+                        " created_at) VALUES (gen_random_uuid(), :schedule,"
+                        " :user, :created)"
+                    ),
+                    [
+                        {
+                            "schedule": schedule,
+                            "user": user,
+                            "created": START + timedelta(minutes=i),
+                        }
+                        for i, user in enumerate(users)
+                    ],
+                )
+
+            async with AsyncSession(engine) as db:
+                promoted = await promote_waitlisted(db, {schedule})
+
+            async with engine.connect() as conn:
+                return (
+                    users,
+                    promoted,
+                    await waitlisted(conn, schedule),
+                    await seats_taken(conn, schedule),
+                )
+        finally:
+            await engine.dispose()
+
+    users, promoted, queue, taken = asyncio.run(scenario())
+
+    assert promoted == 2
+    assert queue == users[2:]
+    assert taken == 2
+
+
+def test_registration_leaves_the_waitlist(schema):
+    async def scenario():
+        engine = schema.engine()
+        try:
+            async with engine.begin() as conn:
+                keys = await seed(conn, sit_count=1, seats_taken=0, listeners=1)
+                schedule, (user,) = keys["schedule"], keys["users"]
+                await conn.execute(
+                    text(
+                        "INSERT INTO waitlist (code, schedule_code, user_code)"
+                        " VALUES (gen_random_uuid(), :schedule, :user)"
+                    ),
+                    {"schedule": schedule, "user": user},
+                )
+
+            async with AsyncSession(engine) as db:
+                await create_registration(db, schedule, user)
+
+            async with engine.connect() as conn:
+                return await waitlisted(conn, schedule)
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(scenario()) == []
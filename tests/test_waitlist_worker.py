@@ -0,0 +1,38 @@
+import asyncio
+import uuid
+
+from app.services import waitlist
+from app.services.waitlist import WaitlistWorker
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+def test_cancellations_are_promoted_in_one_batch(monkeypatch):
+    monkeypatch.setattr(waitlist, "AsyncSessionMaker", FakeSession)
+    batches = []
+
+    async def promote(db, schedule_codes):
+        batches.append(set(schedule_codes))
+        return len(schedule_codes)
+
+    async def scenario():
+        worker = WaitlistWorker(batch_size=10, batch_delay=0.01)
+        worker.start(handler=promote)
+
+        first, second = uuid.uuid4(), uuid.uuid4()
+        worker.notify_many([first, second, first, first])
+
+        await asyncio.sleep(0.05)
+        await worker.stop()
+
+        return {first, second}
+
+    codes = asyncio.run(scenario())
+
+    assert batches == [codes]